@@ -0,0 +1,80 @@
+"""
+Benchmark `ReportingIrradiance.get_rep_irr` at 10k, 100k, and 500k rows.
+
+Times `get_rep_irr`, which counts the points around each candidate reporting
+irradiance with `count_between`, and the row-by-row `Series.between` counts it
+replaced. The counts of both methods are compared for every size the reference
+is run for.
+
+The reference is O(n^2) and takes roughly half an hour at 500k rows; use
+``--max-reference-rows`` to skip it for the larger sizes.
+
+Usage::
+
+    python benchmarks/bench_rep_irr.py
+    python benchmarks/bench_rep_irr.py --max-reference-rows 100000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from captest import capdata as pvc
+
+SIZES = [10_000, 100_000, 500_000]
+
+
+def irradiance_data(n_rows, seed=0):
+    """Uniform irradiance from 0 to 1100 W/m^2 rounded to 0.1, like measured data."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {"poa": np.round(rng.uniform(0, 1100, n_rows), 1)},
+        index=pd.date_range("2023-01-01", periods=n_rows, freq="min"),
+    )
+
+
+def row_wise_counts(df, irr_col="poa", percent_band=20):
+    """Below and above counts computed one row at a time, as before count_between."""
+    low, high = pvc.perc_bounds(percent_band)
+    poa = df[irr_col].sort_values()
+    below = [poa.between(ref * low, ref).sum() for ref in poa]
+    above = [poa.between(ref, ref * high).sum() for ref in poa]
+    return np.array(below), np.array(above)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--max-reference-rows",
+        type=int,
+        default=max(SIZES),
+        help="Largest size to run the row-by-row reference for.",
+    )
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'get_rep_irr s':>14} {'row-wise s':>11} {'speedup':>8}")
+    for n_rows in SIZES:
+        df = irradiance_data(n_rows)
+        rep_irr = pvc.ReportingIrradiance(df, "poa")
+        start = time.perf_counter()
+        rep_irr.get_rep_irr()
+        vectorized = time.perf_counter() - start
+
+        if n_rows > args.max_reference_rows:
+            print(f"{n_rows:>8} {vectorized:>14.3f} {'skipped':>11} {'':>8}")
+            continue
+        start = time.perf_counter()
+        below, above = row_wise_counts(df)
+        reference = time.perf_counter() - start
+        assert np.array_equal(rep_irr.poa_flt["below_count"].to_numpy(), below)
+        assert np.array_equal(rep_irr.poa_flt["above_count"].to_numpy(), above)
+        print(
+            f"{n_rows:>8} {vectorized:>14.3f} {reference:>11.1f} "
+            f"{reference / vectorized:>7.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
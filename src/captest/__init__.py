@@ -9,6 +9,7 @@ from captest import (
 
 from captest.io import (
     load_data as load_data,
+    update_data as update_data,
     load_pvsyst as load_pvsyst,
     DataLoader as DataLoader,
 )
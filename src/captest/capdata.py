@@ -12,10 +12,22 @@ the results of the capacity test, respectively.
 # standard library imports
 import re
 import copy
-from functools import wraps
-from itertools import combinations
+import contextlib
+import io
+import collections.abc
+import hashlib
+import json
+import os
+import pickle
+import threading
+import zipfile
+from functools import cache, wraps
+from pathlib import Path
+from itertools import combinations, product
+import time
 import warnings
 import importlib
+import importlib.metadata
 
 # anaconda distribution defaults
 import numpy as np
@@ -23,8 +35,9 @@ import pandas as pd
 
 # anaconda distribution defaults
 # statistics and machine learning imports
-from patsy import dmatrix
+from patsy import NAAction, build_design_matrices, dmatrices, dmatrix
 import statsmodels.formula.api as smf
+from scipy import stats
 
 # from sklearn.covariance import EllipticEnvelope
 import sklearn.covariance as sk_cv
@@ -37,6 +50,7 @@ import param
 
 from captest import util
 from captest import plotting
+from captest import columngroups as cg
 
 # visualization library imports
 hv_spec = importlib.util.find_spec("holoviews")
@@ -141,6 +155,263 @@ def tstamp_kwarg_to_strings(kwarg_dict):
     return {key: val for key, val in zip(kwarg_dict.keys(), output_vals)}
 
 
+def index_to_mask(index, subset):
+    """
+    Convert a subset of an index to a boolean mask over the index.
+
+    Parameters
+    ----------
+    index : pandas Index
+        Index the mask is relative to. Must be unique.
+    subset : pandas Index
+        Labels to mark as True. Must be in the same order as in `index`.
+
+    Returns
+    -------
+    numpy array of bool or None
+        None is returned when `subset` cannot be represented as a mask over
+        `index`, e.g. it contains labels not in `index`, duplicate labels, or
+        labels in a different order than `index`.
+    """
+    try:
+        positions = index.get_indexer(subset)
+    except pd.errors.InvalidIndexError:
+        return None
+    if (positions < 0).any() or (np.diff(positions) <= 0).any():
+        return None
+    mask = np.zeros(len(index), dtype=bool)
+    mask[positions] = True
+    return mask
+
+
+def pack_mask(mask):
+    """Bit-pack a boolean mask to one bit per row."""
+    return np.packbits(mask)
+
+
+def unpack_mask(packed, length):
+    """Unpack a mask packed with `pack_mask` back to a boolean array."""
+    return np.unpackbits(packed, count=length).astype(bool)
+
+
+FLOAT32_TOLERANCE = 1e-3
+
+
+def dtype_policy_tolerance(dtype_policy):
+    """
+    Get the tolerance for converting columns to float32 from a dtype policy.
+
+    Parameters
+    ----------
+    dtype_policy : None, 'float32', or dict
+        None to keep the loaded dtypes. 'float32' to convert float64 columns to
+        float32 when no value changes by more than `FLOAT32_TOLERANCE`. A
+        dictionary like ``{'dtype': 'float32', 'tolerance': 0.01}`` to set the
+        tolerance.
+
+    Returns
+    -------
+    float or None
+        None if the columns should not be converted.
+    """
+    if dtype_policy is None:
+        return None
+    if dtype_policy == "float32":
+        return FLOAT32_TOLERANCE
+    if isinstance(dtype_policy, dict) and dtype_policy.get("dtype") == "float32":
+        return dtype_policy.get("tolerance", FLOAT32_TOLERANCE)
+    raise ValueError(
+        "dtype_policy must be None, 'float32', or a dictionary like "
+        f"{{'dtype': 'float32', 'tolerance': 0.01}}, not {dtype_policy!r}."
+    )
+
+
+def downcast_floats(data, tolerance=FLOAT32_TOLERANCE, exclude=None):
+    """
+    Convert float64 columns to float32 where the precision lost is acceptable.
+
+    A column is converted if no value changes by more than `tolerance` when
+    stored as float32. Values too large for float32 keep a column as float64.
+
+    Parameters
+    ----------
+    data : DataFrame
+        Data to convert.
+    tolerance : float, default FLOAT32_TOLERANCE
+        Largest absolute change allowed in any value of a column.
+    exclude : list, default None
+        Columns to keep as float64.
+
+    Returns
+    -------
+    DataFrame
+        Copy of `data` with the converted columns.
+    """
+    exclude = set() if exclude is None else set(exclude)
+    to_float32 = {}
+    for i, (col, dtype) in enumerate(data.dtypes.items()):
+        if dtype != "float64" or col in exclude:
+            continue
+        values = data.iloc[:, i].to_numpy()
+        with np.errstate(over="ignore", invalid="ignore"):
+            error = np.abs(values.astype("float32").astype("float64") - values)
+        if not (error > tolerance).any():
+            to_float32[col] = "float32"
+    return data.astype(to_float32)
+
+
+def upcast_floats(data):
+    """
+    Convert float32 columns to float64.
+
+    Parameters
+    ----------
+    data : DataFrame
+
+    Returns
+    -------
+    DataFrame
+        `data` if there are no float32 columns, otherwise a converted copy.
+    """
+    to_float64 = {
+        col: "float64" for col, dtype in data.dtypes.items() if dtype == "float32"
+    }
+    if len(to_float64) == 0:
+        return data
+    return data.astype(to_float64)
+
+
+class FilterStep(collections.abc.Mapping):
+    """
+    Record of the intervals kept or removed by a single filtering step.
+
+    Behaves like the ``{"name": ..., "index": ...}`` dictionaries stored in the
+    `kept` and `removed` attributes of CapData, but stores the intervals as a
+    bit-packed mask relative to the index of `CapData.data`. The ``"index"``
+    value is only built when it is accessed.
+
+    Parameters
+    ----------
+    name : str
+        Name of the filtering step.
+    mask : numpy array of bool
+        Mask of the intervals kept or removed, aligned with `index`.
+    index : pandas Index
+        Index the mask is relative to.
+    """
+
+    def __init__(self, name, mask, index):
+        self.name = name
+        self.packed_mask = pack_mask(mask)
+        self.source_index = index
+
+    @property
+    def mask(self):
+        """Boolean mask aligned with `source_index`."""
+        return unpack_mask(self.packed_mask, len(self.source_index))
+
+    def __getitem__(self, key):
+        if key == "name":
+            return self.name
+        elif key == "index":
+            return self.source_index[self.mask]
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(("name", "index"))
+
+    def __len__(self):
+        return 2
+
+    def __repr__(self):
+        return "FilterStep(name={!r}, points={})".format(
+            self.name, int(self.mask.sum())
+        )
+
+
+def filter_step_mask(step, index):
+    """
+    Get a boolean mask over `index` of the intervals in a kept or removed record.
+
+    Parameters
+    ----------
+    step : FilterStep or dict
+        Record from the `kept` or `removed` attribute of CapData.
+    index : pandas Index
+        Index to align the mask with, usually the index of `CapData.data`.
+
+    Returns
+    -------
+    numpy array of bool
+    """
+    if isinstance(step, FilterStep) and step.source_index.equals(index):
+        return step.mask
+    return index.isin(step["index"])
+
+
+ROW_LOCAL_FILTERS = (
+    "filter_irr",
+    "filter_pvsyst",
+    "filter_shade",
+    "filter_time",
+    "filter_pf",
+    "filter_power",
+    "filter_sensors",
+    "filter_missing",
+)
+
+
+def is_row_local_call(name, args, kwargs):
+    """
+    Check if a recorded filtering call can be applied to new intervals alone.
+
+    Row-local filters keep or remove an interval based only on the values in
+    that interval, so applying them to new intervals gives the same result as
+    applying them to all of the data.
+
+    Parameters
+    ----------
+    name : str
+        Name of the CapData filtering method.
+    args : tuple
+        Positional arguments the method was called with.
+    kwargs : dict
+        Keyword arguments the method was called with.
+
+    Returns
+    -------
+    bool
+    """
+    if name not in ROW_LOCAL_FILTERS:
+        return False
+    if name == "filter_time":
+        # wrap_year_end moves data between years
+        return not kwargs.get("wrap_year", args[6] if len(args) > 6 else False)
+    return True
+
+
+def concat_filter_steps(step, new_step, index):
+    """
+    Join the kept or removed record of a filtering step for old and new data.
+
+    Parameters
+    ----------
+    step : FilterStep or dict
+        Record for the existing data.
+    new_step : FilterStep or dict
+        Record of the same step for the appended data.
+    index : pandas Index
+        Index of the joined data.
+
+    Returns
+    -------
+    FilterStep or dict
+    """
+    if isinstance(step, FilterStep) and isinstance(new_step, FilterStep):
+        return FilterStep(step.name, np.concatenate([step.mask, new_step.mask]), index)
+    return {"name": step["name"], "index": step["index"].append(new_step["index"])}
+
+
 def update_summary(func):
     """
     Decoratates the CapData class filter methods.
@@ -148,6 +419,14 @@ def update_summary(func):
     Updates the CapData.summary and CapData.summary_ix attributes, which
     are used to generate summary data by the CapData.get_summary method.
 
+    The intervals kept and removed by each step are recorded as bit-packed
+    masks relative to the index of CapData.data (see `FilterStep`) rather than
+    copies of the index. Steps that leave intervals in data_filtered that are
+    not in data are recorded with copies of the index.
+
+    The name and arguments of each call are recorded in CapData.filter_calls,
+    so the filtering can be applied again by `CapData.append_data`.
+
     Todo
     ----
     not in place
@@ -157,8 +436,14 @@ def update_summary(func):
 
     @wraps(func)
     def wrapper(self, *args, **kwargs):
-        pts_before = self.data_filtered.shape[0]
-        ix_before = self.data_filtered.index
+        mask_before = self.filter_mask
+        masked = mask_before is not None
+        if masked:
+            pts_before = int(mask_before.sum())
+        else:
+            pts_before = self.data_filtered.shape[0]
+            ix_before = self.data_filtered.index
+            mask_before = index_to_mask(self.data.index, ix_before)
         if pts_before == 0:
             pts_before = self.data.shape[0]
             self.summary_ix.append((self.name, "count"))
@@ -167,6 +452,7 @@ def update_summary(func):
             )
 
         ret_val = func(self, *args, **kwargs)
+        self.filter_calls.append((func.__name__, args, dict(kwargs)))
 
         arg_str = args.__repr__()
         lst = arg_str.split(",")
@@ -202,18 +488,36 @@ def update_summary(func):
             self.filter_counts[filter_name] = 1
             filter_name_enum = filter_name
 
-        pts_after = self.data_filtered.shape[0]
+        mask_after = self.filter_mask
+        if mask_after is not None:
+            pts_after = int(mask_after.sum())
+        else:
+            pts_after = self.data_filtered.shape[0]
+            if mask_before is not None:
+                mask_after = index_to_mask(self.data.index, self.data_filtered.index)
         pts_removed = pts_before - pts_after
         self.summary_ix.append((self.name, filter_name_enum))
         self.summary.append(
             {columns[0]: pts_after, columns[1]: pts_removed, columns[2]: arg_str}
         )
 
-        ix_after = self.data_filtered.index
-        self.removed.append(
-            {"name": filter_name_enum, "index": ix_before.difference(ix_after)}
-        )
-        self.kept.append({"name": filter_name_enum, "index": ix_after})
+        if (
+            mask_before is not None
+            and mask_after is not None
+            and len(mask_before) == len(mask_after)
+        ):
+            self.removed.append(
+                FilterStep(filter_name_enum, mask_before & ~mask_after, self.data.index)
+            )
+            self.kept.append(FilterStep(filter_name_enum, mask_after, self.data.index))
+        else:
+            if masked:
+                ix_before = self.data.index[mask_before]
+            ix_after = self.data_filtered.index
+            self.removed.append(
+                {"name": filter_name_enum, "index": ix_before.difference(ix_after)}
+            )
+            self.kept.append({"name": filter_name_enum, "index": ix_after})
 
         if pts_after == 0:
             warnings.warn(
@@ -223,11 +527,22 @@ def update_summary(func):
                 "will raise an error."
             )
 
+        if self.online_regression is not None:
+            if mask_after is not None and len(mask_before) == len(mask_after):
+                self.update_online_regression(mask_before, mask_after)
+            else:
+                self.update_online_regression()
+
         return ret_val
 
     return wrapper
 
 
+def time_slice(index, start, end):
+    """Select the labels of `index` from `start` to `end`, like `.loc[start:end]`."""
+    return index[index.slice_indexer(start, end)]
+
+
 def wrap_year_end(df, start, end):
     """
     Shifts data before or after new year to form a contigous time period.
@@ -415,6 +730,47 @@ def perc_difference(x, y):
             return abs(x - y) / ((x + y) / 2)
 
 
+def vectorized_row_filter(func):
+    """
+    Mark a function as a vectorized `row_filter` for `sensor_filter`.
+
+    Functions marked with this decorator are called once with a DataFrame of all
+    the sensors and the threshold and must return a boolean array with one value
+    per row. Unmarked functions are applied row by row with ``DataFrame.apply``.
+
+    Examples
+    --------
+    >>> @vectorized_row_filter
+    ... def max_spread(df, threshold):
+    ...     return (df.max(axis=1) - df.min(axis=1)).values <= threshold
+    >>> das.filter_sensors(perc_diff={'irr-poa-': 50}, row_filter=max_spread)
+    """
+    func.vectorized = True
+    return func
+
+
+def _as_2d(values):
+    """Return values of a Series as a single row array or DataFrame as 2-D array."""
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        return values.reshape(1, -1), True
+    return values, False
+
+
+def perc_difference_arrays(x, y):
+    """
+    Calculate the percent difference of two arrays element-wise.
+
+    Matches `perc_difference`: zero when both values are zero and one when the
+    values sum to zero. NaN when either value is NaN.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        perc_diff = np.abs(x - y) / ((x + y) / 2)
+    perc_diff = np.where(x + y == 0, 1.0, perc_diff)
+    return np.where((x == 0) & (y == 0), 0.0, perc_diff)
+
+
+@vectorized_row_filter
 def check_all_perc_diff_comb(series, perc_diff):
     """
     Check series for pairs of values with percent difference above perc_diff.
@@ -422,21 +778,33 @@ def check_all_perc_diff_comb(series, perc_diff):
     Calculates the percent difference between all combinations of two values in
     the passed series and checks if all of them are below the passed perc_diff.
 
+    A DataFrame may be passed instead of a Series to check every row at once.
+    Rows containing a NaN do not pass the check.
+
     Parameters
     ----------
-    series : pd.Series
-        Pandas series of values to check.
+    series : pd.Series or pd.DataFrame
+        Pandas series of values to check or dataframe with rows of values to
+        check.
     perc_diff : float
         Percent difference threshold value as decimal i.e. 5% is 0.05.
 
     Returns
     -------
-    bool
+    bool or numpy array of bool
+        A single bool for a Series or an array with a bool for each row of a
+        DataFrame.
     """
-    c = combinations(series.__iter__(), 2)
-    return all([perc_difference(x, y) < perc_diff for x, y in c])
+    values, single_row = _as_2d(series)
+    passes = np.ones(values.shape[0], dtype=bool)
+    for i, j in combinations(range(values.shape[1]), 2):
+        passes &= perc_difference_arrays(values[:, i], values[:, j]) < perc_diff
+    if single_row:
+        return bool(passes[0])
+    return passes
 
 
+@vectorized_row_filter
 def abs_diff_from_average(series, threshold):
     """Check each value in series <= average of other values.
 
@@ -444,24 +812,38 @@ def abs_diff_from_average(series, threshold):
 
     Returns True if there is only one value in the series.
 
+    A DataFrame may be passed instead of a Series to check every row at once.
+
     Parameters
     ----------
-    series : pd.Series
-        Pandas series of values to check.
+    series : pd.Series or pd.DataFrame
+        Pandas series of values to check or dataframe with rows of values to
+        check.
     threshold : numeric
         Threshold value for absolute difference from average.
 
     Returns
     -------
-    bool
+    bool or numpy array of bool
+        A single bool for a Series or an array with a bool for each row of a
+        DataFrame.
     """
-    series = series.dropna()
-    if len(series) == 1:
-        return True
-    abs_diffs = []
-    for i, val in enumerate(series):
-        abs_diffs.append(abs(val - series.drop(series.index[i]).mean()) <= threshold)
-    return all(abs_diffs)
+    values, single_row = _as_2d(series)
+    passes = np.ones(values.shape[0], dtype=bool)
+    for i in range(values.shape[1]):
+        others = np.delete(values, i, axis=1)
+        with warnings.catch_warnings():
+            # rows where all the other values are NaN
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            others_mean = np.nanmean(others, axis=1)
+        passes &= (
+            np.isnan(values[:, i])
+            | np.isnan(others_mean)
+            | (np.abs(values[:, i] - others_mean) <= threshold)
+        )
+    if single_row:
+        return bool(passes[0])
+    return passes
 
 
 def sensor_filter(df, threshold, row_filter=check_all_perc_diff_comb):
@@ -475,9 +857,17 @@ def sensor_filter(df, threshold, row_filter=check_all_perc_diff_comb):
     df : pandas DataFrame
     perc_diff : float
         Percent difference as decimal.
+    row_filter : function, default check_all_perc_diff_comb
+        Function that checks the values of a row. Functions decorated with
+        `vectorized_row_filter` are passed `df` and return a boolean array for
+        all rows at once. Other functions are applied to each row and should
+        accept a Series and return a bool.
     """
     if df.shape[1] >= 2:
-        bool_ser = df.apply(row_filter, args=(threshold,), axis=1)
+        if getattr(row_filter, "vectorized", False):
+            bool_ser = np.asarray(row_filter(df, threshold), dtype=bool)
+        else:
+            bool_ser = df.apply(row_filter, args=(threshold,), axis=1)
         return df[bool_ser].index
     elif df.shape[1] == 1:
         return df.index
@@ -542,16 +932,46 @@ def filter_grps(grps, rcs, irr_col, low, high, freq, **kwargs):
     -------
     pandas groupby
     """
-    flt_dfs = []
-    for grp_name, grp_df in grps:
-        ref_val = rcs.loc[grp_name, "poa"]
-        grp_df_flt = filter_irr(grp_df, irr_col, low, high, ref_val=ref_val)
-        flt_dfs.append(grp_df_flt)
-    df_flt = pd.concat(flt_dfs)
-    df_flt_grpby = df_flt.groupby(pd.Grouper(freq=freq, **kwargs))
+    df = grps.obj
+    codes = grps.ngroup().to_numpy()
+    # reporting irradiance of the group of each row, in the order of the group codes
+    ref_vals = rcs.loc[grps.size().index, "poa"].to_numpy()[codes]
+    irr = df[irr_col].to_numpy()
+    mask = (codes >= 0) & (irr >= low * ref_vals) & (irr <= high * ref_vals)
+    df_flt_grpby = df.loc[mask, :].groupby(pd.Grouper(freq=freq, **kwargs))
     return df_flt_grpby
 
 
+def count_between(sorted_values, lows, highs):
+    """
+    Count values within inclusive bounds for many pairs of bounds at once.
+
+    Equivalent to ``[pd.Series(sorted_values).between(lo, hi).sum() for lo, hi
+    in zip(lows, highs)]``, but uses binary search on the sorted values, so it
+    runs in O(n log n) rather than O(n^2).
+
+    Parameters
+    ----------
+    sorted_values : numpy array
+        Values sorted in ascending order. NaNs must be at the end.
+    lows : numpy array
+        Lower bounds, inclusive.
+    highs : numpy array
+        Upper bounds, inclusive.
+
+    Returns
+    -------
+    numpy array of int
+        Count of values between each pair of bounds. Zero where either bound is
+        NaN or the lower bound is greater than the upper bound.
+    """
+    counts = np.searchsorted(sorted_values, highs, side="right") - np.searchsorted(
+        sorted_values, lows, side="left"
+    )
+    counts[np.isnan(lows) | np.isnan(highs)] = 0
+    return np.clip(counts, 0, None)
+
+
 class ReportingIrradiance(param.Parameterized):
     df = param.DataFrame(
         doc="Data to use to calculate reporting irradiance.", precedence=-1
@@ -614,14 +1034,16 @@ class ReportingIrradiance(param.Parameterized):
         poa_flt["plus_perc"] = poa_flt[self.irr_col] * high
         poa_flt["minus_perc"] = poa_flt[self.irr_col] * low
 
-        poa_flt["below_count"] = [
-            poa_flt[self.irr_col].between(low, ref).sum()
-            for low, ref in zip(poa_flt["minus_perc"], poa_flt[self.irr_col])
-        ]
-        poa_flt["above_count"] = [
-            poa_flt[self.irr_col].between(ref, high).sum()
-            for ref, high in zip(poa_flt[self.irr_col], poa_flt["plus_perc"])
-        ]
+        poa_flt["below_count"] = count_between(
+            poa_flt[self.irr_col].values,
+            poa_flt["minus_perc"].values,
+            poa_flt[self.irr_col].values,
+        )
+        poa_flt["above_count"] = count_between(
+            poa_flt[self.irr_col].values,
+            poa_flt[self.irr_col].values,
+            poa_flt["plus_perc"].values,
+        )
 
         poa_flt["total_pts"] = poa_flt["above_count"] + poa_flt["below_count"]
         poa_flt["perc_above"] = (poa_flt["above_count"] / poa_flt["total_pts"]) * 100
@@ -822,15 +1244,217 @@ class ReportingIrradiance(param.Parameterized):
         return pn.Row(self.param, self.plot)
 
 
-def fit_model(
-    df, fml="power ~ poa + I(poa * poa) + I(poa * t_amb) + I(poa * w_vel) - 1"
-):  # noqa E501
+ASTM_FORMULA = "power ~ poa + I(poa * poa) + I(poa * t_amb) + I(poa * w_vel) - 1"
+ASTM_TERMS = ["poa", "I(poa * poa)", "I(poa * t_amb)", "I(poa * w_vel)"]
+
+
+def is_astm_formula(fml):
+    """Return True if `fml` is the ASTM E2848 formula, ignoring whitespace."""
+    return "".join(fml.split()) == "".join(ASTM_FORMULA.split())
+
+
+def astm_design_matrix(data):
+    """
+    Build the design matrix of the ASTM E2848 regression formula.
+
+    Parameters
+    ----------
+    data : DataFrame or dict
+        Must have `poa`, `t_amb`, and `w_vel` columns or keys.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array with one row per row of `data` and the columns `poa`,
+        `poa * poa`, `poa * t_amb`, and `poa * w_vel`.
+    """
+    poa = np.asarray(data["poa"], dtype="float64").ravel()
+    t_amb = np.asarray(data["t_amb"], dtype="float64").ravel()
+    w_vel = np.asarray(data["w_vel"], dtype="float64").ravel()
+    return np.column_stack([poa, poa * poa, poa * t_amb, poa * w_vel])
+
+
+class AstmOLSResults:
+    """
+    Lightweight results of an ASTM E2848 regression fit without patsy.
+
+    Returned by `fit_model` for the default formula. Exposes the results most
+    used by captest (params, bse, tvalues, pvalues, resid, fittedvalues, scale,
+    rsquared, and predict) as plain numpy/pandas objects with the same values
+    and labels as the statsmodels results. Any other attribute, e.g. `summary`,
+    `model`, or `get_prediction`, is passed through to a full statsmodels
+    results object, which is fit from the same data the first time it is
+    needed.
+
+    Parameters
+    ----------
+    exog : numpy.ndarray
+        Design matrix from `astm_design_matrix` without missing values.
+    endog : numpy.ndarray
+        Measured power of each row of `exog`.
+    index : Index
+        Index labels of the rows of `exog`.
+    data : DataFrame
+        Data the regression was fit to. Used to fit the statsmodels results.
+    fml : str, default ASTM_FORMULA
+        Formula used to fit the statsmodels results.
+
+    Attributes
+    ----------
+    params : Series
+        Regression coefficients labelled with the patsy term names.
+    bse : Series
+        Standard errors of the coefficients.
+    tvalues : Series
+        t statistics of the coefficients.
+    pvalues : Series
+        Two-tailed p-values of the t statistics.
+    resid : Series
+        Residuals, indexed like the rows used in the fit.
+    fittedvalues : Series
+        Predicted values of the rows used in the fit.
+    nobs : float
+        Number of rows used in the fit.
+    df_resid : float
+        Residual degrees of freedom.
+    ssr : float
+        Sum of squared residuals.
+    scale : float
+        Residual variance, `ssr / df_resid`.
+    rsquared : float
+        Uncentered R-squared, as statsmodels reports for models without an
+        intercept.
+    """
+
+    def __init__(self, exog, endog, index, data, fml=ASTM_FORMULA):
+        q, r = np.linalg.qr(exog)
+        params = np.linalg.solve(r, q.T @ endog)
+        r_inv = np.linalg.inv(r)
+        self.normalized_cov_params = r_inv @ r_inv.T
+        self.formula = fml
+        self.data = data
+        self.nobs = float(exog.shape[0])
+        self.df_model = float(exog.shape[1])
+        self.df_resid = self.nobs - self.df_model
+        fitted = exog @ params
+        resid = endog - fitted
+        self.ssr = float(resid @ resid)
+        self.scale = self.ssr / self.df_resid
+        self.mse_resid = self.scale
+        self.rsquared = 1 - self.ssr / float(endog @ endog)
+        self.rsquared_adj = 1 - self.nobs / self.df_resid * (1 - self.rsquared)
+        bse = np.sqrt(np.diag(self.normalized_cov_params) * self.scale)
+        tvalues = params / bse
+        self.params = pd.Series(params, index=ASTM_TERMS)
+        self.bse = pd.Series(bse, index=ASTM_TERMS)
+        self.tvalues = pd.Series(tvalues, index=ASTM_TERMS)
+        self.pvalues = pd.Series(
+            stats.t.sf(np.abs(tvalues), self.df_resid) * 2, index=ASTM_TERMS
+        )
+        self.fittedvalues = pd.Series(fitted, index=index)
+        self.resid = pd.Series(resid, index=index)
+        self._full_results = None
+
+    @property
+    def full_results(self):
+        """Statsmodels results of the same regression, fit on first access."""
+        if self._full_results is None:
+            self._full_results = smf.ols(formula=self.formula, data=self.data).fit()
+        return self._full_results
+
+    def __getstate__(self):
+        # The statsmodels results are rebuilt when needed instead of copied.
+        state = self.__dict__.copy()
+        state["_full_results"] = None
+        return state
+
+    def __getattr__(self, name):
+        # Only called for attributes not set in __init__. Private and special
+        # names are not forwarded so copy and pickle work on new instances.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.full_results, name)
+
+    def design_matrix(self, exog):
+        """
+        Build the design matrix of the regression for new predictor values.
+
+        Parameters
+        ----------
+        exog : DataFrame or dict
+            Values of `poa`, `t_amb`, and `w_vel`.
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+        return astm_design_matrix(exog)
+
+    def predict(self, exog=None):
+        """
+        Predict power from the fitted coefficients.
+
+        Parameters
+        ----------
+        exog : DataFrame or dict, optional
+            Values of `poa`, `t_amb`, and `w_vel`. If None, returns the fitted
+            values.
+
+        Returns
+        -------
+        Series
+            Predicted values, indexed like `exog` when it is a DataFrame.
+        """
+        if exog is None:
+            return self.fittedvalues
+        if not isinstance(exog, pd.DataFrame):
+            exog = pd.DataFrame({k: np.atleast_1d(v) for k, v in dict(exog).items()})
+        return pd.Series(
+            self.design_matrix(exog) @ self.params.to_numpy(), index=exog.index
+        )
+
+
+def _fit_astm_ols(df, fml):
+    """
+    Fit the ASTM E2848 formula with numpy or return None if it cannot be.
+
+    Rows with missing values in any regression column are dropped, as patsy
+    does. None is returned when a column is missing or not numeric, there are
+    not more rows than coefficients, or the design matrix is rank deficient, so
+    that statsmodels handles those cases.
+    """
+    try:
+        endog = df["power"].to_numpy(dtype="float64")
+        exog = astm_design_matrix(df)
+    except (KeyError, TypeError, ValueError):
+        return None
+    complete = ~(np.isnan(endog) | np.isnan(exog).any(axis=1))
+    index = df.index
+    if not complete.all():
+        endog = endog[complete]
+        exog = exog[complete]
+        index = index[complete]
+    if exog.shape[0] <= exog.shape[1]:
+        return None
+    diag = np.abs(np.diag(np.linalg.qr(exog, mode="r")))
+    if diag.min() <= diag.max() * exog.shape[0] * np.finfo("float64").eps:
+        return None
+    return AstmOLSResults(exog, endog, index, df, fml=fml)
+
+
+def fit_model(df, fml=ASTM_FORMULA):
     """
     Fits linear regression using statsmodels to dataframe passed.
 
     Dataframe must be first argument for use with pandas groupby object
     apply method.
 
+    When `fml` is the default ASTM E2848 formula the regression is solved
+    directly with numpy and an `AstmOLSResults` object is returned. It has the
+    same params, pvalues, resid, scale, and predict results as the statsmodels
+    results and builds the full statsmodels results only if another attribute,
+    like `summary`, is used.
+
     Parameters
     ----------
     df : pandas dataframe
@@ -840,88 +1464,563 @@ def fit_model(
 
     Returns
     -------
-    Statsmodels linear model regression results wrapper object.
+    Statsmodels linear model regression results wrapper object or
+    AstmOLSResults.
     """
+    if is_astm_formula(fml):
+        reg = _fit_astm_ols(df, fml)
+        if reg is not None:
+            return reg
     mod = smf.ols(formula=fml, data=df)
     reg = mod.fit()
     return reg
 
 
-def predict(regs, rcs):
+def design_matrix(results, data):
     """
-    Calculate predicted values for given linear models and predictor values.
+    Build the design matrix of a fitted regression for new predictor values.
 
-    Evaluates the first linear model in the iterable with the first row of the
-    predictor values in the dataframe.  Passed arguments must be aligned.
+    Uses the patsy design information stored with the statsmodels results, so
+    the formula is not parsed again, or `astm_design_matrix` for
+    `AstmOLSResults`. Rows with missing values are kept and give NaN
+    predictions.
 
     Parameters
     ----------
-    regs : iterable of statsmodels regression results wrappers
-    rcs : pandas dataframe
-        Dataframe of predictor values used to evaluate each linear model.
-        The column names must match the strings used in the regression
-        formuala.
+    results : statsmodels regression results or AstmOLSResults
+        Results of a regression fit with a formula, e.g. by `fit_model`.
+    data : DataFrame
+        Predictor values. The column names must match the names used in the
+        regression formula.
 
     Returns
     -------
-    Pandas series of predicted values.
+    numpy.ndarray
+        One row per row of `data` and one column per regression coefficient.
     """
-    pred_cap = list()
-    for i, mod in enumerate(regs):
-        RC_df = pd.DataFrame(rcs.iloc[i, :]).T
-        pred_cap.append(mod.predict(RC_df).values[0])
-    return pd.Series(pred_cap)
+    if isinstance(results, AstmOLSResults):
+        return results.design_matrix(data)
+    design_info = results.model.data.design_info
+    return np.asarray(dmatrix(design_info, data, NA_action=NAAction(NA_types=[])))
 
 
-def pred_summary(grps, rcs, allowance, **kwargs):
+# CapData.update_online_regression refits the regression when yty_total exceeds
+# this multiple of yty, which bounds the rounding error of the sums.
+ONLINE_REFIT_RATIO = 100
+
+
+class OnlineRegression:
     """
-    Summarize reporting conditions, predicted cap, and gauranteed cap.
+    Ordinary least squares regression updated as rows are added or removed.
+
+    Keeps the sufficient statistics of the regression, X'X, X'y, y'y, and the
+    number of rows, so adding or removing a row costs O(k**2) for k
+    coefficients and the coefficients, residual variance, and predictions are
+    available without refitting to all of the rows. Rows with missing values
+    are skipped, as patsy does. The rows included are recorded so rows are not
+    added twice or removed if they were not added.
 
-    This method does not calculate reporting conditions.
+    The sums are updated in place, so their rounding error grows with the
+    rows added and removed, roughly machine epsilon times `yty_total`, and not
+    with the rows included. The sum of squared residuals is small compared to
+    the sums, so after many rows are removed it can lose most of its
+    precision; `ssr` raises an error if it becomes negative. Fit the
+    regression to the rows again to reset the error.
+
+    Use `CapData.start_online_regression` to keep an OnlineRegression in sync
+    with the filtered data of a CapData object.
 
     Parameters
     ----------
-    grps : pandas groupby object
-        Solar data grouped by season or month used to calculate reporting
-        conditions.  This argument is used to fit models for each group.
-    rcs : pandas dataframe
-        Dataframe of reporting conditions used to predict capacities.
-    allowance : float
-        Percent allowance to calculate gauranteed capacity from predicted
-        capacity.
-
-    Returns
-    -------
-    Dataframe of reporting conditions, model coefficients, predicted capacities
-    gauranteed capacities, and points in each grouping.
+    fml : str, default ASTM_FORMULA
+        Regression formula. Must be linear in the coefficients and must not use
+        stateful transforms, like `center`, which depend on all of the rows.
+    source_index : Index, default None
+        Index of the data the rows are taken from, e.g. `CapData.data`. When
+        passed, the rows included are recorded as a boolean mask over it and
+        rows can be added and removed by position. By default the index labels
+        of the rows included are recorded.
+
+    Attributes
+    ----------
+    formula : str
+        Regression formula.
+    exog_names : list of str
+        Names of the coefficients. None until rows are added when the formula
+        is not the ASTM formula.
+    xtx : numpy.ndarray
+        Sum of the outer products of the design matrix rows, X'X.
+    xty : numpy.ndarray
+        X'y.
+    yty : float
+        Sum of the squared dependent variable, y'y.
+    yty_total : float
+        Sum of the squared dependent variable of every row added or removed
+        since the last `reset`.
+    nobs : int
+        Number of rows included.
+    mask : numpy.ndarray or None
+        Rows of `source_index` included, None without `source_index`.
     """
-    regs = grps.apply(fit_model, **kwargs)
-    predictions = predict(regs, rcs)
-    params = regs.apply(lambda x: x.params.transpose())
-    pt_qty = grps.agg("count").iloc[:, 0]
-    predictions.index = pt_qty.index
 
-    params.index = pt_qty.index
-    rcs.index = pt_qty.index
-    predictions.name = "PredCap"
+    def __init__(self, fml=ASTM_FORMULA, source_index=None):
+        self.formula = fml
+        self.exog_names = list(ASTM_TERMS) if is_astm_formula(fml) else None
+        self.source_index = source_index
+        self.reset()
+
+    def reset(self):
+        """Remove all rows."""
+        k = 0 if self.exog_names is None else len(self.exog_names)
+        self.xtx = np.zeros((k, k))
+        self.xty = np.zeros(k)
+        self.yty = 0.0
+        self.yty_total = 0.0
+        self.nobs = 0
+        if self.source_index is None:
+            self.mask = None
+            self._index = pd.Index([])
+        else:
+            self.mask = np.zeros(len(self.source_index), dtype=bool)
+            self._index = None
 
-    for rc_col_name in rcs.columns:
-        for param_col_name in params.columns:
-            if rc_col_name == param_col_name:
-                new_col_name = param_col_name + "-param"
-                params.rename(columns={param_col_name: new_col_name}, inplace=True)
+    @property
+    def index(self):
+        """Index labels of the rows included."""
+        if self.mask is None:
+            return self._index
+        return self.source_index[self.mask]
 
-    results = pd.concat([rcs, predictions, params], axis=1)
+    def copy(self):
+        """Return a copy that is updated independently."""
+        online = copy.copy(self)
+        online.xtx = self.xtx.copy()
+        online.xty = self.xty.copy()
+        if self.mask is not None:
+            online.mask = self.mask.copy()
+        return online
+
+    def design(self, data):
+        """
+        Build the dependent variable and design matrix of the complete rows.
 
-    results["guaranteedCap"] = results["PredCap"] * (1 - allowance)
-    results["pt_qty"] = pt_qty.values
+        Parameters
+        ----------
+        data : DataFrame
+            Regression data with the column names used in the formula.
 
-    return results
+        Returns
+        -------
+        tuple
+            Dependent variable, design matrix, and index of the complete rows.
+        """
+        if is_astm_formula(self.formula):
+            endog = data["power"].to_numpy(dtype="float64")
+            exog = astm_design_matrix(data)
+            complete = ~(np.isnan(endog) | np.isnan(exog).any(axis=1))
+            return endog[complete], exog[complete], data.index[complete]
+        endog, exog = dmatrices(self.formula, data, return_type="dataframe")
+        if self.exog_names is None:
+            self.exog_names = list(exog.columns)
+            self.reset()
+        elif list(exog.columns) != self.exog_names:
+            raise ValueError(
+                f"The terms of the data, {list(exog.columns)}, do not match the "
+                f"terms of the regression, {self.exog_names}."
+            )
+        return endog.iloc[:, 0].to_numpy(), exog.to_numpy(), exog.index
 
+    def _accumulate(self, data, sign):
+        """
+        Add (`sign` 1) or subtract (`sign` -1) rows from the sums.
 
-def pvlib_location(loc):
-    """
-    Create a pvlib location object.
+        Returns
+        -------
+        Index
+            Index labels of the complete rows of `data`.
+        """
+        endog, exog, index = self.design(data)
+        yty = float(endog @ endog)
+        self.xtx += sign * (exog.T @ exog)
+        self.xty += sign * (exog.T @ endog)
+        self.yty += sign * yty
+        self.yty_total += yty
+        self.nobs += sign * len(index)
+        return index
+
+    def _source_positions(self, data, positions):
+        """Positions of the rows of `data` in `source_index`, -1 if missing."""
+        if positions is None:
+            return self.source_index.get_indexer(data.index)
+        return np.asarray(positions)
+
+    def update(self, data, positions=None):
+        """
+        Add rows to the regression.
+
+        Parameters
+        ----------
+        data : DataFrame
+            Regression data with the column names used in the formula. Rows
+            that are already included are skipped.
+        positions : array of int, default None
+            Positions of the rows of `data` in `source_index`. By default found
+            from the index of `data`. Only used with `source_index`.
+        """
+        if self.mask is not None:
+            positions = self._source_positions(data, positions)
+            if (positions < 0).any():
+                raise ValueError("Rows must be in the source_index of the regression.")
+            new = ~self.mask[positions]
+            data = data[new]
+            positions = positions[new]
+            index = self._accumulate(data, 1)
+            if len(index) < len(data):
+                positions = positions[data.index.isin(index)]
+            self.mask[positions] = True
+            return
+        # Rows later than all of the rows included, the usual case for new
+        # measurements, are not checked against the included labels.
+        if not (
+            self.nobs == 0
+            or data.empty
+            or (
+                self._index.is_monotonic_increasing
+                and data.index.is_monotonic_increasing
+                and data.index[0] > self._index[-1]
+            )
+        ):
+            data = data[~data.index.isin(self._index)]
+        index = self._accumulate(data, 1)
+        self._index = index if self._index.empty else self._index.append(index)
+
+    def remove(self, data, positions=None):
+        """
+        Remove rows from the regression.
+
+        Parameters
+        ----------
+        data : DataFrame
+            The rows to remove, with the values they were added with. Rows that
+            are not included are skipped.
+        positions : array of int, default None
+            Positions of the rows of `data` in `source_index`. By default found
+            from the index of `data`. Only used with `source_index`.
+        """
+        if self.mask is not None:
+            positions = self._source_positions(data, positions)
+            included = positions >= 0
+            included[included] = self.mask[positions[included]]
+            self._accumulate(data[included], -1)
+            self.mask[positions[included]] = False
+            return
+        data = data[data.index.isin(self._index)]
+        index = self._accumulate(data, -1)
+        self._index = self._index[~self._index.isin(index)]
+
+    def extend_source_index(self, source_index):
+        """
+        Use a source index with rows appended after those of `source_index`.
+
+        Parameters
+        ----------
+        source_index : Index
+            Index starting with the labels of the current `source_index`, e.g.
+            the index of `CapData.data` after `CapData.append_data`.
+        """
+        n = len(self.source_index)
+        if not source_index[:n].equals(self.source_index):
+            raise ValueError("source_index must start with the current source_index.")
+        self.mask = np.concatenate(
+            [self.mask, np.zeros(len(source_index) - n, dtype=bool)]
+        )
+        self.source_index = source_index
+
+    @property
+    def df_resid(self):
+        """Residual degrees of freedom."""
+        return self.nobs - len(self.xty)
+
+    @property
+    def params(self):
+        """
+        Regression coefficients labelled with the patsy term names.
+
+        Raises a ValueError if there are fewer rows than coefficients or the
+        coefficients are not unique, e.g. a variable is constant or zero.
+        """
+        k = len(self.xty)
+        if self.nobs < k:
+            raise ValueError(
+                f"The regression has {self.nobs} rows, fewer than its {k} coefficients."
+            )
+        scale = np.sqrt(np.diag(self.xtx))
+        xtx = self.xtx / np.outer(scale, scale)
+        if not (scale > 0).all() or np.linalg.matrix_rank(xtx) < k:
+            raise ValueError(
+                "X'X of the regression is rank deficient, so the coefficients "
+                "are not unique."
+            )
+        params = np.linalg.solve(xtx, self.xty / scale) / scale
+        return pd.Series(params, index=self.exog_names)
+
+    @property
+    def ssr(self):
+        """
+        Sum of squared residuals.
+
+        Calculated as ``y'y - 2 b'X'y + b'X'X b`` for the coefficients b, so
+        errors in solving for the coefficients can only increase it. Raises a
+        ValueError if there are not more rows than coefficients and a
+        FloatingPointError if the rounding error of the sums, see
+        `OnlineRegression`, makes it negative.
+        """
+        if self.df_resid <= 0:
+            raise ValueError(
+                f"The regression has {self.nobs} rows, so the residual variance "
+                f"of its {len(self.xty)} coefficients is not defined."
+            )
+        params = self.params.to_numpy()
+        ssr = (
+            self.yty - 2 * float(params @ self.xty) + float(params @ self.xtx @ params)
+        )
+        if ssr < 0:
+            raise FloatingPointError(
+                f"The sum of squared residuals, {ssr}, is negative because of "
+                "the rounding error of the sums. Fit the regression to the rows "
+                "again."
+            )
+        return ssr
+
+    @property
+    def scale(self):
+        """Residual variance, `ssr / df_resid`."""
+        return self.ssr / self.df_resid
+
+    def predict(self, exog):
+        """
+        Predict the dependent variable from the current coefficients.
+
+        Parameters
+        ----------
+        exog : DataFrame or dict
+            Values of the independent variables, e.g. the reporting conditions.
+
+        Returns
+        -------
+        Series
+            Predicted values, indexed like `exog` when it is a DataFrame.
+        """
+        if not isinstance(exog, pd.DataFrame):
+            exog = pd.DataFrame({k: np.atleast_1d(v) for k, v in dict(exog).items()})
+        if is_astm_formula(self.formula):
+            design = astm_design_matrix(exog)
+        else:
+            design = dmatrix(
+                self.formula.split("~", 1)[1],
+                exog,
+                NA_action=NAAction(NA_types=[]),
+                return_type="dataframe",
+            )
+            design = design[self.exog_names].to_numpy()
+        return pd.Series(design @ self.params.to_numpy(), index=exog.index)
+
+    def check(self, results, rtol=1e-6):
+        """
+        Check the regression matches a regression fit to all of the rows.
+
+        Parameters
+        ----------
+        results : statsmodels regression results or AstmOLSResults
+            Results of fitting the same formula to the rows included, e.g. by
+            `fit_model`.
+        rtol : float, default 1e-6
+            Relative tolerance of the coefficients and residual variance.
+
+        Returns
+        -------
+        bool
+            True if the number of rows, coefficients, and residual variance
+            match.
+        """
+        params = results.params.reindex(self.exog_names)
+        return bool(
+            results.nobs == self.nobs
+            and np.allclose(self.params, params, rtol=rtol, atol=0)
+            and np.isclose(self.scale, results.scale, rtol=rtol, atol=0)
+        )
+
+
+def predict(regs, rcs):
+    """
+    Calculate predicted values for given linear models and predictor values.
+
+    Evaluates the first linear model in the iterable with the first row of the
+    predictor values in the dataframe.  Passed arguments must be aligned.
+
+    When the models have the same terms, which is the case for models fit with
+    the same formula, the design matrix of all of the rows is built at once and
+    multiplied by the stacked coefficients of the models.
+
+    Parameters
+    ----------
+    regs : iterable of statsmodels regression results wrappers
+    rcs : pandas dataframe
+        Dataframe of predictor values used to evaluate each linear model.
+        The column names must match the strings used in the regression
+        formuala.
+
+    Returns
+    -------
+    Pandas series of predicted values.
+    """
+    regs = list(regs)
+    if len(regs) == 0:
+        return pd.Series(dtype="float64")
+    terms = regs[0].params.index
+    if not all(reg.params.index.equals(terms) for reg in regs):
+        pred_cap = list()
+        for i, mod in enumerate(regs):
+            RC_df = pd.DataFrame(rcs.iloc[i, :]).T
+            pred_cap.append(mod.predict(RC_df).values[0])
+        return pd.Series(pred_cap)
+    exog = design_matrix(regs[0], rcs.iloc[: len(regs), :])
+    params = np.vstack([reg.params.to_numpy() for reg in regs])
+    return pd.Series((exog * params).sum(axis=1))
+
+
+def fit_grouped_astm(grps):
+    """
+    Fit the ASTM E2848 regression to every group of a groupby at once.
+
+    Instead of one statsmodels fit per group, the sums of the products of the
+    design matrix columns (X'X) and of the columns and power (X'y) are
+    accumulated for all groups in a single pass with `np.bincount` on the group
+    codes, and the normal equations of all groups are solved together. The
+    columns are scaled before solving and the solution is refined once using
+    the residuals, so the coefficients match a QR or statsmodels fit to near
+    machine precision. Rows with missing values are dropped, as patsy does.
+
+    Parameters
+    ----------
+    grps : pandas groupby
+        Groupby of a DataFrame with `power`, `poa`, `t_amb`, and `w_vel`
+        columns, e.g. the time groups used by `CapData.predict_capacities`.
+
+    Returns
+    -------
+    DataFrame or None
+        Regression coefficients with one row per group, indexed like
+        ``grps.agg('count')``, and the patsy term names as columns. None if the
+        columns are missing or any group has too few points or a rank
+        deficient design matrix to be solved this way.
+    """
+    df = grps.obj
+    try:
+        endog = df["power"].to_numpy(dtype="float64")
+        exog = astm_design_matrix(df)
+    except (KeyError, TypeError, ValueError):
+        return None
+    codes = grps.ngroup().to_numpy(dtype="float64")
+    n_grps = grps.ngroups
+    complete = ~(np.isnan(endog) | np.isnan(exog).any(axis=1) | np.isnan(codes))
+    endog = endog[complete]
+    exog = exog[complete]
+    codes = codes[complete].astype("int64")
+    k = exog.shape[1]
+    if (np.bincount(codes, minlength=n_grps) <= k).any():
+        return None
+
+    def grouped_sums(weights):
+        return np.bincount(codes, weights=weights, minlength=n_grps)
+
+    xtx = np.empty((n_grps, k, k))
+    for i, j in combinations(range(k), 2):
+        xtx[:, i, j] = xtx[:, j, i] = grouped_sums(exog[:, i] * exog[:, j])
+    for i in range(k):
+        xtx[:, i, i] = grouped_sums(exog[:, i] * exog[:, i])
+    scale = np.sqrt(np.diagonal(xtx, axis1=1, axis2=2))
+    if (scale == 0).any():
+        return None
+    xtx_scaled = xtx / scale[:, :, None] / scale[:, None, :]
+    if (np.linalg.cond(xtx_scaled) > 1 / np.finfo("float64").eps).any():
+        return None
+
+    def solve(target):
+        xty = np.column_stack([grouped_sums(exog[:, i] * target) for i in range(k)])
+        return np.linalg.solve(xtx_scaled, (xty / scale)[:, :, None])[:, :, 0] / scale
+
+    params = solve(endog)
+    resid = endog - (exog * params[codes]).sum(axis=1)
+    params = params + solve(resid)
+    return pd.DataFrame(params, index=grps.agg("count").index, columns=ASTM_TERMS)
+
+
+def pred_summary(grps, rcs, allowance, **kwargs):
+    """
+    Summarize reporting conditions, predicted cap, and gauranteed cap.
+
+    This method does not calculate reporting conditions. When the formula is
+    the default ASTM E2848 formula, all groups are fit at once with
+    `fit_grouped_astm`. Other formulas are fit group by group with `fit_model`.
+
+    Parameters
+    ----------
+    grps : pandas groupby object
+        Solar data grouped by season or month used to calculate reporting
+        conditions.  This argument is used to fit models for each group.
+    rcs : pandas dataframe
+        Dataframe of reporting conditions used to predict capacities.
+    allowance : float
+        Percent allowance to calculate gauranteed capacity from predicted
+        capacity.
+    **kwargs
+        Passed to `fit_model`, e.g. `fml` to set the regression formula.
+
+    Returns
+    -------
+    Dataframe of reporting conditions, model coefficients, predicted capacities
+    gauranteed capacities, and points in each grouping.
+    """
+    params = None
+    if (
+        is_astm_formula(kwargs.get("fml", ASTM_FORMULA))
+        and {"poa", "t_amb", "w_vel"}.issubset(rcs.columns)
+        and rcs.shape[0] == grps.ngroups
+    ):
+        params = fit_grouped_astm(grps)
+    if params is None:
+        regs = grps.apply(fit_model, **kwargs)
+        predictions = predict(regs, rcs)
+        params = regs.apply(lambda x: x.params.transpose())
+    else:
+        predictions = pd.Series(
+            (astm_design_matrix(rcs) * params.to_numpy()).sum(axis=1)
+        )
+    pt_qty = grps.agg("count").iloc[:, 0]
+    predictions.index = pt_qty.index
+
+    params.index = pt_qty.index
+    rcs.index = pt_qty.index
+    predictions.name = "PredCap"
+
+    for rc_col_name in rcs.columns:
+        for param_col_name in params.columns:
+            if rc_col_name == param_col_name:
+                new_col_name = param_col_name + "-param"
+                params.rename(columns={param_col_name: new_col_name}, inplace=True)
+
+    results = pd.concat([rcs, predictions, params], axis=1)
+
+    results["guaranteedCap"] = results["PredCap"] * (1 - allowance)
+    results["pt_qty"] = pt_qty.values
+
+    return results
+
+
+def pvlib_location(loc):
+    """
+    Create a pvlib location object.
 
     Parameters
     ----------
@@ -944,6 +2043,30 @@ def pvlib_location(loc):
     return Location(**loc)
 
 
+@cache
+def sam_default_parameters(name):
+    """
+    Return the parameters of the first entry in a SAM database.
+
+    The database is read with pvlib `retrieve_sam` the first time it is
+    requested and the result is kept for the rest of the session, so repeated
+    calls to `pvlib_system` and `csky` do not parse the SAM files again.
+
+    Parameters
+    ----------
+    name : str
+        Name of the SAM database passed to `retrieve_sam`, e.g. 'SandiaMod'
+        or 'cecinverter'.
+
+    Returns
+    -------
+    Series
+        Parameters of the first module or inverter in the database. Copy the
+        Series before modifying it.
+    """
+    return retrieve_sam(name).iloc[:, 0]
+
+
 def pvlib_system(sys):
     """
     Create a pvlib :py:class:`~pvlib.pvsystem.PVSystem` object.
@@ -975,10 +2098,8 @@ def pvlib_system(sys):
     -------
     pvlib PVSystem object.
     """
-    sandia_modules = retrieve_sam("SandiaMod")
-    cec_inverters = retrieve_sam("cecinverter")
-    sandia_module = sandia_modules.iloc[:, 0]
-    cec_inverter = cec_inverters.iloc[:, 0]
+    sandia_module = sam_default_parameters("SandiaMod").copy()
+    cec_inverter = sam_default_parameters("cecinverter").copy()
 
     albedo = sys.pop("albedo", None)
     trck_kwords = ["axis_tilt", "axis_azimuth", "max_angle", "backtrack", "gcr"]  # noqa: E501
@@ -1039,7 +2160,153 @@ def get_tz_index(time_source, loc):
             return time_source
 
 
-def csky(time_source, loc=None, sys=None, concat=True, output="both"):
+def model_csky(times, loc, sys, output="both"):
+    """
+    Model clear sky irradiance with pvlib.
+
+    Parameters
+    ----------
+    times : DatetimeIndex
+        Timezone aware index returned by `get_tz_index`.
+    loc : dict
+        See `csky`.
+    sys : dict
+        See `csky`. The dictionary is not modified.
+    output : str, default 'both'
+        See `csky`.
+
+    Returns
+    -------
+    DataFrame
+        Clear sky data with a timezone naive index.
+    """
+    location = pvlib_location(loc)
+    system = pvlib_system(dict(sys))
+    mc = ModelChain(system, location)
+    ghi = location.get_clearsky(times=times)
+    # pvlib get_Clearsky also returns 'wind_speed' and 'temp_air'
+    mc.prepare_inputs(weather=ghi)
+    cols = [
+        "poa_global",
+        "poa_direct",
+        "poa_diffuse",
+        "poa_sky_diffuse",
+        "poa_ground_diffuse",
+    ]
+
+    if output == "both":
+        csky_df = pd.DataFrame(
+            {
+                "poa_mod_csky": mc.results.total_irrad["poa_global"],
+                "ghi_mod_csky": ghi["ghi"],
+            }
+        )
+    if output == "poa_all":
+        csky_df = mc.results.total_irrad[cols]
+    if output == "ghi_all":
+        csky_df = ghi[["ghi", "dni", "dhi"]]
+    if output == "all":
+        csky_df = pd.concat(
+            [mc.results.total_irrad[cols], ghi[["ghi", "dni", "dhi"]]], axis=1
+        )
+
+    ix_no_tz = csky_df.index.tz_localize(None, ambiguous="infer", nonexistent="NaT")
+    csky_df.index = ix_no_tz
+    return csky_df
+
+
+def csky_cache_key(times, loc, sys, output):
+    """
+    Create a key identifying the clear sky data for a csky call.
+
+    The key is a hash of the location and system dictionaries, the output
+    option, the pvlib version, and the timestamps and timezone of `times`, so
+    any change to the inputs results in a different key.
+
+    Parameters
+    ----------
+    times : DatetimeIndex
+        Timezone aware index returned by `get_tz_index`.
+    loc : dict
+        Location dictionary passed to `csky`.
+    sys : dict
+        System dictionary passed to `csky`.
+    output : str
+        Output option passed to `csky`.
+
+    Returns
+    -------
+    str
+        Hexadecimal SHA-256 digest.
+    """
+    hasher = hashlib.sha256()
+    inputs = {
+        "loc": loc,
+        "sys": sys,
+        "output": output,
+        "tz": str(times.tz),
+        "pvlib": importlib.metadata.version("pvlib"),
+    }
+    hasher.update(json.dumps(inputs, sort_keys=True, default=str).encode())
+    if hasattr(times, "as_unit"):
+        # the same timestamps give the same key whatever the index resolution
+        times = times.as_unit("ns")
+    hasher.update(np.ascontiguousarray(times.asi8).tobytes())
+    return hasher.hexdigest()
+
+
+def read_csky_cache(path):
+    """
+    Read clear sky data saved by `write_csky_cache`.
+
+    Parameters
+    ----------
+    path : Path
+        Path to the cache file.
+
+    Returns
+    -------
+    DataFrame or None
+        None if the file does not exist or cannot be read.
+    """
+    try:
+        with np.load(path, allow_pickle=False) as cached:
+            meta = json.loads(str(cached["meta"]))
+            index = pd.DatetimeIndex(cached["index"], name=meta["index_name"])
+            return pd.DataFrame(cached["values"], index=index, columns=meta["columns"])
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        return None
+
+
+def write_csky_cache(path, csky_df):
+    """
+    Save clear sky data returned by `csky` to a compressed NPZ file.
+
+    The file is written to a temporary file first and then moved into place,
+    so a partially written file is never read. The index is saved as a
+    datetime64 array, so its resolution is kept.
+
+    Parameters
+    ----------
+    path : Path
+        Path to the cache file. Parent directories are created if needed.
+    csky_df : DataFrame
+        Clear sky data with a timezone naive DatetimeIndex.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    meta = {"columns": list(csky_df.columns), "index_name": csky_df.index.name}
+    tmp_path = path.with_name(path.name + f".{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        np.savez_compressed(
+            f,
+            values=csky_df.to_numpy(dtype="float64"),
+            index=csky_df.index.to_numpy(),
+            meta=np.array(json.dumps(meta)),
+        )
+    os.replace(tmp_path, path)
+
+
+def csky(time_source, loc=None, sys=None, concat=True, output="both", cache_dir=None):
     """
     Calculate clear sky poa and ghi.
 
@@ -1087,40 +2354,23 @@ def csky(time_source, loc=None, sys=None, concat=True, output="both"):
         poa_all - returns all components of poa
         ghi_all - returns all components of ghi
         all - returns all components of poa and ghi
+    cache_dir : str or Path, default None
+        Directory to cache the clear sky data in. When passed, the modeled data
+        is saved to a file named by `csky_cache_key` and later calls with the
+        same location, system, output, and timestamps read the file instead of
+        running the pvlib models. By default nothing is cached.
     """
-    location = pvlib_location(loc)
-    system = pvlib_system(sys)
-    mc = ModelChain(system, location)
     times = get_tz_index(time_source, loc)
-    ghi = location.get_clearsky(times=times)
-    # pvlib get_Clearsky also returns 'wind_speed' and 'temp_air'
-    mc.prepare_inputs(weather=ghi)
-    cols = [
-        "poa_global",
-        "poa_direct",
-        "poa_diffuse",
-        "poa_sky_diffuse",
-        "poa_ground_diffuse",
-    ]
-
-    if output == "both":
-        csky_df = pd.DataFrame(
-            {
-                "poa_mod_csky": mc.results.total_irrad["poa_global"],
-                "ghi_mod_csky": ghi["ghi"],
-            }
-        )
-    if output == "poa_all":
-        csky_df = mc.results.total_irrad[cols]
-    if output == "ghi_all":
-        csky_df = ghi[["ghi", "dni", "dhi"]]
-    if output == "all":
-        csky_df = pd.concat(
-            [mc.results.total_irrad[cols], ghi[["ghi", "dni", "dhi"]]], axis=1
-        )
-
-    ix_no_tz = csky_df.index.tz_localize(None, ambiguous="infer", nonexistent="NaT")
-    csky_df.index = ix_no_tz
+    cache_path = None
+    csky_df = None
+    if cache_dir is not None:
+        cache_key = csky_cache_key(times, loc, sys, output)
+        cache_path = Path(cache_dir) / f"csky_{cache_key}.npz"
+        csky_df = read_csky_cache(cache_path)
+    if csky_df is None:
+        csky_df = model_csky(times, loc, sys, output)
+        if cache_path is not None:
+            write_csky_cache(cache_path, csky_df)
 
     if concat:
         if isinstance(time_source, pd.core.frame.DataFrame):
@@ -1142,6 +2392,36 @@ def csky(time_source, loc=None, sys=None, concat=True, output="both"):
         return csky_df
 
 
+SESSION_FILES = {
+    "meta": "session.json",
+    "data": "data.parquet",
+    "data_filtered": "data_filtered.parquet",
+    "rc": "rc.parquet",
+    "masks": "masks.npz",
+    "objects": "objects.pkl",
+}
+
+
+def json_default(value):
+    """Convert numpy scalars and pandas objects for `json.dumps`."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, collections.abc.Mapping):
+        return dict(value)
+    if isinstance(value, pd.Index):
+        return value.tolist()
+    if isinstance(value, pd.Timestamp):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def write_parquet(data, path):
+    """Write a DataFrame to Parquet, writing to a temporary file first."""
+    tmp_path = path.with_name(path.name + f".{os.getpid()}.tmp")
+    data.to_parquet(tmp_path, engine="pyarrow")
+    os.replace(tmp_path, path)
+
+
 def get_summary(*args):
     """
     Return summary dataframe of filtering steps for multiple CapData objects.
@@ -1214,8 +2494,9 @@ def predict_with_pvalue_check(cd, rc=None, pval_threshold=0.05):
     """
     Make prediction with optional p-value filtering of coefficients.
 
-    Uses model.predict() with custom params to ensure consistent behavior
-    across pandas 2.x and 3.0+ (avoids Copy-on-Write issues).
+    Multiplies the design matrix of the reporting conditions (see
+    `design_matrix`) by a copy of the coefficients, which ensures consistent
+    behavior across pandas 2.x and 3.0+ (avoids Copy-on-Write issues).
 
     Parameters
     ----------
@@ -1238,17 +2519,11 @@ def predict_with_pvalue_check(cd, rc=None, pval_threshold=0.05):
     if rc is None:
         rc = cd.rc
     # Copy params to avoid modifying original
-    modified_params = results.params.copy()
+    modified_params = results.params.to_numpy(copy=True)
     # Zero out coefficients with p-values above threshold
     if pval_threshold is not None:
-        for key, pval in results.pvalues.items():
-            if pval > pval_threshold:
-                modified_params[key] = 0
-    # Create design matrix from reporting conditions
-    design_info = results.model.data.design_info
-    exog = dmatrix(design_info, rc)
-    # Predict using model.predict with custom params
-    return results.model.predict(modified_params, exog)[0]
+        modified_params[results.pvalues.to_numpy() > pval_threshold] = 0
+    return (design_matrix(results, rc) @ modified_params)[0]
 
 
 def captest_results(
@@ -1393,63 +2668,717 @@ def captest_results_check_pvalues(
         inplace=True,
     )
 
-    cap_ratio = captest_results(
-        sim,
-        das,
-        nameplate,
-        tolerance,
-        print_res=print_res,
-        check_pvalues=False,
-        **kwargs,
-    )
-    cap_ratio_check_pvalues = captest_results(
-        sim,
-        das,
-        nameplate,
-        tolerance,
-        print_res=print_res,
-        check_pvalues=True,
-        **kwargs,
-    )
+    cap_ratio = captest_results(
+        sim,
+        das,
+        nameplate,
+        tolerance,
+        print_res=print_res,
+        check_pvalues=False,
+        **kwargs,
+    )
+    cap_ratio_check_pvalues = captest_results(
+        sim,
+        das,
+        nameplate,
+        tolerance,
+        print_res=print_res,
+        check_pvalues=True,
+        **kwargs,
+    )
+
+    cap_ratio_rounded = np.round(cap_ratio, decimals=4) * 100
+    cap_ratio_check_pvalues_rounded = (
+        np.round(cap_ratio_check_pvalues, decimals=4) * 100
+    )
+
+    result_str = "{:.3f}% - Cap Ratio"
+    print(result_str.format(cap_ratio_rounded))
+
+    result_str_pval_check = "{:.3f}% - Cap Ratio after pval check"
+    print(result_str_pval_check.format(cap_ratio_check_pvalues_rounded))
+
+    return df_pvals.style.format("{:20,.5f}").apply(
+        highlight_pvals, subset=["das_pvals", "sim_pvals"]
+    )
+
+
+BOOTSTRAP_WORKER_STATE = {}
+
+
+def init_bootstrap_worker(*inputs):
+    """Store the inputs shared by the bootstrap replicates in a worker process."""
+    BOOTSTRAP_WORKER_STATE["inputs"] = inputs
+
+
+def run_bootstrap_worker_chunk(seed, n_replicates):
+    """Run bootstrap replicates with the inputs stored by `init_bootstrap_worker`."""
+    return bootstrap_chunk(seed, n_replicates, *BOOTSTRAP_WORKER_STATE["inputs"])
+
+
+def bootstrap_chunk(seed, n_replicates, data, fml, rc_exog, blocks, sigmas):
+    """
+    Refit the regression to bootstrap replicates of the data and predict at RCs.
+
+    Each replicate draws the blocks of `data` with replacement and adds an
+    offset drawn from a normal distribution with a standard deviation from
+    `sigmas` to every value of each perturbed column. The regressions of the
+    replicates are solved together as weighted least squares problems, where
+    the weight of a row is the number of times its block was drawn.
+
+    Parameters
+    ----------
+    seed : numpy.random.SeedSequence or int
+        Seed of the random number generator of these replicates.
+    n_replicates : int
+        Number of replicates.
+    data : DataFrame
+        Regression data without missing values.
+    fml : str
+        Regression formula.
+    rc_exog : numpy.ndarray
+        Design matrix row of the reporting conditions.
+    blocks : numpy.ndarray of int
+        Block number of each row of `data`, from 0 to the number of blocks - 1.
+    sigmas : dict
+        Standard deviation of the offset added to each perturbed column.
+
+    Returns
+    -------
+    numpy.ndarray
+        Predicted output at the reporting conditions for each replicate.
+    """
+    rng = np.random.default_rng(seed)
+    n_blocks = int(blocks.max()) + 1
+    counts = rng.multinomial(
+        n_blocks, np.full(n_blocks, 1 / n_blocks), size=n_replicates
+    )
+    offsets = {
+        col: rng.normal(0, sigma, size=n_replicates) for col, sigma in sigmas.items()
+    }
+    astm = is_astm_formula(fml)
+    if not astm:
+        endog, exog = dmatrices(fml, data)
+        y_info, x_info = endog.design_info, exog.design_info
+        endog, exog = np.asarray(endog)[:, 0], np.asarray(exog)
+
+    k = rc_exog.shape[0]
+    batch = max(1, 2**24 // (data.shape[0] * k))
+    predictions = np.empty(n_replicates)
+    for start in range(0, n_replicates, batch):
+        stop = min(start + batch, n_replicates)
+        weights = counts[start:stop][:, blocks].astype("float64")
+        if astm:
+            cols = {
+                col: data[col].to_numpy(dtype="float64")[None, :]
+                + offsets.get(col, np.zeros(n_replicates))[start:stop, None]
+                for col in ["power", "poa", "t_amb", "w_vel"]
+            }
+            endog = cols["power"]
+            exog = np.stack(
+                [
+                    cols["poa"],
+                    cols["poa"] ** 2,
+                    cols["poa"] * cols["t_amb"],
+                    cols["poa"] * cols["w_vel"],
+                ],
+                axis=-1,
+            )
+        elif len(offsets) > 0:
+            matrices = []
+            for i in range(start, stop):
+                perturbed = data.copy()
+                for col, offset in offsets.items():
+                    perturbed[col] = perturbed[col] + offset[i]
+                matrices.append(
+                    [
+                        np.asarray(matrix)
+                        for matrix in build_design_matrices([y_info, x_info], perturbed)
+                    ]
+                )
+            endog = np.stack([y[:, 0] for y, _ in matrices])
+            exog = np.stack([x for _, x in matrices])
+        weighted = exog * weights[:, :, None]
+        xtx = np.swapaxes(weighted, -1, -2) @ exog
+        xty = (np.swapaxes(weighted, -1, -2) @ endog[..., None])[..., 0]
+        if xtx.ndim == 2:
+            xtx = np.broadcast_to(xtx, (stop - start, k, k))
+        scale = np.sqrt(np.diagonal(xtx, axis1=1, axis2=2))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            xtx_scaled = xtx / scale[:, :, None] / scale[:, None, :]
+            params = np.full((stop - start, k), np.nan)
+            solvable = np.isfinite(xtx_scaled).all(axis=(1, 2)) & (
+                np.linalg.cond(np.nan_to_num(xtx_scaled)) < 1 / np.finfo("float64").eps
+            )
+            params[solvable] = (
+                np.linalg.solve(
+                    xtx_scaled[solvable], (xty / scale)[solvable][:, :, None]
+                )[:, :, 0]
+                / scale[solvable]
+            )
+        predictions[start:stop] = params @ rc_exog
+    return predictions
+
+
+def bootstrap_cap_ratio(
+    sim,
+    das,
+    n_replicates=1000,
+    grp_to_term=None,
+    block="D",
+    seed=None,
+    workers=None,
+    executor="process",
+    chunksize=100,
+):
+    """
+    Estimate the distribution of the capacity ratio with a bootstrap.
+
+    The regression of the measured data is refit to replicates of the filtered
+    data, and the capacity ratio of each replicate is calculated as in
+    `captest_results`. Each replicate resamples the data in blocks, by day by
+    default, so that the autocorrelation of the measurements within a block is
+    kept. When `grp_to_term` is passed, each replicate also adds a systematic
+    error to the measurements of each regression variable, drawn from a normal
+    distribution with a standard deviation of the instrument and spatial
+    uncertainties added in quadrature (see `CapData.expanded_uncert`).
+
+    The regressions of many replicates are solved at once as weighted least
+    squares problems. With the default formula the design matrices are built
+    with numpy; other formulas are evaluated with patsy for each replicate when
+    measurements are perturbed.
+
+    Parameters
+    ----------
+    sim : CapData
+        CapData object for simulated data with a fitted regression.
+    das : CapData
+        CapData object for measured data with a fitted regression. The data
+        returned by ``das.get_reg_cols()`` is resampled.
+    n_replicates : int, default 1000
+        Number of bootstrap replicates.
+    grp_to_term : dict, default None
+        Map the groups of measurement types in the `instrument_uncert` and
+        `spatial_uncerts` attributes of `das` to the regression variables, as in
+        `CapData.expanded_uncert`. By default the measurements are not
+        perturbed.
+    block : str or None, default 'D'
+        Frequency of the blocks of rows that are resampled together. None
+        resamples individual rows.
+    seed : int or numpy.random.SeedSequence, default None
+        Seed for the random numbers. The results are the same for the same seed
+        regardless of `workers`.
+    workers : int, default None
+        Number of workers. None or 1 runs the replicates in this process.
+    executor : {'process', 'thread'} or concurrent.futures.Executor
+        Default 'process'. Kind of pool used when `workers` is greater than one,
+        or an existing executor to use regardless of `workers`.
+    chunksize : int, default 100
+        Number of replicates run by each task.
+
+    Returns
+    -------
+    Series
+        Capacity ratio of each replicate, indexed by replicate number. Replicates
+        whose regression could not be solved are NaN.
+
+    Notes
+    -----
+    The reporting conditions and the expected output of the simulated data are
+    held fixed. P-values of the coefficients are not checked.
+    """
+    if sim.regression_formula != das.regression_formula:
+        raise ValueError("CapData objects do not have the same regression formula.")
+    rc_result = pick_attr(sim, das, "rc")
+    if rc_result is None:
+        raise ValueError("Reporting conditions must be set for either sim or das.")
+    rc = rc_result[0]
+    fml = das.regression_formula
+    expected = predict_with_pvalue_check(sim, rc=rc, pval_threshold=None)
+
+    data = das.get_reg_cols()
+    exog = dmatrices(fml, data, return_type="dataframe")[1]
+    data = upcast_floats(data.loc[exog.index, :])
+    if is_astm_formula(fml):
+        rc_exog = astm_design_matrix(rc)[0]
+    else:
+        rc_exog = np.asarray(
+            dmatrix(exog.design_info, rc, NA_action=NAAction(NA_types=[]))
+        )[0]
+    if block is None:
+        blocks = np.arange(data.shape[0])
+    else:
+        blocks = np.unique(
+            data.groupby(pd.Grouper(freq=block)).ngroup().to_numpy(),
+            return_inverse=True,
+        )[1]
+    sigmas = {}
+    if grp_to_term is not None:
+        for group, term in grp_to_term.items():
+            sigmas[term] = (
+                das.instrument_uncert[group] ** 2 + das.spatial_uncerts[group] ** 2
+            ) ** (1 / 2)
+
+    inputs = (data, fml, rc_exog, blocks, sigmas)
+    sizes = [
+        min(chunksize, n_replicates - start)
+        for start in range(0, n_replicates, chunksize)
+    ]
+    tasks = list(zip(np.random.SeedSequence(seed).spawn(len(sizes)), sizes))
+    chunks = util.run_tasks(
+        bootstrap_chunk,
+        tasks,
+        inputs,
+        workers=workers,
+        executor=executor,
+        worker_func=run_bootstrap_worker_chunk,
+        initializer=init_bootstrap_worker,
+    )
+
+    actual = np.concatenate(chunks) if chunks else np.empty(0)
+    cap_ratio = actual / expected
+    small = cap_ratio < 0.01
+    if small.any():
+        cap_ratio[small] *= 1000
+        warnings.warn(
+            "Capacity ratios less than 0.01 were multiplied by 1000 as in "
+            "captest_results."
+        )
+    return pd.Series(
+        cap_ratio,
+        index=pd.RangeIndex(len(cap_ratio), name="replicate"),
+        name="cap_ratio",
+    )
+
+
+def run_test(cd, steps):
+    """
+    Apply a list of capacity test steps to a given CapData object.
+
+    A list of CapData methods is applied sequentially with the passed
+    parameters.  This method allows succintly defining a capacity test,
+    which facilitates parametric and automatic testing.
+
+    Parameters
+    ----------
+    cd : CapData
+        The CapData methods will be applied to this instance of the pvcaptest
+        CapData class.
+    steps : list of tuples
+        A list of the methods to be applied and the arguments to be used.
+        Each item in the list should be a tuple of the CapData method followed
+        by a tuple of arguments and a dictionary of keyword arguments. If
+        there are not args or kwargs an empty tuple or dict should be included.
+        Example: [(CapData.filter_irr, (400, 1500), {})]
+    """
+    for step in steps:
+        step[0](cd, *step[1], **step[2])
+
+
+def copy_state(attributes):
+    """
+    Copy CapData attributes without copying the data they hold.
+
+    DataFrames are shallow copied and lists are copied, so the copy shares the
+    underlying data. Dictionaries, like `column_groups` and `regression_cols`,
+    are deep copied because they are modified in place by some methods, and an
+    `OnlineRegression` is copied because it is updated in place.
+
+    Parameters
+    ----------
+    attributes : dict
+        Attribute names and values.
+
+    Returns
+    -------
+    dict
+    """
+    state = {}
+    for key, value in attributes.items():
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            value = value.copy(deep=False)
+        elif isinstance(value, list):
+            value = list(value)
+        elif isinstance(value, collections.abc.MutableMapping):
+            value = copy.deepcopy(value)
+        elif isinstance(value, OnlineRegression):
+            value = value.copy()
+        state[key] = value
+    return state
+
+
+def capdata_state(cd):
+    """
+    Record the attributes of a CapData object so they can be restored later.
+
+    Parameters
+    ----------
+    cd : CapData
+
+    Returns
+    -------
+    dict
+        Copy of the instance attributes of `cd` other than the indexers. See
+        `copy_state`.
+    """
+    return copy_state(
+        {key: value for key, value in vars(cd).items() if key not in ("loc", "floc")}
+    )
+
+
+def restore_capdata_state(cd, state):
+    """
+    Set the attributes of a CapData object to a state from `capdata_state`.
+
+    Parameters
+    ----------
+    cd : CapData
+    state : dict
+        State returned by `capdata_state`. It is copied, so it can be restored
+        again.
+    """
+    for key in list(vars(cd)):
+        if key not in state and key not in ("loc", "floc"):
+            delattr(cd, key)
+    vars(cd).update(copy_state(state))
+
+
+def equal_arguments(a, b):
+    """
+    Check if two arguments of a capacity test step are equal.
+
+    Compares pandas objects and numpy arrays by value and containers by their
+    items. Other objects are equal if they are the same object or compare equal.
+
+    Parameters
+    ----------
+    a, b : object
+
+    Returns
+    -------
+    bool
+    """
+    if a is b:
+        return True
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, (pd.DataFrame, pd.Series, pd.Index)):
+        return a.equals(b)
+    if isinstance(a, np.ndarray):
+        return a.shape == b.shape and np.array_equal(
+            a, b, equal_nan=a.dtype.kind == "f"
+        )
+    if isinstance(a, (list, tuple)):
+        return len(a) == len(b) and all(equal_arguments(x, y) for x, y in zip(a, b))
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(equal_arguments(a[k], b[k]) for k in a)
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):
+        return False
+
+
+class FilterPipeline:
+    """
+    Capacity test steps that are re-run only from the first changed step.
+
+    Applies a list of steps to a CapData object like `run_test` and records
+    the method, arguments, and resulting state of the CapData object after
+    each step. When the steps are run again, the recorded state after the
+    last unchanged step is restored and only the changed step and the steps
+    following it are run. This makes re-tuning a single filter in a long list
+    of steps as fast as running the steps after it.
+
+    Parameters
+    ----------
+    cd : CapData
+        The CapData object the steps are applied to. Its state when the
+        pipeline is created is the starting point for every run.
+    steps : list of tuples, default None
+        Steps in the format used by `run_test`, e.g.
+        ``[(CapData.filter_irr, (400, 1500), {})]``.
+
+    Attributes
+    ----------
+    cd : CapData
+        The CapData object the steps are applied to.
+    steps : list of tuples
+        Steps applied by `run`. Change items of this list and call `run` again
+        to re-run the changed steps.
+    rerun_from : int or None
+        Position of the first step run by the last call to `run`. Equal to the
+        number of steps if no steps were run.
+
+    Notes
+    -----
+    The recorded state shares the data of the CapData object, so with mask
+    filtering (see `CapData`) each step adds little more than a bit-packed
+    mask. Without mask filtering the filtered copy of the data from every step
+    is kept.
+
+    Changes made to `cd` outside of the pipeline are discarded when `run` is
+    called. Steps are compared by their arguments, so a step is not re-run if
+    a function passed to it, e.g. to `filter_custom`, is changed without
+    passing a new function. Call `clear` to run every step again.
+    """
+
+    def __init__(self, cd, steps=None):
+        self.cd = cd
+        self.steps = [] if steps is None else list(steps)
+        self.rerun_from = None
+        self._initial_state = capdata_state(cd)
+        self._records = []
+
+    def _same_step(self, position, step):
+        recorded = self._records[position]["step"]
+        return recorded[0] is step[0] and equal_arguments(recorded[1:], step[1:])
+
+    def run(self, steps=None):
+        """
+        Apply the steps, re-running only the changed steps and those after them.
+
+        Parameters
+        ----------
+        steps : list of tuples, default None
+            New list of steps to apply. Uses the `steps` attribute by default.
+
+        Returns
+        -------
+        CapData
+            The CapData object with the steps applied.
+        """
+        if steps is not None:
+            self.steps = list(steps)
+        n_unchanged = 0
+        for position, step in enumerate(self.steps[: len(self._records)]):
+            if not self._same_step(position, step):
+                break
+            n_unchanged += 1
+        del self._records[n_unchanged:]
+        if n_unchanged == 0:
+            restore_capdata_state(self.cd, self._initial_state)
+        else:
+            restore_capdata_state(self.cd, self._records[-1]["state"])
+        self.rerun_from = n_unchanged
+        for step in self.steps[n_unchanged:]:
+            recorded_step = (step[0], copy.deepcopy(step[1]), copy.deepcopy(step[2]))
+            run_test(self.cd, [step])
+            self._records.append(
+                {"step": recorded_step, "state": capdata_state(self.cd)}
+            )
+        return self.cd
+
+    def clear(self):
+        """Discard the recorded steps so the next call to `run` runs every step."""
+        self._records = []
+
+
+SWEEP_WORKER_STATE = {}
+
+
+def init_sweep_worker(state, expected):
+    """Store the shared CapData state and expected results in a sweep worker."""
+    SWEEP_WORKER_STATE["state"] = state
+    SWEEP_WORKER_STATE["expected"] = expected
+
 
-    cap_ratio_rounded = np.round(cap_ratio, decimals=4) * 100
-    cap_ratio_check_pvalues_rounded = (
-        np.round(cap_ratio_check_pvalues, decimals=4) * 100
+def run_sweep_worker_variant(*task):
+    """Run a variant of a sweep with the state stored by `init_sweep_worker`."""
+    return run_sweep_variant(
+        *task, SWEEP_WORKER_STATE["state"], SWEEP_WORKER_STATE["expected"]
     )
 
-    result_str = "{:.3f}% - Cap Ratio"
-    print(result_str.format(cap_ratio_rounded))
 
-    result_str_pval_check = "{:.3f}% - Cap Ratio after pval check"
-    print(result_str_pval_check.format(cap_ratio_check_pvalues_rounded))
+def expand_grid(grid):
+    """
+    Get the list of variants of a parameter grid.
 
-    return df_pvals.style.format("{:20,.5f}").apply(
-        highlight_pvals, subset=["das_pvals", "sim_pvals"]
-    )
+    Parameters
+    ----------
+    grid : dict or list of dicts
+        Dictionary of parameter names and lists of values to combine, or a list
+        of dictionaries, one for each variant.
+
+    Returns
+    -------
+    list of dicts
+    """
+    if isinstance(grid, collections.abc.Mapping):
+        names = list(grid.keys())
+        return [dict(zip(names, values)) for values in product(*grid.values())]
+    return [dict(variant) for variant in grid]
 
 
-def run_test(cd, steps):
+def run_sweep_variant(
+    params, steps_template, pval_threshold, raise_errors, state, expected
+):
     """
-    Apply a list of capacity test steps to a given CapData object.
+    Run one variant of a sweep and summarize the results.
 
-    A list of CapData methods is applied sequentially with the passed
-    parameters.  This method allows succintly defining a capacity test,
-    which facilitates parametric and automatic testing.
+    Output printed and warnings raised while running the variant are
+    suppressed, unless it runs outside the main thread, e.g. in a thread pool,
+    because redirecting output and catching warnings are not thread-safe.
+
+    Parameters
+    ----------
+    params : dict
+        Parameters passed to `steps_template`.
+    steps_template : callable
+        Function returning the list of steps for `run_test` from the parameters.
+    pval_threshold : float or None
+        Passed to `predict_with_pvalue_check`.
+    raise_errors : bool
+        Set to True to raise errors instead of recording them in the results.
+    state : dict
+        State of the CapData object the steps are applied to, see
+        `capdata_state`.
+    expected : CapData, numeric, or None
+        Expected results, see `sweep`.
+
+    Returns
+    -------
+    dict
+    """
+    result = dict(params)
+    start = time.perf_counter()
+    with contextlib.ExitStack() as stack:
+        if threading.current_thread() is threading.main_thread():
+            stack.enter_context(warnings.catch_warnings())
+            stack.enter_context(contextlib.redirect_stdout(io.StringIO()))
+            warnings.simplefilter("ignore")
+        try:
+            cd = CapData(state["name"])
+            restore_capdata_state(cd, state)
+            run_test(cd, steps_template(**params))
+            expected_rc = getattr(expected, "rc", None)
+            if cd.rc is None and expected_rc is None:
+                cd.rep_cond()
+            if cd.regression_results is None:
+                cd.fit_regression(filter=False, summary=False)
+            rc = cd.rc if cd.rc is not None else expected_rc
+            actual = predict_with_pvalue_check(cd, rc=rc, pval_threshold=pval_threshold)
+            if isinstance(expected, CapData):
+                expected_value = predict_with_pvalue_check(
+                    expected, rc=rc, pval_threshold=pval_threshold
+                )
+            elif expected is None:
+                expected_value = np.nan
+            else:
+                expected_value = expected
+            if cd.filter_mask is not None:
+                result["points"] = int(cd.filter_mask.sum())
+            else:
+                result["points"] = cd.data_filtered.shape[0]
+            result["actual"] = actual
+            result["expected"] = expected_value
+            result["cap_ratio"] = actual / expected_value
+            for col, value in rc.iloc[0].items():
+                result["rc_" + col] = value
+            result["error"] = None
+        except Exception as err:
+            if raise_errors:
+                raise
+            result["error"] = f"{type(err).__name__}: {err}"
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def sweep(
+    cd,
+    steps_template,
+    grid,
+    expected=None,
+    workers=None,
+    executor="process",
+    check_pvalues=False,
+    pval=0.05,
+    raise_errors=False,
+):
+    """
+    Run variants of a capacity test and tabulate the capacity ratio of each.
+
+    For each variant of the parameters in `grid` the steps returned by
+    `steps_template` are applied to a copy of `cd` with `run_test`. If the steps
+    do not calculate reporting conditions and `expected` does not have them,
+    `rep_cond` is called with the default arguments, and if the steps do not fit
+    a regression `fit_regression` is called without filtering. The regression is
+    then used to predict the output at the reporting conditions.
+
+    The copies of `cd` share its data, so it is not copied for each variant.
+    When running variants in a process pool created here, the state of `cd` and
+    `expected` are sent to each worker process once, when it starts, instead of
+    with every variant. They are inherited without copying only with the 'fork'
+    start method, which is the default on Linux before Python 3.14; with
+    'spawn' or 'forkserver' they are pickled once for each worker.
+
+    Output printed and warnings raised by the steps are suppressed for each
+    variant run in this process or a process pool. They are not suppressed for
+    variants run in a thread pool, see `run_sweep_variant`.
 
     Parameters
     ----------
     cd : CapData
-        The CapData methods will be applied to this instance of the pvcaptest
-        CapData class.
-    steps : list of tuples
-        A list of the methods to be applied and the arguments to be used.
-        Each item in the list should be a tuple of the CapData method followed
-        by a tuple of arguments and a dictionary of keyword arguments. If
-        there are not args or kwargs an empty tuple or dict should be included.
-        Example: [(CapData.filter_irr, (400, 1500), {})]
+        CapData object, usually of measured data, with the data loaded and the
+        regression columns set. Any filtering already applied is kept.
+    steps_template : callable
+        Function that is passed the parameters of a variant as keyword
+        arguments and returns a list of steps in the format used by `run_test`.
+        Must be defined at the top level of a module to use a process pool.
+    grid : dict or list of dicts
+        Dictionary of parameter names and lists of values to run every
+        combination of, e.g. ``{'irr_low': [200, 400], 'percent': [0.05, 0.1]}``,
+        or a list of dictionaries of parameters, one for each variant.
+    expected : CapData or numeric, default None
+        CapData object with a fitted regression, usually of simulated data, or
+        the expected output at the reporting conditions. Used to calculate the
+        capacity ratio. The reporting conditions of `expected` are used for
+        variants that do not calculate reporting conditions.
+    workers : int, default None
+        Number of workers. None or 1 runs the variants one after another.
+    executor : {'process', 'thread'} or concurrent.futures.Executor
+        Default 'process'. Kind of pool used when `workers` is greater than one,
+        or an existing executor to use regardless of `workers`. The state of
+        `cd` is sent with every variant to an existing process pool.
+    check_pvalues : bool, default False
+        Set to True to set regression coefficients with a p-value greater than
+        `pval` to zero before predicting, as in `captest_results`.
+    pval : float, default 0.05
+        p-value cutoff used when `check_pvalues` is True.
+    raise_errors : bool, default False
+        Set to True to raise an error if a variant fails. By default the error
+        is recorded in the "error" column and the results of the variant are NaN.
+
+    Returns
+    -------
+    DataFrame
+        One row for each variant with the parameters, the number of points
+        after filtering ("points"), the predicted output at the reporting
+        conditions ("actual"), the expected output ("expected"), their ratio
+        ("cap_ratio"), the reporting conditions (prefixed with "rc_"), the
+        error, if any, and the run time in seconds.
     """
-    for step in steps:
-        step[0](cd, *step[1], **step[2])
+    variants = expand_grid(grid)
+    pval_threshold = pval if check_pvalues else None
+    state = capdata_state(cd)
+    tasks = [
+        (params, steps_template, pval_threshold, raise_errors) for params in variants
+    ]
+
+    results = util.run_tasks(
+        run_sweep_variant,
+        tasks,
+        (state, expected),
+        workers=workers,
+        executor=executor,
+        worker_func=run_sweep_worker_variant,
+        initializer=init_sweep_worker,
+    )
+
+    results = pd.DataFrame(results)
+    if results.empty:
+        return results
+    last = ["error", "seconds"]
+    return results[[col for col in results.columns if col not in last] + last]
 
 
 def overlay_scatters(measured, expected, expected_label="PVsyst"):
@@ -1512,10 +3441,19 @@ def index_capdata(capdata, label, filtered=True):
     --------
     DataFrame
     """
-    if filtered:
+    mask = capdata.filter_mask if filtered else None
+    if filtered and mask is None:
         data = capdata.data_filtered
     else:
         data = capdata.data
+    selected_data = select_capdata_columns(capdata, data, label)
+    if mask is not None:
+        selected_data = selected_data[mask]
+    return selected_data
+
+
+def select_capdata_columns(capdata, data, label):
+    """Select the columns of `data` for a label passed to `index_capdata`."""
     if label == "regcols":
         label = list(capdata.regression_cols.values())
     if isinstance(label, str):
@@ -1624,10 +3562,13 @@ class CapData(object):
         function.
     summary : list of dicts
         Holds the data modified by the update_summary decorator function.
+    filter_calls : list of tuples
+        Name, positional arguments, and keyword arguments of each filtering
+        method called since the filtering was last reset. Used by `append_data`.
     rc : DataFrame
         Dataframe for the reporting conditions (poa, t_amb, and w_vel).
-    regression_results : statsmodels linear regression model
-        Holds the linear regression model object.
+    regression_results : statsmodels linear regression model or AstmOLSResults
+        Holds the linear regression model object. See `fit_model`.
     regression_formula : str
         Regression formula to be fit to measured and simulated data.  Must
         follow the requirements of statsmodels use of patsy.
@@ -1635,12 +3576,34 @@ class CapData(object):
         String representing error band.  Ex. '+ 3', '+/- 3', '- 5'
         There must be space between the sign and number. Number is
         interpreted as a percent.  For example, 5 percent is 5 not 0.05.
+    mask_filtering : bool, default False
+        Set to True to store the filtering state as a boolean mask over the
+        index of `data` instead of a filtered copy of `data`. `data_filtered`
+        is then built from `data` and the mask only when it is accessed, so
+        memory use does not grow with the number of filtering steps. `data`
+        should not be modified in place after filtering has started, and
+        changes made directly to `data_filtered` are not kept.
+    kept : list
+        Record of the intervals kept by each filtering step, stored as
+        `FilterStep` objects, which behave like ``{"name": ..., "index": ...}``
+        dictionaries but hold a bit-packed mask over the index of `data`.
+        Dictionaries are stored for steps whose intervals cannot be represented
+        as a mask over `data`.
+    removed : list
+        Record of the intervals removed by each filtering step. See `kept`.
+    online_regression : OnlineRegression
+        Regression updated as intervals are filtered or appended. None until
+        `start_online_regression` is called.
     """
 
-    def __init__(self, name):  # noqa: D107
+    def __init__(self, name, mask_filtering=False):  # noqa: D107
         super(CapData, self).__init__()
         self.name = name
-        self.data = pd.DataFrame()
+        self.mask_filtering = mask_filtering
+        self._filter_mask = None
+        self._mask_index = None
+        self._data_filtered = None
+        self._data = pd.DataFrame()
         self.data_filtered = None
         self.column_groups = {}
         self.regression_cols = {}
@@ -1649,18 +3612,120 @@ class CapData(object):
         self.removed = []
         self.kept = []
         self.filter_counts = {}
+        self.filter_calls = []
         self.rc = None
         self.regression_results = None
-        self.regression_formula = (
-            "power ~ poa + I(poa * poa) + I(poa * t_amb) + I(poa * w_vel) - 1"
-        )
+        self.regression_formula = ASTM_FORMULA
         self.tolerance = None
         self.pre_agg_cols = None
         self.pre_agg_trans = None
         self.pre_agg_reg_trans = None
+        self.agg_map = None
+        self.online_regression = None
         self.loc = LocIndexer(self)
         self.floc = FilteredLocIndexer(self)
 
+    @property
+    def data(self):
+        """Unfiltered data."""
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+        # the cached filtered data may hold values of the replaced data
+        if self._filter_mask is not None:
+            self._data_filtered = None
+
+    @property
+    def data_filtered(self):
+        """
+        Filtered data.
+
+        When `mask_filtering` is True, this is built from `data` and
+        `filter_mask` on first access and cached until the mask changes.
+        """
+        mask = self.filter_mask
+        if mask is None:
+            return self._data_filtered
+        if self._data_filtered is None or not self._data_filtered.columns.equals(
+            self.data.columns
+        ):
+            self._data_filtered = self.data.loc[mask, :]
+        return self._data_filtered
+
+    @data_filtered.setter
+    def data_filtered(self, value):
+        self._data_filtered = value
+        self._filter_mask = None
+        self._mask_index = None
+        if self.mask_filtering and isinstance(value, pd.DataFrame):
+            if value.columns.equals(self.data.columns):
+                mask = index_to_mask(self.data.index, value.index)
+                if mask is not None:
+                    self._filter_mask = mask
+                    self._mask_index = self.data.index
+                    # drop the copy, it is rebuilt from the mask when accessed
+                    self._data_filtered = None
+
+    @property
+    def filter_mask(self):
+        """
+        Boolean mask over `data.index` of the intervals in `data_filtered`.
+
+        None unless `mask_filtering` is True. The mask is realigned if the
+        index of `data` has been replaced since the mask was set.
+        """
+        if self._filter_mask is None:
+            return None
+        if self._mask_index is not self.data.index:
+            if not self._mask_index.equals(self.data.index):
+                kept_ix = self._mask_index[self._filter_mask]
+                self._filter_mask = self.data.index.isin(kept_ix)
+                self._data_filtered = None
+            self._mask_index = self.data.index
+        return self._filter_mask
+
+    def _filtered_index(self):
+        """Index of the filtered intervals, without building `data_filtered`."""
+        mask = self.filter_mask
+        if mask is None:
+            return self.data_filtered.index
+        return self.data.index[mask]
+
+    def _filtered_columns(self):
+        """Columns of the filtered data, without building `data_filtered`."""
+        if self.filter_mask is None:
+            return self.data_filtered.columns
+        return self.data.columns
+
+    def _keep_intervals(self, keep):
+        """
+        Keep only some of the filtered intervals.
+
+        When `mask_filtering` is True the filter mask is updated directly, so
+        the filtered data is not built.
+
+        Parameters
+        ----------
+        keep : Index or array-like of bool
+            Labels of the intervals to keep or a boolean for each filtered
+            interval.
+        """
+        mask = self.filter_mask
+        if mask is None:
+            if isinstance(keep, pd.Index):
+                keep = self.data_filtered.index.isin(keep)
+            self.data_filtered = self.data_filtered[np.asarray(keep, dtype=bool)]
+            return
+        rows = np.flatnonzero(mask)
+        if isinstance(keep, pd.Index):
+            keep = self.data.index[rows].isin(keep)
+        new_mask = np.zeros(len(mask), dtype=bool)
+        new_mask[rows[np.asarray(keep, dtype=bool)]] = True
+        self._filter_mask = new_mask
+        self._data_filtered = None
+
     def create_column_group_attributes(self):
         """Create callable attributes for each column group that return data views.
 
@@ -1724,25 +3789,318 @@ class CapData(object):
             "t_amb": t_amb,
             "w_vel": w_vel,
         }
+        self.upcast_columns(self.regression_columns())
 
     def copy(self):
         """Create and returns a copy of self."""
-        cd_c = CapData("")
+        cd_c = CapData("", mask_filtering=self.mask_filtering)
         cd_c.name = copy.copy(self.name)
         cd_c.data = self.data.copy()
-        cd_c.data_filtered = self.data_filtered.copy()
+        if self.filter_mask is not None:
+            cd_c._filter_mask = self.filter_mask.copy()
+            cd_c._mask_index = cd_c.data.index
+        else:
+            cd_c.data_filtered = self.data_filtered.copy()
         cd_c.column_groups = copy.deepcopy(self.column_groups)
         cd_c.regression_cols = copy.copy(self.regression_cols)
         cd_c.summary_ix = copy.copy(self.summary_ix)
         cd_c.summary = copy.copy(self.summary)
+        cd_c.filter_calls = copy.copy(self.filter_calls)
         cd_c.rc = copy.copy(self.rc)
         cd_c.regression_results = copy.deepcopy(self.regression_results)
         cd_c.regression_formula = copy.copy(self.regression_formula)
         cd_c.pre_agg_cols = copy.copy(self.pre_agg_cols)
         cd_c.pre_agg_trans = copy.deepcopy(self.pre_agg_trans)
         cd_c.pre_agg_reg_trans = copy.deepcopy(self.pre_agg_reg_trans)
+        cd_c.agg_map = copy.deepcopy(self.agg_map)
+        if self.online_regression is not None:
+            cd_c.online_regression = self.online_regression.copy()
         return cd_c
 
+    def save(self, path):
+        """
+        Save the data, filtering state, and results to a directory.
+
+        `data`, `data_filtered`, and `rc` are saved as Parquet files. The filtered
+        intervals and the `kept` and `removed` records of each filtering step are
+        saved as bit-packed masks over the index of `data`, so the filtering
+        history takes about one bit per interval per step. `column_groups`,
+        `regression_cols`, the summary, the frequency of the index of `data`,
+        which Parquet does not store, and other settings are saved as json and
+        `regression_results`, `filter_calls`, `agg_map`, and `online_regression`
+        are pickled. Use `CapData.load` to restore the object. Requires the
+        pyarrow package.
+
+        `data_filtered` is only saved as a separate file when it is not a
+        subset of the rows of `data`, e.g. it was changed directly.
+
+        Parameters
+        ----------
+        path : str or Path
+            Directory to save to. Created if it does not exist; files from a
+            previous save are replaced.
+        """
+        if importlib.util.find_spec("pyarrow") is None:
+            raise ImportError("Saving CapData requires the pyarrow package.")
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        for file_name in SESSION_FILES.values():
+            (path / file_name).unlink(missing_ok=True)
+
+        masks = {}
+        objects = {
+            "regression_results": self.regression_results,
+            "filter_calls": self.filter_calls,
+            "agg_map": self.agg_map,
+            "online_regression": self.online_regression,
+            "steps": {},
+        }
+        filter_mask = self.filter_mask
+        if filter_mask is None and self.data_filtered is not None:
+            filter_mask = index_to_mask(self.data.index, self.data_filtered.index)
+            if filter_mask is not None and not (
+                self.data_filtered.columns.equals(self.data.columns)
+                and self.data_filtered.equals(self.data.loc[filter_mask, :])
+            ):
+                filter_mask = None
+            if filter_mask is None:
+                write_parquet(self.data_filtered, path / SESSION_FILES["data_filtered"])
+        if filter_mask is not None:
+            masks["filter_mask"] = pack_mask(filter_mask)
+        for record_name in ["kept", "removed"]:
+            for i, step in enumerate(getattr(self, record_name)):
+                key = f"{record_name}_{i}"
+                if isinstance(step, FilterStep) and step.source_index.equals(
+                    self.data.index
+                ):
+                    masks[key] = step.packed_mask
+                    continue
+                mask = index_to_mask(self.data.index, step["index"])
+                if mask is None:
+                    objects["steps"][key] = step["index"]
+                else:
+                    masks[key] = pack_mask(mask)
+
+        meta = {
+            "name": self.name,
+            "mask_filtering": self.mask_filtering,
+            "length": len(self.data.index),
+            "freq": getattr(self.data.index, "freqstr", None),
+            "column_groups": dict(self.column_groups),
+            "column_groups_class": type(self.column_groups).__name__,
+            "regression_cols": self.regression_cols,
+            "summary_ix": self.summary_ix,
+            "summary": self.summary,
+            "filter_counts": self.filter_counts,
+            "kept": [step["name"] for step in self.kept],
+            "removed": [step["name"] for step in self.removed],
+            "regression_formula": self.regression_formula,
+            "tolerance": self.tolerance,
+            "pre_agg_cols": self.pre_agg_cols,
+            "pre_agg_trans": self.pre_agg_trans,
+            "pre_agg_trans_class": type(self.pre_agg_trans).__name__,
+            "pre_agg_reg_trans": self.pre_agg_reg_trans,
+            "site": getattr(self, "site", None),
+            "trans_keys": getattr(self, "trans_keys", None),
+        }
+        try:
+            pickled_objects = pickle.dumps(objects)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            warnings.warn(
+                "filter_calls could not be saved, e.g. filter_custom was passed a "
+                "lambda. append_data on the loaded CapData will not filter the new "
+                "intervals correctly."
+            )
+            objects["filter_calls"] = None
+            pickled_objects = pickle.dumps(objects)
+
+        write_parquet(self.data, path / SESSION_FILES["data"])
+        if isinstance(self.rc, pd.DataFrame):
+            write_parquet(self.rc, path / SESSION_FILES["rc"])
+        np.savez_compressed(path / SESSION_FILES["masks"], **masks)
+        (path / SESSION_FILES["objects"]).write_bytes(pickled_objects)
+        (path / SESSION_FILES["meta"]).write_text(
+            json.dumps(meta, default=json_default, indent=1)
+        )
+
+    @classmethod
+    def load(cls, path, memory_map=True):
+        """
+        Load a CapData object saved with `CapData.save`.
+
+        The files contain pickled objects, only load files from trusted sources.
+
+        Parameters
+        ----------
+        path : str or Path
+            Directory passed to `CapData.save`.
+        memory_map : bool, default True
+            Memory map the Parquet files while reading them.
+
+        Returns
+        -------
+        CapData
+        """
+        path = Path(path)
+        meta = json.loads((path / SESSION_FILES["meta"]).read_text())
+        objects = pickle.loads((path / SESSION_FILES["objects"]).read_bytes())
+        cd = cls(meta["name"], mask_filtering=meta["mask_filtering"])
+        cd.data = pd.read_parquet(
+            path / SESSION_FILES["data"], engine="pyarrow", memory_map=memory_map
+        )
+        if meta.get("freq") is not None:
+            cd.data.index.freq = meta["freq"]
+        length = meta["length"]
+        with np.load(path / SESSION_FILES["masks"], allow_pickle=False) as masks:
+            masks = {key: masks[key] for key in masks.files}
+        if "filter_mask" in masks:
+            filter_mask = unpack_mask(masks["filter_mask"], length)
+            if cd.mask_filtering:
+                cd._filter_mask = filter_mask
+                cd._mask_index = cd.data.index
+            else:
+                cd.data_filtered = cd.data.loc[filter_mask, :].copy()
+        elif (path / SESSION_FILES["data_filtered"]).exists():
+            cd.data_filtered = pd.read_parquet(
+                path / SESSION_FILES["data_filtered"],
+                engine="pyarrow",
+                memory_map=memory_map,
+            )
+        for record_name in ["kept", "removed"]:
+            record = getattr(cd, record_name)
+            for i, step_name in enumerate(meta[record_name]):
+                key = f"{record_name}_{i}"
+                if key in objects["steps"]:
+                    record.append({"name": step_name, "index": objects["steps"][key]})
+                    continue
+                mask = unpack_mask(masks[key], length)
+                record.append(FilterStep(step_name, mask, cd.data.index))
+        if (path / SESSION_FILES["rc"]).exists():
+            cd.rc = pd.read_parquet(path / SESSION_FILES["rc"], engine="pyarrow")
+
+        if meta["column_groups_class"] == "ColumnGroups":
+            cd.column_groups = cg.ColumnGroups(meta["column_groups"])
+        else:
+            cd.column_groups = meta["column_groups"]
+        cd.regression_cols = meta["regression_cols"]
+        cd.summary_ix = [tuple(ix) for ix in meta["summary_ix"]]
+        cd.summary = meta["summary"]
+        cd.filter_counts = meta["filter_counts"]
+        cd.regression_formula = meta["regression_formula"]
+        cd.tolerance = meta["tolerance"]
+        if meta["pre_agg_cols"] is not None:
+            cd.pre_agg_cols = pd.Index(meta["pre_agg_cols"])
+        cd.pre_agg_trans = meta["pre_agg_trans"]
+        if meta["pre_agg_trans_class"] == "ColumnGroups":
+            cd.pre_agg_trans = cg.ColumnGroups(cd.pre_agg_trans)
+        cd.pre_agg_reg_trans = meta["pre_agg_reg_trans"]
+        if meta["site"] is not None:
+            cd.site = meta["site"]
+        if meta["trans_keys"] is not None:
+            cd.trans_keys = meta["trans_keys"]
+        cd.regression_results = objects["regression_results"]
+        cd.filter_calls = objects["filter_calls"] or []
+        cd.agg_map = objects["agg_map"]
+        cd.online_regression = objects.get("online_regression")
+        if len(cd.column_groups) > 0:
+            cd.create_column_group_attributes()
+        if "agg" in cd.column_groups:
+            cd.create_agg_attributes()
+        return cd
+
+    def regression_columns(self):
+        """
+        Get the columns of `data` identified by `regression_cols`.
+
+        Returns
+        -------
+        list
+            Column names, including every column of the groups in
+            `regression_cols`.
+        """
+        reg_columns = []
+        for col_or_grp in self.regression_cols.values():
+            if col_or_grp in self.column_groups:
+                reg_columns.extend(self.column_groups[col_or_grp])
+            elif col_or_grp in self.data.columns:
+                reg_columns.append(col_or_grp)
+        return reg_columns
+
+    def downcast_data(self, tolerance=FLOAT32_TOLERANCE):
+        """
+        Store the float64 columns of `data` as float32 to reduce memory use.
+
+        A column is converted if no value changes by more than `tolerance`, see
+        `downcast_floats`. The columns used by `regression_cols` are kept as
+        float64 and the regression and reporting condition methods convert the
+        columns they use back to float64.
+
+        Parameters
+        ----------
+        tolerance : float, default FLOAT32_TOLERANCE
+            Largest absolute change allowed in any value of a column.
+
+        Returns
+        -------
+        list
+            Columns converted to float32.
+        """
+        data = downcast_floats(
+            self.data, tolerance=tolerance, exclude=self.regression_columns()
+        )
+        converted = [
+            col
+            for col in data.columns
+            if data[col].dtype == "float32" and self.data[col].dtype == "float64"
+        ]
+        self.set_column_dtypes(data.dtypes[converted].to_dict(), data=data)
+        return converted
+
+    def upcast_columns(self, cols):
+        """
+        Convert float32 columns of `data` and `data_filtered` back to float64.
+
+        Parameters
+        ----------
+        cols : list
+            Columns to convert if they are float32.
+        """
+        if self.data is None:
+            return
+        to_float64 = {
+            col: "float64"
+            for col in set(cols)
+            if col in self.data.columns and self.data[col].dtype == "float32"
+        }
+        if len(to_float64) > 0:
+            self.set_column_dtypes(to_float64)
+
+    def set_column_dtypes(self, dtypes, data=None):
+        """
+        Set the dtypes of columns of `data` and `data_filtered`.
+
+        Parameters
+        ----------
+        dtypes : dict
+            Column names mapped to dtypes.
+        data : DataFrame, default None
+            `data` already converted to `dtypes`.
+        """
+        if len(dtypes) == 0:
+            return
+        self.data = self.data.astype(dtypes) if data is None else data
+        if self.filter_mask is not None:
+            # rebuilt from data and the mask when accessed
+            self._data_filtered = None
+        elif self.data_filtered is not None:
+            self._data_filtered = self.data_filtered.astype(
+                {
+                    col: dtype
+                    for col, dtype in dtypes.items()
+                    if col in self.data_filtered.columns
+                }
+            )
+
     def empty(self):
         """Return a boolean indicating if the CapData object contains data."""
         tests_indicating_empty = [self.data.empty, len(self.column_groups) == 0]
@@ -1769,7 +4127,8 @@ class CapData(object):
                 except ValueError:
                     continue
         self.data.drop(columns, axis=1, inplace=True)
-        self.data_filtered.drop(columns, axis=1, inplace=True)
+        if self.filter_mask is None:
+            self.data_filtered.drop(columns, axis=1, inplace=True)
 
     def rename_cols(self, column_map):
         """
@@ -1781,11 +4140,12 @@ class CapData(object):
             Dictionary mapping old column names to new column names.
         """
         self.data.rename(columns=column_map, inplace=True)
-        self.data_filtered.rename(columns=column_map, inplace=True)
+        if self.filter_mask is None:
+            self.data_filtered.rename(columns=column_map, inplace=True)
         for key, value in self.column_groups.items():
             self.column_groups[key] = [column_map.get(col, col) for col in value]
 
-    def get_reg_cols(self, reg_vars=None, filtered_data=True):
+    def get_reg_cols(self, reg_vars=None, filtered_data=True, rows=None):
         """
         Get regression columns renamed with keys from `regression_cols`.
 
@@ -1797,6 +4157,9 @@ class CapData(object):
             or pass a single key as a string.
         filtered_data : bool, default true
             Return filtered or unfiltered data.
+        rows : array of int, default None
+            Positions of the rows of `data` to return, instead of all of the
+            filtered or unfiltered rows.
 
         Returns
         -------
@@ -1804,15 +4167,19 @@ class CapData(object):
         """
         if reg_vars is None:
             reg_vars = list(self.regression_cols.keys())
-        if filtered_data:
-            df = self.floc[reg_vars].copy()
+        if rows is not None:
+            df = upcast_floats(
+                select_capdata_columns(self, self.data.iloc[rows], reg_vars)
+            ).copy()
+        elif filtered_data:
+            df = upcast_floats(self.floc[reg_vars]).copy()
         else:
-            df = self.loc[reg_vars].copy()
+            df = upcast_floats(self.loc[reg_vars]).copy()
         rename = {df.columns[0]: reg_vars}
 
         if isinstance(reg_vars, list):
             for reg_var in reg_vars:
-                if self.regression_cols[reg_var] in self.data_filtered.columns:
+                if self.regression_cols[reg_var] in self._filtered_columns():
                     continue
                 else:
                     columns = self.column_groups[self.regression_cols[reg_var]]
@@ -2024,7 +4391,7 @@ class CapData(object):
         plt_no_filtering = hv.Scatter(data, "poa", ["power", "index"]).relabel("all")
         scatters.append(plt_no_filtering)
 
-        d1 = data.loc[self.removed[0]["index"], :]
+        d1 = data.loc[filter_step_mask(self.removed[0], data.index), :]
         plt_first_filter = hv.Scatter(d1, "poa", ["power", "index"]).relabel(
             self.removed[0]["name"]
         )
@@ -2035,7 +4402,7 @@ class CapData(object):
                 break
             else:
                 flt_legend = self.kept[i + 1]["name"]
-            d_flt = data.loc[filtering_step["index"], :]
+            d_flt = data.loc[filter_step_mask(filtering_step, data.index), :]
             plt = hv.Scatter(d_flt, "poa", ["power", "index"]).relabel(flt_legend)
             scatters.append(plt)
 
@@ -2086,7 +4453,9 @@ class CapData(object):
         )
         plots.append(plt_no_filtering)
 
-        d1 = data.loc[self.removed[0]["index"], ["power", "Timestamp"]]
+        d1 = data.loc[
+            filter_step_mask(self.removed[0], data.index), ["power", "Timestamp"]
+        ]
         plt_first_filter = hv.Scatter(
             d1, ["Timestamp"], ["power"], label=self.removed[0]["name"]
         )
@@ -2097,7 +4466,7 @@ class CapData(object):
                 break
             else:
                 flt_legend = self.kept[i + 1]["name"]
-            d_flt = data.loc[filtering_step["index"], :]
+            d_flt = data.loc[filter_step_mask(filtering_step, data.index), :]
             plt = hv.Scatter(d_flt, ["Timestamp"], ["power"], label=flt_legend)
             plots.append(plt)
 
@@ -2136,12 +4505,20 @@ class CapData(object):
         data : str
             'sim' or 'das' determines if filter is on sim or das data.
         """
-        self.data_filtered = self.data.copy()
+        if self.mask_filtering:
+            self._data_filtered = None
+            self._filter_mask = np.ones(len(self.data.index), dtype=bool)
+            self._mask_index = self.data.index
+        else:
+            self.data_filtered = self.data.copy()
         self.summary_ix = []
         self.summary = []
         self.filter_counts = {}
+        self.filter_calls = []
         self.removed = []
         self.kept = []
+        if self.online_regression is not None:
+            self.update_online_regression()
 
     def reset_agg(self):
         """
@@ -2194,7 +4571,7 @@ class CapData(object):
             aggregation function used, and the new column name. If the group being
             aggregated has more than 10 columns, only the group name will be printed.
         """
-        columns_to_aggregate = self.loc[group_id]
+        columns_to_aggregate = upcast_floats(self.loc[group_id])
         agg_result = columns_to_aggregate.agg(agg_func, axis=1)
         if isinstance(agg_func, str):
             col_name = group_id + "_" + agg_func + "_agg"
@@ -2340,7 +4717,9 @@ class CapData(object):
         # reset summary data
         self.summary_ix = []
         self.summary = []
+        self.filter_calls = []
 
+        self.agg_map = copy.deepcopy(agg_map)
         self.pre_agg_cols = self.data.columns.copy()
         self.pre_agg_trans = copy.deepcopy(self.column_groups)
         self.pre_agg_reg_trans = copy.deepcopy(self.regression_cols)
@@ -2402,6 +4781,167 @@ class CapData(object):
         self.create_column_group_attributes()
         self.create_agg_attributes()
 
+    def append_data(self, new_data):
+        """
+        Add new intervals to `data` and apply the recorded filtering to them.
+
+        Intended for capacity tests that are reviewed while data is still being
+        collected. Rows of `new_data` that are not later than the last timestamp
+        in `data` are dropped. If `agg_sensors` has been used, the same aggregations are
+        calculated for the new intervals.
+
+        When all of the filtering methods called since the filtering was last reset
+        are row-local (see Notes), they are applied to the new intervals only and
+        the results are added to `data_filtered`, the filtering summary, and the
+        `kept` and `removed` records. The existing data is not filtered again, so
+        `print_points_summary` reports the updated progress of the test quickly.
+        Otherwise the filtering is reset and all of the recorded filtering steps
+        are applied to the joined data.
+
+        Parameters
+        ----------
+        new_data : DataFrame
+            Data with a datetime index and the columns of `data` before any
+            aggregation columns were added by `agg_sensors`. Missing columns are
+            filled with NaN and extra columns are dropped.
+
+        Returns
+        -------
+        int
+            Number of intervals added.
+
+        Notes
+        -----
+        The row-local filtering methods are filter_irr, filter_pvsyst,
+        filter_shade, filter_time (unless `wrap_year` is True), filter_pf,
+        filter_power, filter_sensors, and filter_missing. The results of
+        filter_days, filter_outliers, filter_custom, filter_clearsky, rep_cond, and
+        fit_regression may depend on the other intervals in the data.
+
+        Changes made directly to `data_filtered` are not recorded, so they are
+        kept for the existing data but are not applied to the new intervals.
+        """
+        new_data = new_data[~new_data.index.duplicated()].sort_index()
+        if not self.data.empty:
+            new_data = new_data[new_data.index > self.data.index[-1]]
+        if new_data.empty:
+            return 0
+        if self.pre_agg_cols is None:
+            raw_columns = self.data.columns
+        else:
+            raw_columns = self.pre_agg_cols
+        missing_columns = raw_columns.difference(new_data.columns)
+        if len(missing_columns) > 0:
+            warnings.warn(
+                "Columns missing from the new data are filled with NaN: "
+                f"{list(missing_columns)}"
+            )
+        new_data = new_data.reindex(columns=raw_columns)
+        if self.pre_agg_cols is not None:
+            agg_cd = CapData(self.name)
+            agg_cd.data = new_data
+            agg_cd.column_groups = copy.deepcopy(self.pre_agg_trans)
+            agg_cd.regression_cols = copy.deepcopy(self.pre_agg_reg_trans)
+            with contextlib.redirect_stdout(io.StringIO()):
+                agg_cd.agg_sensors(agg_map=copy.deepcopy(self.agg_map))
+            new_data = agg_cd.data.reindex(columns=self.data.columns)
+        new_data = new_data.astype(
+            {
+                col: "float32"
+                for col, dtype in self.data.dtypes.items()
+                if dtype == "float32"
+            }
+        )
+
+        calls = list(self.filter_calls)
+        n_steps = sum(ix[1] != "count" for ix in self.summary_ix)
+        if n_steps != len(calls):
+            self.data = pd.concat([self.data, new_data])
+            warnings.warn(
+                "The filtering steps were not recorded, so they cannot be applied "
+                "to the new intervals. The new intervals were added to data, but "
+                "not to data_filtered. Use reset_filter and filter again."
+            )
+            return new_data.shape[0]
+
+        if self.filter_mask is not None:
+            pts_filtered = int(self.filter_mask.sum())
+        else:
+            pts_filtered = self.data_filtered.shape[0]
+        if n_steps > 0 and self.summary[-1][columns[0]] != pts_filtered:
+            warnings.warn(
+                "data_filtered has been changed outside of the filtering methods. "
+                "These changes are not applied to the new intervals."
+            )
+
+        if all(is_row_local_call(*call) for call in calls):
+            new_cd = CapData(self.name, mask_filtering=self.mask_filtering)
+            new_cd.data = new_data
+            new_cd.column_groups = self.column_groups
+            new_cd.regression_cols = copy.copy(self.regression_cols)
+            new_cd.pre_agg_cols = self.pre_agg_cols
+            new_cd.pre_agg_trans = self.pre_agg_trans
+            new_cd.pre_agg_reg_trans = self.pre_agg_reg_trans
+            new_cd.rc = self.rc
+            new_cd.reset_filter()
+            with warnings.catch_warnings():
+                warnings.filterwarnings(
+                    "ignore", message="The last filter removed all data"
+                )
+                for name, args, kwargs in calls:
+                    getattr(new_cd, name)(*args, **kwargs)
+
+            old_mask = self.filter_mask
+            old_filtered = self.data_filtered
+            self.data = pd.concat([self.data, new_data])
+            if old_mask is not None and new_cd.filter_mask is not None:
+                self._filter_mask = np.concatenate([old_mask, new_cd.filter_mask])
+                self._mask_index = self.data.index
+                self._data_filtered = None
+            else:
+                self.data_filtered = pd.concat([old_filtered, new_cd.data_filtered])
+
+            new_pts = [
+                entry[columns[0]]
+                for ix, entry in zip(new_cd.summary_ix, new_cd.summary)
+                if ix[1] != "count"
+            ]
+            pts_before = new_data.shape[0]
+            i_step = 0
+            summary = []
+            for ix, entry in zip(self.summary_ix, self.summary):
+                entry = dict(entry)
+                if ix[1] == "count":
+                    entry[columns[0]] += new_data.shape[0]
+                    pts_before = new_data.shape[0]
+                else:
+                    entry[columns[0]] += new_pts[i_step]
+                    entry[columns[1]] += pts_before - new_pts[i_step]
+                    pts_before = new_pts[i_step]
+                    i_step += 1
+                summary.append(entry)
+            self.summary = summary
+            for attr in ["kept", "removed"]:
+                steps = getattr(self, attr)
+                new_steps = getattr(new_cd, attr)
+                if len(steps) == len(new_steps):
+                    setattr(
+                        self,
+                        attr,
+                        [
+                            concat_filter_steps(step, new_step, self.data.index)
+                            for step, new_step in zip(steps, new_steps)
+                        ],
+                    )
+        else:
+            self.data = pd.concat([self.data, new_data])
+            self.reset_filter()
+            for name, args, kwargs in calls:
+                getattr(self, name)(*args, **kwargs)
+        if self.online_regression is not None:
+            self.update_online_regression()
+        return new_data.shape[0]
+
     def data_columns_to_excel(self, sort_by_reversed_names=True):
         """
         Write the columns of data to an excel file as a template for a column grouping.
@@ -2472,11 +5012,11 @@ class CapData(object):
         if ref_val == "self_val":
             ref_val = self.rc["poa"][0]
 
-        df_flt = filter_irr(self.data_filtered, irr_col, low, high, ref_val=ref_val)
+        df_flt = filter_irr(self.floc[[irr_col]], irr_col, low, high, ref_val=ref_val)
         if inplace:
-            self.data_filtered = df_flt
+            self._keep_intervals(df_flt.index)
         else:
-            return df_flt
+            return self.data_filtered.loc[df_flt.index, :]
 
     @update_summary
     def filter_pvsyst(self, inplace=True):
@@ -2497,16 +5037,17 @@ class CapData(object):
         -------
         CapData object if inplace is set to False.
         """
-        df = self.data_filtered
+        df_columns = self._filtered_columns()
 
         columns = ["IL Pmin", "IL Vmin", "IL Pmax", "IL Vmax"]
-        index = df.index
+        index = self._filtered_index()
 
         for column in columns:
-            if column not in df.columns:
+            if column not in df_columns:
                 column = column.replace(" ", "_")
-            if column in df.columns:
-                indices_to_drop = df[df[column] > 0].index
+            if column in df_columns:
+                values = self.floc[[column]].iloc[:, 0]
+                indices_to_drop = values.index[values > 0]
                 if not index.equals(indices_to_drop):
                     index = index.difference(indices_to_drop)
             else:
@@ -2517,7 +5058,7 @@ class CapData(object):
                 )
 
         if inplace:
-            self.data_filtered = self.data_filtered.loc[index, :]
+            self._keep_intervals(index)
         else:
             return self.data_filtered.loc[index, :]
 
@@ -2554,15 +5095,19 @@ class CapData(object):
         pd.DataFrame
             If inplace is false returns a dataframe.
         """
-        df = self.data_filtered
-
         if query_str is None:
             query_str = "FShdBm>=@fshdbm"
 
-        index_shd = df.query(query_str).index
+        mask = self.filter_mask
+        if mask is None:
+            index_shd = self.data_filtered.query(query_str).index
+        else:
+            # evaluate on data to avoid building the filtered data
+            keep = self.data.eval(query_str).to_numpy()[mask]
+            index_shd = self._filtered_index()[keep]
 
         if inplace:
-            self.data_filtered = self.data_filtered.loc[index_shd, :]
+            self._keep_intervals(index_shd)
         else:
             return self.data_filtered.loc[index_shd, :]
 
@@ -2619,10 +5164,9 @@ class CapData(object):
             if wrap_year and spans_year(start, end):
                 df_temp = wrap_year_end(self.data_filtered, start, end)
             else:
-                df_temp = self.data_filtered.loc[start:end, :]
+                df_temp = time_slice(self._filtered_index(), start, end)
                 if drop:
-                    keep_ix = self.data_filtered.index.difference(df_temp.index)
-                    df_temp = self.data_filtered.loc[keep_ix, :]
+                    df_temp = self._filtered_index().difference(df_temp)
 
         if start is not None and end is None:
             if days is None:
@@ -2633,7 +5177,7 @@ class CapData(object):
                 if wrap_year and spans_year(start, end):
                     df_temp = wrap_year_end(self.data_filtered, start, end)
                 else:
-                    df_temp = self.data_filtered.loc[start:end, :]
+                    df_temp = time_slice(self._filtered_index(), start, end)
 
         if start is None and end is not None:
             if days is None:
@@ -2644,7 +5188,7 @@ class CapData(object):
                 if wrap_year and spans_year(start, end):
                     df_temp = wrap_year_end(self.data_filtered, start, end)
                 else:
-                    df_temp = self.data_filtered.loc[start:end, :]
+                    df_temp = time_slice(self._filtered_index(), start, end)
 
         if test_date is not None:
             test_date = pd.to_datetime(test_date)
@@ -2657,8 +5201,13 @@ class CapData(object):
                 if wrap_year and spans_year(start, end):
                     df_temp = wrap_year_end(self.data_filtered, start, end)
                 else:
-                    df_temp = self.data_filtered.loc[start:end, :]
+                    df_temp = time_slice(self._filtered_index(), start, end)
 
+        if isinstance(df_temp, pd.Index):
+            if inplace:
+                self._keep_intervals(df_temp)
+                return
+            df_temp = self.data_filtered.loc[df_temp, :]
         if inplace:
             self.data_filtered = df_temp
         else:
@@ -2680,24 +5229,22 @@ class CapData(object):
             If inplace is true, then function overwrites the filtered
             dataframe. If false returns a DataFrame.
         """
+        filtered_index = self._filtered_index()
         ix_all_days = None
         for day in days:
-            ix_day = self.data_filtered.loc[day].index
+            ix_day = filtered_index.to_series().loc[day].index
             if ix_all_days is None:
                 ix_all_days = ix_day
             else:
                 ix_all_days = ix_all_days.union(ix_day)
 
         if drop:
-            ix_wo_days = self.data_filtered.index.difference(ix_all_days)
-            filtered_data = self.data_filtered.loc[ix_wo_days, :]
-        else:
-            filtered_data = self.data_filtered.loc[ix_all_days, :]
+            ix_all_days = filtered_index.difference(ix_all_days)
 
         if inplace:
-            self.data_filtered = filtered_data
+            self._keep_intervals(ix_all_days)
         else:
-            return filtered_data
+            return self.data_filtered.loc[ix_all_days, :]
 
     @update_summary
     def filter_outliers(self, inplace=True, **kwargs):
@@ -2745,7 +5292,7 @@ class CapData(object):
         clf_1.fit(X1)
 
         if inplace:
-            self.data_filtered = self.data_filtered[clf_1.predict(X1) == 1]
+            self._keep_intervals(clf_1.predict(X1) == 1)
         else:
             return self.data_filtered[clf_1.predict(X1) == 1]
 
@@ -2776,14 +5323,13 @@ class CapData(object):
             if key.find("pf") == 0:
                 selection = key
 
-        df = self.data_filtered[self.column_groups[selection]]
-
-        df_flt = self.data_filtered[(np.abs(df) >= pf).all(axis=1)]
+        df = self.floc[self.column_groups[selection]]
+        keep = (np.abs(df) >= pf).all(axis=1).to_numpy()
 
         if inplace:
-            self.data_filtered = df_flt
+            self._keep_intervals(keep)
         else:
-            return df_flt
+            return self.data_filtered[keep]
 
     @update_summary
     def filter_power(self, power, percent=None, columns=None, inplace=True):
@@ -2825,7 +5371,7 @@ class CapData(object):
                 power_data = self.floc[columns]
                 multiple_columns = True
             else:
-                power_data = pd.DataFrame(self.data_filtered[columns])
+                power_data = self.floc[[columns]]
                 power_data.rename(
                     columns={power_data.columns[0]: "power"}, inplace=True
                 )
@@ -2839,12 +5385,12 @@ class CapData(object):
         else:
             filtered_power_bool = power_data["power"] < power
 
-        df_flt = self.data_filtered[filtered_power_bool]
+        keep = filtered_power_bool.to_numpy()
 
         if inplace:
-            self.data_filtered = df_flt
+            self._keep_intervals(keep)
         else:
-            return df_flt
+            return self.data_filtered[keep]
 
     @update_summary
     def filter_custom(self, func, *args, **kwargs):
@@ -2918,11 +5464,11 @@ class CapData(object):
             Returns filtered dataframe if inplace is False.
         """
         if self.pre_agg_cols is not None:
-            df = self.data_filtered[self.pre_agg_cols]
+            df = self.floc[list(self.pre_agg_cols)]
             trans = self.pre_agg_trans
             regression_cols = self.pre_agg_reg_trans
         else:
-            df = self.data_filtered
+            df = None
             trans = self.column_groups
             regression_cols = self.regression_cols
 
@@ -2933,20 +5479,18 @@ class CapData(object):
         for key, threshold in perc_diff.items():
             if "index" in locals():
                 # if index has been assigned then take intersection
-                sensors_df = df[trans[key]]
+                sensors_df = self.floc[trans[key]] if df is None else df[trans[key]]
                 next_index = sensor_filter(sensors_df, threshold, row_filter=row_filter)
                 index = index.intersection(next_index)  # noqa: F821
             else:
                 # if index has not been assigned then assign it
-                sensors_df = df[trans[key]]
+                sensors_df = self.floc[trans[key]] if df is None else df[trans[key]]
                 index = sensor_filter(sensors_df, threshold, row_filter=row_filter)
 
-        df_out = self.data_filtered.loc[index, :]
-
         if inplace:
-            self.data_filtered = df_out
+            self._keep_intervals(index)
         else:
-            return df_out
+            return self.data_filtered.loc[index, :]
 
     @update_summary
     def filter_clearsky(self, ghi_col=None, inplace=True, keep_clear=True, **kwargs):
@@ -2980,7 +5524,7 @@ class CapData(object):
             control the detection parameters. See pvlib documentation for all
             available parameters.
         """
-        if "ghi_mod_csky" not in self.data_filtered.columns:
+        if "ghi_mod_csky" not in self._filtered_columns():
             return warnings.warn(
                 "Modeled clear sky data must be availabe to "
                 "run this filter method. Use CapData "
@@ -3013,12 +5557,12 @@ class CapData(object):
                 )
             meas_ghi = meas_ghi.mean(axis=1)
         else:
-            meas_ghi = self.data_filtered[ghi_col]
+            meas_ghi = self.floc[[ghi_col]].iloc[:, 0]
 
         kwargs.setdefault("infer_limits", True)
         clear_per = detect_clearsky(
             measured=meas_ghi,
-            clearsky=self.data_filtered["ghi_mod_csky"],
+            clearsky=self.floc[["ghi_mod_csky"]].iloc[:, 0],
             times=meas_ghi.index,
             **kwargs,
         )
@@ -3028,15 +5572,14 @@ class CapData(object):
                 "parameters via kwargs."
             )
 
-        if keep_clear:
-            df_out = self.data_filtered[clear_per]
-        else:
-            df_out = self.data_filtered[~clear_per]
+        keep = np.asarray(clear_per, dtype=bool)
+        if not keep_clear:
+            keep = ~keep
 
         if inplace:
-            self.data_filtered = df_out
+            self._keep_intervals(keep)
         else:
-            return df_out
+            return self.data_filtered[keep]
 
     @update_summary
     def filter_missing(self, columns=None):
@@ -3054,13 +5597,8 @@ class CapData(object):
             Modifies `data_filtered` attribute.
         """
         if columns is None:
-            self.data_filtered = self.data_filtered.loc[
-                self.floc["regcols"].dropna().index, :
-            ]
-        else:
-            self.data_filtered = self.data_filtered.loc[
-                self.floc[columns].dropna().index, :
-            ]
+            columns = "regcols"
+        self._keep_intervals(self.floc[columns].notna().all(axis=1).to_numpy())
 
     def filter_op_state(self, op_state, mult_inv=None, inplace=True):
         """
@@ -3218,7 +5756,7 @@ class CapData(object):
         pandas DataFrame
             If pred=True, then returns a pandas dataframe of results.
         """
-        df = self.floc[["poa", "t_amb", "w_vel"]]
+        df = upcast_floats(self.floc[["poa", "t_amb", "w_vel"]])
         df = df.rename(
             columns={
                 df.columns[0]: "poa",
@@ -3309,7 +5847,7 @@ class CapData(object):
             See pandas Grouper doucmentation for details. Default is left
             labeled and left closed.
         """
-        df = self.floc[["poa", "t_amb", "w_vel", "power"]]
+        df = upcast_floats(self.floc[["poa", "t_amb", "w_vel", "power"]])
         df = df.rename(
             columns={
                 df.columns[0]: "poa",
@@ -3373,6 +5911,8 @@ class CapData(object):
             dframe_flt = self.data_filtered.loc[df.index, :]
             if inplace:
                 self.data_filtered = dframe_flt
+                if self.online_regression is not None:
+                    self.update_online_regression()
             else:
                 return dframe_flt
         else:
@@ -3380,6 +5920,112 @@ class CapData(object):
                 print(reg.summary())
             self.regression_results = reg
 
+    def start_online_regression(self):
+        """
+        Fit an `OnlineRegression` to the filtered data and keep it up to date.
+
+        The regression is stored in the `online_regression` attribute and is
+        updated with the intervals added or removed by the filtering methods,
+        `reset_filter`, `append_data`, and `fit_regression`. Call
+        `update_online_regression` after changing `data_filtered` directly.
+        Intervals are removed with their values in `data`, so `data` should not
+        be changed in place while the online regression is used.
+
+        Returns
+        -------
+        OnlineRegression
+        """
+        mask = self.filter_mask
+        if mask is None:
+            mask = index_to_mask(self.data.index, self.data_filtered.index)
+        if mask is None:
+            self.online_regression = OnlineRegression(self.regression_formula)
+            self.online_regression.update(self.get_reg_cols())
+        else:
+            self.online_regression = OnlineRegression(
+                self.regression_formula, source_index=self.data.index
+            )
+            self.online_regression.update(
+                self.get_reg_cols(), positions=np.flatnonzero(mask)
+            )
+        return self.online_regression
+
+    def update_online_regression(self, mask_before=None, mask_after=None):
+        """
+        Update `online_regression` to the intervals in the filtered data.
+
+        Only the intervals added to or removed from the filtered data are read
+        from `data` and added to or removed from the regression. The filtering
+        methods pass the filtered intervals before and after filtering, so only
+        the intervals they changed are found; otherwise the filtered intervals
+        are compared to the intervals in the regression.
+
+        The regression is fit again to all of the filtered data if the
+        regression formula changed, the index of `data` changed other than by
+        appending intervals, the filtered data has intervals that are not in
+        `data`, or the rows added and removed since the regression was fit make
+        the rounding error of its sums large compared to the rows included (see
+        `OnlineRegression` and `ONLINE_REFIT_RATIO`).
+
+        Parameters
+        ----------
+        mask_before, mask_after : numpy array of bool, default None
+            Filtered intervals of `data` before and after a change to the
+            filtered data.
+
+        Returns
+        -------
+        OnlineRegression
+        """
+        online = self.online_regression
+        if (
+            online is None
+            or online.formula != self.regression_formula
+            or online.mask is None
+        ):
+            return self.start_online_regression()
+        if online.source_index is not self.data.index:
+            n = len(online.source_index)
+            if not self.data.index[:n].equals(online.source_index):
+                return self.start_online_regression()
+            online.extend_source_index(self.data.index)
+        if mask_before is None or mask_after is None:
+            mask_after = self.filter_mask
+            if mask_after is None:
+                mask_after = index_to_mask(self.data.index, self.data_filtered.index)
+            if mask_after is None:
+                return self.start_online_regression()
+            mask_before = online.mask
+        removed = np.flatnonzero(mask_before & ~mask_after)
+        added = np.flatnonzero(mask_after & ~mask_before)
+        if len(removed) > 0:
+            online.remove(self.get_reg_cols(rows=removed), positions=removed)
+        if len(added) > 0:
+            online.update(self.get_reg_cols(rows=added), positions=added)
+        if online.yty_total > ONLINE_REFIT_RATIO * online.yty:
+            return self.start_online_regression()
+        return online
+
+    def check_online_regression(self, rtol=1e-6):
+        """
+        Check `online_regression` matches a statsmodels fit of the filtered data.
+
+        Parameters
+        ----------
+        rtol : float, default 1e-6
+            Relative tolerance of the coefficients and residual variance.
+
+        Returns
+        -------
+        bool
+            True if the number of intervals, coefficients, and residual variance
+            match the statsmodels regression results.
+        """
+        if self.online_regression is None:
+            raise ValueError("Call start_online_regression first.")
+        results = smf.ols(self.regression_formula, data=self.get_reg_cols()).fit()
+        return self.online_regression.check(results, rtol=rtol)
+
     def uncertainty():
         """Calculate random standard uncertainty of the regression.
 
@@ -3475,23 +6121,30 @@ class CapData(object):
         -------
             Expanded uncertainty as a decimal value.
         """
-        pred = self.regression_results.get_prediction(self.rc)
-        pred_cap = pred.predicted_mean[0]
-        perc_diffs = {}
-        for group, inst_uncert in self.instrument_uncert.items():
+        results = self.regression_results
+        # first row is the reporting conditions, then one row for each group
+        # with the uncertainty added to the reporting condition of its term
+        rcs = self.rc.iloc[[0] * (len(self.instrument_uncert) + 1), :].reset_index(
+            drop=True
+        )
+        for i, (group, inst_uncert) in enumerate(self.instrument_uncert.items()):
             by_group = (inst_uncert**2 + self.spatial_uncerts[group] ** 2) ** (1 / 2)
-            rcs = self.rc.copy()
-            rcs.loc[0, grp_to_term[group]] = rcs.loc[0, grp_to_term[group]] + by_group
-            pred_cap_uncert = self.regression_results.get_prediction(
-                rcs
-            ).predicted_mean[0]
-            perc_diffs[group] = (pred_cap_uncert - pred_cap) / pred_cap
-        df = pd.DataFrame(perc_diffs.values())
-        by = (df**2).sum().values[0] ** (1 / 2)
-        sy = pred.se_obs[0] / pred_cap
+            column = rcs.columns.get_loc(grp_to_term[group])
+            rcs.iloc[i + 1, column] = rcs.iloc[i + 1, column] + by_group
+        exog = design_matrix(results, rcs)
+        preds = exog @ results.params.to_numpy()
+        pred_cap = preds[0]
+        perc_diffs = (preds[1:] - pred_cap) / pred_cap
+        by = (perc_diffs**2).sum() ** (1 / 2)
+        if isinstance(results, AstmOLSResults):
+            cov_params = results.normalized_cov_params * results.scale
+        else:
+            cov_params = np.asarray(results.cov_params())
+        se_obs = (results.scale + exog[0] @ cov_params @ exog[0]) ** (1 / 2)
+        sy = se_obs / pred_cap
         return (by**2 + sy**2) ** (1 / 2) * k
 
-    def get_filtering_table(self):
+    def get_filtering_table(self, removed_by=False):
         """
         Returns DataFrame showing which filter removed each filtered time interval.
 
@@ -3501,21 +6154,48 @@ class CapData(object):
         Columns/filters are in order they are run from left to right.
         The last column labeled "all_filters" shows is True for intervals that were
         not removed by any of the filters.
+
+        The table is built from the `kept` and `removed` masks of each filtering
+        step in a single pass over arrays.
+
+        Parameters
+        ----------
+        removed_by : bool, default False
+            Set to True to return a single categorical "removed_by" column with
+            the name of the filter that removed each interval instead of a column
+            for each filter. Intervals not removed by any filter are NaN.
+
+        Returns
+        -------
+        DataFrame
         """
-        filtering_data = pd.DataFrame(index=self.data.index)
+        index = self.data.index
+        names = [step["name"] for step in self.removed]
+        if removed_by:
+            codes = np.full(len(index), -1, dtype=np.int64)
+            for i, step in enumerate(self.removed):
+                codes[filter_step_mask(step, index) & (codes == -1)] = i
+            return pd.DataFrame(
+                {"removed_by": pd.Categorical.from_codes(codes, categories=names)},
+                index=index,
+            )
+
+        table = np.full((len(index), len(names)), np.nan, order="F")
         for i, (flt_step_kept, flt_step_removed) in enumerate(
             zip(self.kept, self.removed)
         ):
             if i == 0:
-                filtering_data.loc[:, flt_step_removed["name"]] = 0
+                table[:, i] = 0
             else:
-                filtering_data.loc[self.kept[i - 1]["index"], flt_step_kept["name"]] = 0
-            filtering_data.loc[flt_step_removed["index"], flt_step_removed["name"]] = 1
+                table[filter_step_mask(self.kept[i - 1], index), i] = 0
+            table[filter_step_mask(flt_step_removed, index), i] = 1
 
-        filtering_data["all_filters"] = filtering_data.apply(
-            lambda x: all(x == 0), axis=1
-        )
-        return filtering_data
+        columns = {name: table[:, i] for i, name in enumerate(names)}
+        if len(names) > 0:
+            # the first step has no blank intervals
+            columns[names[0]] = columns[names[0]].astype("int64")
+        columns["all_filters"] = (table == 0).all(axis=1)
+        return pd.DataFrame(columns, index=index)
 
     def print_points_summary(self, hrs_req=12.5):
         """
@@ -3564,7 +6244,14 @@ class CapData(object):
         test_period = self.data.index[-1] - self.data.index[0]
         for filter in self.kept:
             if "filter_time" == filter["name"]:
-                test_period = filter["index"][-1] - filter["index"][0]
+                if isinstance(filter, FilterStep):
+                    kept = np.flatnonzero(filter.mask)
+                    start = filter.source_index[kept[0]]
+                    end = filter.source_index[kept[-1]]
+                else:
+                    start = filter["index"][0]
+                    end = filter["index"][-1]
+                test_period = end - start
         self.length_test_period = test_period.ceil("D").days
 
     def get_pts_required(self, hrs_req=12.5):
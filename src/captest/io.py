@@ -2,6 +2,15 @@
 import copy
 import dateutil
 import datetime
+import functools
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import tempfile
+import time
+from io import BytesIO
 from pathlib import Path
 from dataclasses import dataclass, field
 from typing import Optional
@@ -13,6 +22,7 @@ import pandas as pd
 
 from captest.capdata import CapData
 from captest.capdata import csky
+from captest.capdata import dtype_policy_tolerance
 from captest import columngroups as cg
 from captest import util
 
@@ -53,11 +63,147 @@ def load_excel_column_groups(path):
     return df.groupby(0)[1].apply(list).to_dict()
 
 
+def load_column_groups(path):
+    """
+    Load column groups from a json, yaml, or excel file.
+
+    Parameters
+    ----------
+    path : str
+        Path to a file with a ".json", ".yml", ".yaml", ".xlsx", or ".xls"
+        extension. See `load_excel_column_groups` for the layout of excel files.
+
+    Returns
+    -------
+    ColumnGroups or None
+        None if the extension is not one of the above.
+    """
+    p = Path(path)
+    if p.suffix == ".json":
+        return cg.ColumnGroups(util.read_json(path))
+    elif (p.suffix == ".yml") or (p.suffix == ".yaml"):
+        return cg.ColumnGroups(util.read_yaml(path))
+    elif (p.suffix == ".xlsx") or (p.suffix == ".xls"):
+        return cg.ColumnGroups(load_excel_column_groups(path))
+
+
+def accepts_usecols(file_reader):
+    """Return True if `file_reader` has a `usecols` parameter."""
+    try:
+        return "usecols" in inspect.signature(file_reader).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def assemble_datetimes(year, month, day, hour, minute):
+    """Combine arrays of date and time parts into datetimes."""
+    return pd.to_datetime(
+        pd.DataFrame(
+            {"year": year, "month": month, "day": day, "hour": hour, "minute": minute}
+        )
+    )
+
+
+def parse_pvsyst_dates(dates):
+    """
+    Convert the dates of a PVsyst output file to datetimes.
+
+    PVsyst writes dates like '01/01/90 00:00', i.e. January 1st, 1990. Dates in
+    this fixed width format are parsed by slicing the digits from the bytes of
+    the strings. Opening the PVsyst output in excel will likely change the dates
+    to 1/1/1990 0:00; dates that are not 14 characters long are parsed with a
+    single regular expression and assigned to the year 1990.
+
+    Dates are parsed as month/day/year and if that fails as day/month/year.
+
+    Parameters
+    ----------
+    dates : Series
+        Strings from the date column of the PVsyst output.
+
+    Returns
+    -------
+    Series
+        Datetimes with the index of `dates`.
+    """
+    year = None
+    if (dates.str.len() == 14).all():
+        try:
+            chars = dates.to_numpy(dtype="S14").view(np.uint8).reshape(-1, 14)
+        except UnicodeEncodeError:
+            chars = None
+        if chars is not None:
+            digits = chars[:, [0, 1, 3, 4, 6, 7, 9, 10, 12, 13]].astype(np.int64) - 48
+            if ((digits >= 0) & (digits <= 9)).all():
+                first, second, year, hour, minute = (
+                    digits[:, 0::2] * 10 + digits[:, 1::2]
+                ).T
+                year = np.where(year < 69, 2000 + year, 1900 + year)
+    if year is None:
+        parts = dates.str.extract(
+            r"^\s*(\d{1,2})/(\d{1,2})/\d{2,4}\s+(\d{1,2}):(\d{2})"
+        )
+        if parts.isna().any().any():
+            raise ValueError("Could not parse the dates of the PVsyst output.")
+        first, second, hour, minute = parts.astype(np.int64).to_numpy().T
+        year = np.full(len(dates), 1990)
+    try:
+        # mm/dd/yy hh:mm
+        dt_index = assemble_datetimes(year, first, second, hour, minute)
+    except ValueError:
+        warnings.warn(
+            "Dates are not in month/day/year format. Trying day/month/year format."
+        )
+        dt_index = assemble_datetimes(year, second, first, hour, minute)
+    dt_index.index = dates.index
+    return dt_index
+
+
+def format_index_column(index):
+    """
+    Format datetimes as strings like '01/31/1990 13 00' for the pvsyst 'index' column.
+
+    Equivalent to ``index.strftime("%m/%d/%Y %H %M")`` for years 0-9999, but
+    builds the strings from arrays of digits, which is much faster.
+
+    Parameters
+    ----------
+    index : DatetimeIndex
+
+    Returns
+    -------
+    ndarray
+        Object array of strings.
+    """
+    parts = [
+        (index.month, 2, "/"),
+        (index.day, 2, "/"),
+        (index.year, 4, " "),
+        (index.hour, 2, " "),
+        (index.minute, 2, ""),
+    ]
+    chars = np.empty((len(index), 16), dtype=np.uint8)
+    position = 0
+    for values, width, separator in parts:
+        values = np.asarray(values, dtype=np.int64)
+        for place in range(width - 1, -1, -1):
+            chars[:, position + place] = 48 + values % 10
+            values = values // 10
+        position += width
+        if separator:
+            chars[:, position] = ord(separator)
+            position += 1
+    return chars.view("S16").ravel().astype(str).astype(object)
+
+
 def load_pvsyst(
     path,
     name="pvsyst",
     egrid_unit_adj_factor=None,
     set_regression_columns=True,
+    mask_filtering=False,
+    dtype_policy=None,
+    index_column=True,
     **kwargs,
 ):
     """
@@ -75,8 +221,20 @@ def load_pvsyst(
     egrid_unit_adj_factor : numeric, default None
         E_Grid will be divided by the value passed.
     set_regression_columns : bool, default True
-        By default sets power to E_Grid, poa to GlobInc, t_amb to T Amb, and w_vel to
+        By default sets power to E_Grid, poa to GlobInc, t_amb to T_Amb, and w_vel to
         WindVel. Set to False to not set regression columns on load.
+    mask_filtering : bool, default False
+        Passed to `CapData`. Set to True to store the filtering state as a mask
+        over `data` rather than a filtered copy of `data`.
+    dtype_policy : None, 'float32', or dict, default None
+        Set to 'float32' to store float64 columns as float32 when no value changes
+        by more than 0.001, or pass a dictionary like
+        ``{'dtype': 'float32', 'tolerance': 0.01}`` to set the tolerance. The
+        regression columns are kept as float64. See `CapData.downcast_data`.
+    index_column : bool, default True
+        By default adds an 'index' column of the timestamps formatted as strings
+        like '01/31/1990 13 00', see `format_index_column`. Set to False to skip creating the column, e.g.
+        when loading many PVsyst files.
     **kwargs
         Use to pass additional kwargs to pandas read_csv. Pass sep=';' to load files
         that use semicolons instead of commas as the separator.
@@ -97,19 +255,11 @@ def load_pvsyst(
     encodings = ["utf-8", "latin1", "iso-8859-1", "cp1252"]
     for encoding in encodings:
         try:
-            # there is a pandas bug prior to pandas v1.3.0 that causes the blank
-            # line between the headers and data to be skipped
-            # after v.1.3.0, the blank line will be loaded
-            # loading headers and data separately and then combining them to avoid
-            # issues with pandas versions before and after the fix
-            pvraw_headers = pd.read_csv(
+            # pandas before v1.3.0 skips the blank line between the headers and
+            # data, later versions load it as a row of NaNs, which is dropped
+            pvraw = pd.read_csv(
                 dirName, skiprows=10, encoding=encoding, header=[0, 1], **kwargs
-            ).columns
-            pvraw_data = pd.read_csv(
-                dirName, skiprows=12, encoding=encoding, header=None, **kwargs
             ).dropna(axis=0, how="all")
-            pvraw = pvraw_data.copy()
-            pvraw.columns = pvraw_headers
         except UnicodeDecodeError:
             continue
         else:
@@ -126,42 +276,15 @@ def load_pvsyst(
             "Otherwise the date column may actually be missing. Exception:"
         )
         raise
-    # PVsyst creates dates like '01/01/90 00:00' i.e. January 1st, 1990.
-    # Opening the PVsyst output in excel will likely result in the dates modified to
-    # 1/1/1990 0:00. The strftime format specified won't load the excel modified dates
-    # so these are caught by checking for consistent length and reformatted
-    if not all(dates.str.len() == 14):
-        date_parts = dates.str.split(" ").str[0].str.split("/")
-        time_parts = dates.str.split(" ").str[1].str.split(":")
-        dates = (
-            date_parts.str[0].str.zfill(2)
-            + "/"
-            + date_parts.str[1].str.zfill(2)
-            + "/"
-            + "90 "
-            + time_parts.str[0].str.zfill(2)
-            + ":"
-            + time_parts.str[1]
-        )
-    try:
-        # mm/dd/yy hh:mm, lower case y gives
-        # Year without century as a zero-padded decimal number. e.g. 00, 01, …, 99
-        dt_index = pd.to_datetime(dates, format="%m/%d/%y %H:%M")
-    except ValueError:
-        warnings.warn(
-            "Dates are not in month/day/year format. Trying day/month/year format."
-        )
-        dt_index = pd.to_datetime(dates, format="%d/%m/%y %H:%M")
-    pvraw.index = dt_index
+    pvraw.index = parse_pvsyst_dates(dates)
     pvraw.drop("date", axis=1, inplace=True)
     pvraw = pvraw.rename(columns={"T Amb": "T_Amb"}).rename(columns={"TAmb": "T_Amb"})
 
-    cd = CapData(name)
+    cd = CapData(name, mask_filtering=mask_filtering)
     pvraw.index.name = "Timestamp"
     cd.data = pvraw.copy()
-    cd.data["index"] = cd.data.index.to_series().apply(
-        lambda x: x.strftime("%m/%d/%Y %H %M")
-    )
+    if index_column:
+        cd.data["index"] = format_index_column(cd.data.index)
     if egrid_unit_adj_factor is not None:
         cd.data["E_Grid"] = cd.data["E_Grid"] / egrid_unit_adj_factor
     cd.data_filtered = cd.data.copy()
@@ -170,10 +293,392 @@ def load_pvsyst(
         cd.set_regression_cols(
             power="E_Grid", poa="GlobInc", t_amb="T_Amb", w_vel="WindVel"
         )
+    tolerance = dtype_policy_tolerance(dtype_policy)
+    if tolerance is not None:
+        cd.downcast_data(tolerance=tolerance)
     return cd
 
 
-def file_reader(path, **kwargs):
+CSV_ENCODINGS = ["utf-8", "latin1", "iso-8859-1", "cp1252"]
+SNIFF_BYTES = 64 * 1024
+COMPRESSION_SUFFIXES = {".gz", ".bz2", ".zip", ".xz", ".zst", ".tar"}
+
+
+class SniffError(Exception):
+    """Raised when the start of a file is not enough to decide how to read it."""
+
+
+def read_csv_encodings(source, kwargs):
+    """
+    Read a csv with the first encoding in `CSV_ENCODINGS` that works.
+
+    Parameters
+    ----------
+    source : Path, str, or callable
+        Path to read or a callable returning a new file-like object to read.
+    kwargs : dict
+        Passed to pandas.read_csv. The `encoding` key is set to the encoding
+        used.
+
+    Returns
+    -------
+    DataFrame
+    """
+    for encoding in CSV_ENCODINGS:
+        kwargs["encoding"] = encoding
+        try:
+            return read_csv_source(source, kwargs)
+        except UnicodeDecodeError as err:
+            error = err
+    raise error
+
+
+def read_csv_source(source, kwargs):
+    """Call pandas.read_csv on `source`, calling it first if it is callable."""
+    if callable(source):
+        source = source()
+    return pd.read_csv(source, **kwargs)
+
+
+def drop_empty_rows(data_file, path, warn=True):
+    """Drop rows with no data or warn if the whole file has no data."""
+    if data_file.isna().all().all():
+        if warn:
+            warnings.warn("There is no data in the file {}".format(path))
+    else:
+        data_file.dropna(how="all", axis=0, inplace=True)
+    return data_file
+
+
+def is_range_index(index):
+    """Return True if the values of `index` are 0, 1, ..., n - 1."""
+    return index.equals(pd.Index(np.arange(len(index))))
+
+
+def find_header_end(index):
+    """
+    Find the number of header rows from the first index value that is a date.
+
+    Raises
+    ------
+    SniffError
+        If none of the index values can be parsed as a date.
+    """
+    for i, indice in enumerate(index):
+        try:
+            isinstance(dateutil.parser.parse(str(indice)), datetime.date)
+            return i + 1
+        except ValueError:
+            continue
+    raise SniffError("No dates found in the index.")
+
+
+def detect_layout(source, data_file, path, kwargs, warn_empty=True):
+    """
+    Find the index column and header rows of a csv file and reread it if needed.
+
+    Starting from the result of reading the file with the default kwargs,
+    rereads the file using the second column as the index if the first column
+    is just a row count and then rereads it with multiple header rows if the
+    index does not begin with a date. `kwargs` is updated with the
+    `index_col` and `header` used.
+
+    Returns
+    -------
+    DataFrame
+    """
+    data_file = drop_empty_rows(data_file, path, warn=warn_empty)
+    if is_range_index(data_file.index):
+        kwargs["index_col"] = 1
+        data_file = read_csv_source(source, kwargs)
+    if not isinstance(data_file.index[0], pd.Timestamp):
+        header = list(np.arange(find_header_end(data_file.index)))
+        kwargs.setdefault("header", header)
+        data_file = read_csv_source(source, kwargs)
+    return data_file
+
+
+def read_sample(path, nbytes=SNIFF_BYTES):
+    """
+    Read the complete lines in the first `nbytes` of a file.
+
+    Returns
+    -------
+    tuple
+        The bytes read and True if they are the whole file.
+    """
+    with UPath(path).open("rb") as f:
+        sample = f.read(nbytes + 1)
+    if len(sample) <= nbytes:
+        return sample, True
+    last_newline = sample.rfind(b"\n", 0, nbytes)
+    if last_newline == -1:
+        raise SniffError(f"No complete line in the first {nbytes} bytes.")
+    return sample[: last_newline + 1], False
+
+
+def label_columns(data_file, labels):
+    """
+    Restore the column and index labels of a file read with `project_columns`.
+
+    Parameters
+    ----------
+    data_file : DataFrame
+        Data read without a header, so the columns are labeled by their position
+        in the file.
+    labels : tuple or None
+        The index name and a dict mapping file positions to column labels, as
+        returned by `project_columns`. None to return `data_file` unchanged.
+
+    Returns
+    -------
+    DataFrame
+    """
+    if labels is None:
+        return data_file
+    index_name, column_labels = labels
+    data_file.columns = pd.MultiIndex.from_tuples(
+        [column_labels[col] for col in data_file.columns]
+    )
+    data_file.index.name = index_name
+    return data_file
+
+
+def project_columns(source, data_file, kwargs, usecols):
+    """
+    Update read_csv kwargs to parse only the columns named in `usecols`.
+
+    The names in `usecols` are matched to the columns of `data_file`, a sample
+    of the file read with `kwargs`, after joining multi-row headers and stripping
+    whitespace, i.e. the names `file_reader` returns. The index column and any
+    columns before it are always parsed. Pandas does not allow `usecols` with
+    multi-row headers, so those files are read without a header and labeled
+    with `label_columns`.
+
+    Parameters
+    ----------
+    source : callable
+        Returns a new file-like object of the sample.
+    data_file : DataFrame
+        The sample read with `kwargs`.
+    kwargs : dict
+        Kwargs for pandas.read_csv. Updated with the `usecols`, and for multi-row
+        headers the `header` and `skiprows`, to use for the whole file.
+    usecols : list of str
+        Names of the columns to parse.
+
+    Returns
+    -------
+    tuple or None
+        Labels to pass to `label_columns` or None if the columns do not need to
+        be relabeled.
+
+    Raises
+    ------
+    SniffError
+        If the sample read with the projected kwargs does not match the
+        selected columns of `data_file`.
+    """
+    index_col = kwargs.get("index_col")
+    if isinstance(index_col, bool) or not isinstance(index_col, int):
+        raise SniffError("Columns can only be projected with an integer index_col.")
+    multi_header = isinstance(data_file.columns, pd.MultiIndex)
+    names = (
+        flatten_multi_index(data_file.columns) if multi_header else data_file.columns
+    )
+    keep = set(usecols)
+    positions = [pos for pos in range(len(names) + 1) if pos != index_col]
+    selected = set(range(index_col + 1)) | {
+        pos for name, pos in zip(names, positions) if str(name).strip() in keep
+    }
+    projected = kwargs.copy()
+    projected["usecols"] = sorted(selected)
+    labels = None
+    if multi_header:
+        projected["header"] = None
+        projected["skiprows"] = len(kwargs["header"])
+        labels = (
+            data_file.index.name,
+            dict(zip(positions, data_file.columns)),
+        )
+    check = label_columns(read_csv_source(source, projected), labels)
+    expected = data_file.iloc[
+        :, [i for i, pos in enumerate(positions) if pos in selected]
+    ]
+    if not check.dropna(how="all").equals(expected.dropna(how="all")):
+        raise SniffError("Reading a subset of the columns changes the data.")
+    kwargs.update(projected)
+    return labels
+
+
+def sniff_csv(path, kwargs, usecols=None):
+    """
+    Decide how to read a csv file from its first few KB.
+
+    Reads the start of the file and runs the same encoding, index column, and
+    header row detection `file_reader` would run on the whole file.
+
+    Parameters
+    ----------
+    path : Path or str
+        Path to the csv file.
+    kwargs : dict
+        Kwargs for pandas.read_csv. Updated with the `encoding`,
+        `index_col`, and `header` to use for the whole file.
+    usecols : list of str, default None
+        Names of the columns to parse. If passed and the sample is not the whole
+        file, `kwargs` is updated to parse only these columns. See
+        `project_columns`.
+
+    Returns
+    -------
+    tuple
+        A dict of the changes made by the detection ('index_col', 'header'),
+        if the sample is the whole file, the loaded DataFrame, else None, and
+        the labels to pass to `label_columns` after reading the whole file.
+
+    Raises
+    ------
+    SniffError
+        If the file cannot be sniffed, e.g. it is compressed or the header
+        rows do not end within the sample.
+    """
+    if (
+        not isinstance(path, (str, os.PathLike))
+        or Path(str(path)).suffix.lower() in COMPRESSION_SUFFIXES
+        or kwargs.get("compression") is not None
+        or kwargs.get("chunksize") is not None
+        or kwargs.get("iterator")
+    ):
+        raise SniffError("File type or kwargs not supported for sniffing.")
+    sample, whole_file = read_sample(path)
+    source = functools.partial(BytesIO, sample)
+    before = {key: kwargs.get(key) for key in ["index_col", "header"]}
+    data_file = read_csv_encodings(source, kwargs)
+    data_file = detect_layout(source, data_file, path, kwargs, warn_empty=whole_file)
+    changes = {key: kwargs.get(key) for key in before if kwargs.get(key) != before[key]}
+    if whole_file:
+        return changes, data_file, None
+    labels = None
+    if usecols is not None:
+        labels = project_columns(source, data_file, kwargs, usecols)
+    return changes, None, labels
+
+
+def count_lines(path, block_size=16 * 1024**2):
+    """
+    Count the lines of a file without parsing it.
+
+    Returns
+    -------
+    int
+        Number of newline characters plus one, an upper bound of the number of
+        rows in the file.
+    """
+    count = 1
+    with UPath(path).open("rb") as f:
+        while block := f.read(block_size):
+            count += block.count(b"\n")
+    return count
+
+
+def clean_chunk(chunk, labels, usecols):
+    """
+    Prepare a chunk of a csv file read by `read_csv_chunks`.
+
+    Relabels the columns, drops rows without data, joins and strips the column
+    names, selects the `usecols` columns, and converts the values to numbers.
+
+    Returns
+    -------
+    DataFrame
+    """
+    chunk = label_columns(chunk, labels).dropna(how="all")
+    if isinstance(chunk.columns, pd.MultiIndex):
+        chunk.columns = flatten_multi_index(chunk.columns)
+    chunk = chunk.rename(columns=(lambda x: x.strip()))
+    if usecols is not None:
+        chunk = chunk.loc[:, chunk.columns.isin(list(usecols))]
+    if not isinstance(chunk.index, pd.DatetimeIndex):
+        chunk.index = pd.to_datetime(chunk.index, errors="coerce")
+    return to_numeric_columns(chunk)
+
+
+def read_csv_chunks(path, chunksize, usecols, kwargs):
+    """
+    Read a large csv file `chunksize` rows at a time.
+
+    The layout of the file is sniffed from its start as in `file_reader` and
+    the rows are then parsed in chunks. Each chunk is cleaned with
+    `clean_chunk` and its values are copied into a float64 array allocated
+    once for the whole file, so the memory used is about the size of the
+    returned DataFrame plus one parsed chunk.
+
+    Parameters
+    ----------
+    path : Path or str
+        Path to the csv file.
+    chunksize : int
+        Number of rows to parse at a time.
+    usecols : list of str or None
+        Names of the columns to load. See `file_reader`.
+    kwargs : dict
+        Kwargs for pandas.read_csv.
+
+    Returns
+    -------
+    DataFrame
+        Float64 data indexed by the parsed datetimes. Values that are not numeric
+        are NaN.
+
+    Raises
+    ------
+    ValueError
+        If the layout of the file cannot be determined from its start, e.g. it
+        is compressed.
+    """
+    try:
+        _, sample_data, labels = sniff_csv(path, kwargs, usecols=usecols)
+    except SniffError as err:
+        raise ValueError(f"{path} cannot be read in chunks: {err}") from None
+    if sample_data is not None:
+        return clean_chunk(sample_data, None, usecols).astype("float64")
+    kwargs["chunksize"] = chunksize
+    encodings = CSV_ENCODINGS[CSV_ENCODINGS.index(kwargs["encoding"]) :]
+    for encoding in encodings:
+        kwargs["encoding"] = encoding
+        values = None
+        indices = []
+        row = 0
+        try:
+            with pd.read_csv(path, **kwargs) as reader:
+                for chunk in reader:
+                    chunk = clean_chunk(chunk, labels, usecols)
+                    if values is None:
+                        columns = chunk.columns
+                        values = np.empty((count_lines(path), len(columns)))
+                    else:
+                        chunk = chunk.reindex(columns=columns)
+                    values[row : row + len(chunk)] = chunk.to_numpy(
+                        dtype="float64", na_value=np.nan
+                    )
+                    indices.append(chunk.index)
+                    row += len(chunk)
+        except UnicodeDecodeError as err:
+            error = err
+            continue
+        break
+    else:
+        raise error
+    if values is None or row == 0:
+        warnings.warn(f"There is no data in the file {path}")
+        if values is None:
+            return pd.DataFrame(index=pd.DatetimeIndex([]), dtype="float64")
+    index = indices[0].append(indices[1:])
+    return pd.DataFrame(values[:row], index=index, columns=columns, copy=False)
+
+
+def file_reader(path, usecols=None, chunksize=None, **kwargs):
     """
     Read measured solar data from a csv file.
 
@@ -182,10 +687,27 @@ def file_reader(path, **kwargs):
     by looking for a date in the first column, and concatenates column
     headings to a single string.
 
+    The encoding, index column, and header rows are determined from the first
+    64 KB of the file, so the whole file is parsed only once. Files that cannot
+    be sniffed, e.g. compressed files or files with very long headers, are read
+    repeatedly as needed to determine these.
+
     Parameters
     ----------
     path : Path
         Path to file to import.
+    usecols : list of str, default None
+        Names of the columns to load, as they appear in the returned DataFrame,
+        i.e. after joining multi-row headers and stripping whitespace. When the
+        file can be sniffed only these columns are parsed. Names not in the file
+        are ignored. A callable is passed to pandas read_csv unchanged.
+    chunksize : int, default None
+        Set to parse the file this many rows at a time to limit the memory used
+        to load very large files. The values are converted to numbers as each
+        chunk is read and stored in a single float64 array, so the returned
+        DataFrame is all float64 and values that are not numbers are NaN. The
+        layout of the file must be detectable from its first 64 KB; compressed
+        files cannot be read in chunks. See `read_csv_chunks`.
     **kwargs
         Use to pass additional kwargs to pandas read_csv.
 
@@ -201,50 +723,409 @@ def file_reader(path, **kwargs):
     }
     for key, value in default_kwargs.items():
         kwargs.setdefault(key, value)
-    encodings = ["utf-8", "latin1", "iso-8859-1", "cp1252"]
-    for encoding in encodings:
-        kwargs["encoding"] = encoding
-        try:
-            data_file = pd.read_csv(
-                path,
-                **kwargs,
-            )
-        except UnicodeDecodeError:
-            continue
-        else:
-            break
-    if data_file.isna().all().all():
-        warnings.warn("There is no data in the file {}".format(path))
-    else:
-        data_file.dropna(how="all", axis=0, inplace=True)
-    if data_file.index.equals(pd.Index(np.arange(len(data_file.index)))):
-        kwargs["index_col"] = 1
-        data_file = pd.read_csv(
-            path,
-            **kwargs,
-        )
-    if not isinstance(data_file.index[0], pd.Timestamp):
-        for i, _indice in enumerate(data_file.index):
-            try:
-                isinstance(
-                    dateutil.parser.parse(str(data_file.index[i])), datetime.date
+    if callable(usecols):
+        kwargs["usecols"] = usecols
+        usecols = None
+    if chunksize is not None:
+        return read_csv_chunks(path, chunksize, usecols, kwargs)
+    fallback_kwargs = kwargs.copy()
+    try:
+        changes, data_file, labels = sniff_csv(path, kwargs, usecols=usecols)
+        if data_file is None:
+            data_file = label_columns(read_csv_source(path, kwargs), labels)
+            if not changes:
+                # Same read as the first read of the unsniffed path, so finish
+                # the detection on the whole file.
+                data_file = detect_layout(path, data_file, path, kwargs)
+            elif "header" not in changes:
+                # First column is a row count; check it for the whole file.
+                row_count = data_file.iloc[:, 0]
+                has_data = ~(
+                    data_file.iloc[:, 1:].isna().all(axis=1) & pd.isna(data_file.index)
                 )
-                header_end = i + 1
-                break
-            except ValueError:
-                continue
-        header = list(np.arange(header_end))
-        kwargs.setdefault("header", header)
-        data_file = pd.read_csv(
-            path,
-            **kwargs,
-        )
+                if not is_range_index(pd.Index(row_count[has_data.values])):
+                    raise SniffError("First column is not a row count.")
+                if not isinstance(data_file.index[0], pd.Timestamp):
+                    header = list(np.arange(find_header_end(data_file.index)))
+                    kwargs.setdefault("header", header)
+                    data_file = read_csv_source(path, kwargs)
+    except (SniffError, ValueError, OSError):
+        kwargs = fallback_kwargs
+        data_file = read_csv_encodings(path, kwargs)
+        try:
+            data_file = detect_layout(path, data_file, path, kwargs)
+        except SniffError:
+            raise ValueError(
+                f"Could not find a date in the first column of {path}"
+            ) from None
     if isinstance(data_file.columns, pd.MultiIndex):
         data_file.columns = flatten_multi_index(data_file.columns)
     data_file = data_file.rename(columns=(lambda x: x.strip()))
+    if usecols is not None:
+        data_file = data_file.loc[:, data_file.columns.isin(list(usecols))]
     return data_file
 
 
+CACHE_DIR_NAME = ".captest_cache"
+
+
+def file_fingerprint(path, file_reader, kwargs, source=None):
+    """
+    Create a key identifying a file and how it is read.
+
+    The key is a hash of the path, size, and modification time of the file,
+    the name of the `file_reader` function, the kwargs passed to it, and the
+    pandas version, so editing or replacing the file or changing how it is read
+    results in a different key.
+
+    Parameters
+    ----------
+    path : str or Path
+        Path to the file.
+    file_reader : callable
+        Function used to read the file.
+    kwargs : dict
+        Kwargs passed to `file_reader`.
+    source : str, default None
+        Remote file that `path` is a local copy of, as made by `prefetch_files`.
+        The key then uses `source` and the name of the local copy, which
+        includes the version of the remote file, instead of the path and
+        modification time of the copy, which change each time it is downloaded.
+
+    Returns
+    -------
+    str
+        Hexadecimal SHA-256 digest.
+    """
+    stat = UPath(path).stat()
+    if source is None:
+        mtime = getattr(stat, "st_mtime_ns", None) or stat.st_mtime
+    else:
+        mtime = UPath(path).name
+    inputs = {
+        "path": str(path if source is None else source),
+        "size": stat.st_size,
+        "mtime": mtime,
+        "file_reader": "{}.{}".format(
+            getattr(file_reader, "__module__", ""),
+            getattr(file_reader, "__qualname__", repr(file_reader)),
+        ),
+        "kwargs": kwargs,
+        "pandas": pd.__version__,
+    }
+    return hashlib.sha256(
+        json.dumps(inputs, sort_keys=True, default=repr).encode()
+    ).hexdigest()
+
+
+def file_cache_path(path, cache_dir, fingerprint):
+    """
+    Path of the cached Parquet file for `path` with the given fingerprint.
+
+    Cache files are named from a hash of the source path followed by the start
+    of the fingerprint, so older versions of the same file can be found and
+    removed.
+    """
+    path_hash = hashlib.sha256(str(path).encode()).hexdigest()[:16]
+    return UPath(cache_dir) / f"{path_hash}-{fingerprint[:32]}.parquet"
+
+
+def read_cached_file(cache_path):
+    """
+    Read a DataFrame cached by `write_cached_file`.
+
+    Returns
+    -------
+    DataFrame or None
+        None if there is no cache file or it cannot be read.
+    """
+    try:
+        if not cache_path.exists():
+            return None
+        data = pd.read_parquet(str(cache_path), engine="pyarrow", memory_map=True)
+    except (OSError, ValueError):
+        return None
+    for col in data.select_dtypes(include="object").columns:
+        # pyarrow returns missing strings as None; read_csv uses NaN
+        data[col] = data[col].where(data[col].notna(), np.nan)
+    return data
+
+
+def write_cached_file(cache_path, data):
+    """
+    Save a loaded file to the cache as Parquet and remove older versions of it.
+
+    Frames Parquet cannot store, e.g. with duplicate or non-string column
+    names, are not cached.
+    """
+    cache_dir = cache_path.parent
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_dir / f"{cache_path.name}.{os.getpid()}.tmp"
+    try:
+        data.to_parquet(str(tmp_path), engine="pyarrow")
+    except (ValueError, TypeError, NotImplementedError):
+        tmp_path.unlink(missing_ok=True)
+        return
+    path_hash = cache_path.name.split("-")[0]
+    for old in cache_dir.glob(f"{path_hash}-*.parquet"):
+        old.unlink(missing_ok=True)
+    tmp_path.rename(cache_path)
+
+
+def timed_read(file_reader, path, kwargs, cache_dir=None, source=None):
+    """
+    Call `file_reader` on `path` and time it.
+
+    Module level so it can be sent to a process pool.
+
+    Parameters
+    ----------
+    file_reader : callable
+    path : str
+    kwargs : dict
+        Passed to `file_reader`.
+    cache_dir : str or Path, default None
+        If passed, the file is read from the Parquet cache in this directory
+        when it has not changed since it was cached, and otherwise read with
+        `file_reader` and cached.
+    source : str, default None
+        Remote file that `path` was downloaded from by `prefetch_files`. The
+        cached file is keyed on `source`, so it is found again when the remote
+        file is downloaded to a new temporary directory. See `file_fingerprint`.
+
+    Returns
+    -------
+    tuple
+        The DataFrame returned by `file_reader`, the seconds it took, and True
+        if it was read from the cache.
+    """
+    start = time.perf_counter()
+    if cache_dir is None:
+        data = file_reader(path, **kwargs)
+        return data, time.perf_counter() - start, False
+    cache_path = file_cache_path(
+        path if source is None else source,
+        cache_dir,
+        file_fingerprint(path, file_reader, kwargs, source=source),
+    )
+    data = read_cached_file(cache_path)
+    from_cache = data is not None
+    if not from_cache:
+        data = file_reader(path, **kwargs)
+        write_cached_file(cache_path, data)
+    return data, time.perf_counter() - start, from_cache
+
+
+def timed_reindex(data, name):
+    """
+    Reindex one loaded file with `util.reindex_datetime` and time it.
+
+    Returns
+    -------
+    tuple
+        The tuple returned by `util.reindex_datetime` and the seconds it took.
+    """
+    start = time.perf_counter()
+    reindexed = util.reindex_datetime(data, file_name=name, report=False)
+    return reindexed, time.perf_counter() - start
+
+
+LOCAL_PROTOCOLS = {"", "file", "local"}
+
+
+def is_remote(path):
+    """Return True if `path` is not on the local filesystem."""
+    return UPath(path).protocol not in LOCAL_PROTOCOLS
+
+
+def remote_versions(files):
+    """
+    Get a string identifying the version of each remote file.
+
+    Lists each directory containing `files` once and combines the size and
+    any modification time or ETag the filesystem reports.
+
+    Parameters
+    ----------
+    files : list of UPath
+
+    Returns
+    -------
+    dict
+        Maps the string of each file to its version.
+    """
+    fs = files[0].fs
+    details = {}
+    for parent in {file.parent.path for file in files}:
+        fs.invalidate_cache(parent)
+        for info in fs.ls(parent, detail=True):
+            details[fs._strip_protocol(info["name"])] = info
+    versions = {}
+    for file in files:
+        info = details.get(fs._strip_protocol(file.path), {})
+        keys = ["size", "ETag", "LastModified", "mtime", "last_modified", "created"]
+        versions[str(file)] = json.dumps(
+            {key: info[key] for key in keys if key in info}, default=str
+        )
+    return versions
+
+
+def prefetch_files(files, local_dir, batch_size=None, group_size=256):
+    """
+    Download remote files to a local directory.
+
+    Files are requested with the `cat` method of their fsspec filesystem. For
+    asynchronous filesystems like s3fs, up to `batch_size` requests are in flight
+    at a time. Files are downloaded in groups of `group_size`, so at most one
+    group is held in memory.
+
+    The local copies are named from a hash of the remote path and of the size and
+    modification time or ETag of the remote file. A local copy matching the
+    current version is used without downloading it again, and older copies of a
+    file are removed, so `local_dir` works as a read-through cache.
+
+    Parameters
+    ----------
+    files : list of UPath
+        Remote files on the same filesystem.
+    local_dir : str or Path
+        Directory to save the files in.
+    batch_size : int, default None
+        Maximum number of concurrent requests. By default uses the fsspec
+        default.
+    group_size : int, default 256
+        Number of files to download before writing them to `local_dir`.
+
+    Returns
+    -------
+    dict
+        Maps the string of each remote file to the path of its local copy. Files
+        that failed to download are left out.
+    """
+    if len(files) == 0:
+        return {}
+    local_dir = Path(local_dir)
+    local_dir.mkdir(parents=True, exist_ok=True)
+    fs = files[0].fs
+    versions = remote_versions(files)
+    local_files = {}
+    to_download = {}
+    for file in files:
+        path_hash = hashlib.sha256(str(file).encode()).hexdigest()[:16]
+        version_hash = hashlib.sha256(versions[str(file)].encode()).hexdigest()[:16]
+        local_path = local_dir / f"{path_hash}-{version_hash}-{file.name}"
+        if local_path.exists():
+            local_files[str(file)] = local_path
+        else:
+            for old in local_dir.glob(f"{path_hash}-*"):
+                old.unlink(missing_ok=True)
+            to_download[fs._strip_protocol(file.path)] = (str(file), local_path)
+    cat_kwargs = {"on_error": "return"}
+    if getattr(fs, "async_impl", False) and batch_size is not None:
+        cat_kwargs["batch_size"] = batch_size
+    remote_paths = list(to_download)
+    for start in range(0, len(remote_paths), group_size):
+        group = remote_paths[start : start + group_size]
+        contents = fs.cat(group, **cat_kwargs)
+        for remote_path in group:
+            content = contents.get(remote_path)
+            if not isinstance(content, bytes):
+                continue
+            file, local_path = to_download[remote_path]
+            tmp_path = local_path.with_name(f"{local_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(content)
+            tmp_path.replace(local_path)
+            local_files[file] = local_path
+    return local_files
+
+
+def to_numeric_columns(data):
+    """
+    Convert the columns of `data` that are not numeric to numbers.
+
+    Values that cannot be converted are set to NaN. Numeric columns are not
+    copied.
+
+    Parameters
+    ----------
+    data : DataFrame
+        Data to convert.
+
+    Returns
+    -------
+    DataFrame
+    """
+    non_numeric = [
+        col for col, dtype in data.dtypes.items() if dtype.kind not in "biufc"
+    ]
+    if len(non_numeric) == 0:
+        return data
+    if not data.columns.is_unique:
+        return data.apply(pd.to_numeric, errors="coerce")
+    data = data.copy(deep=False)
+    for col in non_numeric:
+        data[col] = pd.to_numeric(data[col], errors="coerce")
+    return data
+
+
+def join_mismatched_files(frames, freq):
+    """
+    Join DataFrames with different columns onto a common datetime index.
+
+    The index runs from the earliest to the latest timestamp of all the frames at
+    `freq`, plus any timestamps of the frames that are not on that grid. The
+    columns are the sorted union of the columns of the frames. Values of later
+    frames replace values of earlier frames for the same timestamp and column.
+
+    The values are written to a single float64 array, so an object array of
+    the joined data is never created. Values that are not numeric are set to
+    NaN. Columns that are integers in every frame they appear in and have no
+    missing values are returned as int64.
+
+    Parameters
+    ----------
+    frames : list of DataFrame
+        DataFrames with datetime indices to join.
+    freq : str
+        Frequency of the joined index.
+
+    Returns
+    -------
+    DataFrame
+    """
+    index = pd.date_range(
+        start=min(df.index.min() for df in frames),
+        end=max(df.index.max() for df in frames),
+        freq=freq,
+    )
+    for df in frames:
+        if not df.index.isin(index).all():
+            index = index.union(df.index)
+    columns = pd.Index({col for df in frames for col in df.columns}).sort_values()
+    values = np.full((len(index), len(columns)), np.nan)
+    int_columns = np.ones(len(columns), dtype=bool)
+    for df in frames:
+        rows = index.get_indexer(df.index)
+        cols = columns.get_indexer(df.columns)
+        frame_values = to_numeric_columns(df).to_numpy(dtype="float64", na_value=np.nan)
+        if (
+            df.index.is_monotonic_increasing
+            and rows.size > 0
+            and rows[-1] - rows[0] + 1 == rows.size
+        ):
+            # contiguous block of rows, avoid building a 2D fancy index
+            values[rows[0] : rows[-1] + 1, cols] = frame_values
+        else:
+            values[np.ix_(rows, cols)] = frame_values
+        if not all(dtype.kind in "iu" for dtype in df.dtypes):
+            int_columns[cols] = False
+    data = pd.DataFrame(values, index=index, columns=columns)
+    int_columns &= ~np.isnan(values).any(axis=0)
+    if int_columns.any():
+        data = data.astype({col: "int64" for col in columns[int_columns]})
+    return data
+
+
 @dataclass
 class DataLoader:
     """
@@ -260,6 +1141,9 @@ class DataLoader:
     file_reader: object = file_reader
     files_to_load: Optional[list] = field(default=None)
     failed_to_load: Optional[list] = field(default=None)
+    usecols: Optional[list] = field(default=None)
+    load_times: Optional[pd.DataFrame] = field(default=None)
+    reindex_times: dict = field(default_factory=dict)
 
     def __setattr__(self, key, value):
         if key == "path":
@@ -281,13 +1165,41 @@ class DataLoader:
                 )
             )
 
-    def reindex_loaded_files(self, verbose=False):
+    def get_cache_dir(self, cache):
+        """
+        Get the directory used to cache loaded files.
+
+        Parameters
+        ----------
+        cache : bool or str
+            True to use a ".captest_cache" directory in the data directory (or
+            next to the file when `path` is a file), or the path to a directory.
+
+        Returns
+        -------
+        UPath or None
+            None if caching is off or pyarrow is not installed.
+        """
+        if cache is False or cache is None:
+            return None
+        if importlib.util.find_spec("pyarrow") is None:
+            warnings.warn("Caching loaded files requires the pyarrow package.")
+            return None
+        if cache is True:
+            data_dir = self.path if self.path.is_dir() else self.path.parent
+            return data_dir / CACHE_DIR_NAME
+        return UPath(cache)
+
+    def reindex_loaded_files(self, verbose=False, executor=None):
         """Reindex files to ensure no missing indices and find frequency for each file.
 
         Parameters
         ----------
         verbose : bool, default False
             Set to True for more detailed output.
+        executor : concurrent.futures.Executor, default None
+            Executor used to reindex the files in parallel. By default the files
+            are reindexed one after another.
 
         Returns
         -------
@@ -300,17 +1212,25 @@ class DataLoader:
         """
         reindexed_dfs = {}
         file_frequencies = []
-        for name, file in self.loaded_files.items():
+        self.reindex_times = {}
+        if executor is None:
+            results = (
+                functools.partial(timed_reindex, file, name)
+                for name, file in self.loaded_files.items()
+            )
+        else:
+            results = [
+                executor.submit(timed_reindex, file, name).result
+                for name, file in self.loaded_files.items()
+            ]
+        for name, result in zip(self.loaded_files.keys(), results):
             if verbose:
                 print("-" * 40)
                 print(name)
-            current_file, missing_intervals, freq_str = util.reindex_datetime(
-                file,
-                file_name=name,
-                report=False,
-            )
+            (current_file, missing_intervals, freq_str), seconds = result()
             reindexed_dfs[name] = current_file
             file_frequencies.append(freq_str)
+            self.reindex_times[name] = seconds
 
         unique_freq = np.unique(
             np.array([freq for freq in file_frequencies]),
@@ -329,7 +1249,7 @@ class DataLoader:
         If they do not match, then they will be combined by creating a datetime index
         that begins with the earliest datetime in all the indices to the latest datetime
         in all the indices using the most common frequency across all the indices. The
-        columns will be a set of all the columns.
+        columns will be a set of all the columns. See `join_mismatched_files`.
 
         Returns
         -------
@@ -350,20 +1270,10 @@ class DataLoader:
             warnings.warn("Some columns contain overlapping indices.")
             data = pd.concat(self.loaded_files.values(), axis="index", sort=True)
         else:
-            joined_columns = pd.Index(
-                set([item for cols in all_columns for item in cols])
-            ).sort_values()
-            data = pd.DataFrame(
-                index=pd.date_range(
-                    start=min([df.index.min() for df in self.loaded_files.values()]),
-                    end=max([df.index.max() for df in self.loaded_files.values()]),
-                    freq=self.common_freq,
-                ),
-                columns=joined_columns,
+            data = join_mismatched_files(
+                list(self.loaded_files.values()), self.common_freq
             )
-            for file in self.loaded_files.values():
-                data.loc[file.index, file.columns] = file.values
-        data = data.apply(pd.to_numeric, errors="coerce")
+        data = to_numeric_columns(data)
         return data
 
     def load(
@@ -373,6 +1283,11 @@ class DataLoader:
         verbose=False,
         raise_errors=False,
         skip_dir_load=False,
+        workers=None,
+        executor="thread",
+        cache=False,
+        prefetch=False,
+        prefetch_dir=None,
         **kwargs,
     ):
         """
@@ -391,7 +1306,9 @@ class DataLoader:
         but missing time intervals between the individual files will not be filled.
 
         When loading multiple files they will be stored in `loaded_files`, a dictionary,
-        mapping the file names to a dataframe for each file.
+        mapping the file names to a dataframe for each file. The seconds spent reading
+        and reindexing each file, or reading a single file, are stored in
+        `load_times`, a DataFrame indexed by file name.
 
         Parameters
         ----------
@@ -413,9 +1330,42 @@ class DataLoader:
             Set to True to pass a custom file_reader that handles multiple files. This will
             skip the parsing of files in a directory and pass the path to the directory and kwargs
             to the file_reader function.
+        workers : int, default None
+            Number of files to read and reindex at the same time when loading a
+            directory of files. By default files are loaded one after another. The
+            order of `loaded_files`, the printed status, `failed_to_load`, and
+            `raise_errors` behave the same as when loading serially.
+        executor : {'thread', 'process'} or concurrent.futures.Executor
+            Default 'thread'. Kind of pool used when `workers` is greater than one,
+            or an existing executor to use regardless of `workers`. Threads work
+            well for the default csv reader, which spends much of its time in
+            pandas code that releases the GIL. With 'process' the `file_reader`
+            and kwargs must be picklable, i.e. a function importable from a module.
+        cache : bool or str, default False
+            Set to True to cache each loaded file as a Parquet file in a
+            ".captest_cache" directory next to the data, or pass the path of the
+            directory to use. Later loads read unchanged files from the cache instead
+            of parsing them again. A file is read again when its size or modification
+            time, the `file_reader`, or the kwargs passed to it change. Requires the
+            pyarrow package. Not used when `skip_dir_load` is True.
+        prefetch : bool or int, default False
+            Set to True to download all the files of a remote directory, e.g. on
+            S3, before reading them, using concurrent requests for filesystems
+            that support them like s3fs. Pass an int to set the maximum number of
+            concurrent requests. Files that fail to download are read from the
+            remote path and reported as usual if that fails. See
+            `prefetch_files`. Ignored for local paths.
+        prefetch_dir : str or Path, default None
+            Local directory to download the files to when `prefetch` is set. The
+            downloaded files are kept and reused by later loads until the remote
+            file changes. By default a temporary directory is used and removed
+            after loading. Files cached with `cache` are keyed on the remote
+            path, so they are reused even when downloaded to a new directory.
         **kwargs
             Are passed through to the file_reader callable, which by default will pass
-            them on to pandas.read_csv.
+            them on to pandas.read_csv. The default `file_reader` also accepts
+            `usecols`, a list of the column names to load, and `chunksize` to parse
+            very large files in chunks of rows. See `file_reader`.
 
         Returns
         -------
@@ -424,56 +1374,131 @@ class DataLoader:
         """
         if verbose:
             summary = True
+        self.usecols = kwargs.get("usecols")
+        cache_dir = self.get_cache_dir(cache)
         if self.path.is_file():
-            self.data = self.file_reader(self.path, **kwargs)
+            self.data, read_time, _ = timed_read(
+                self.file_reader, self.path, kwargs, cache_dir
+            )
+            self.reindex_times = {}
+            self.load_times = pd.DataFrame(
+                {
+                    "read": pd.Series({self.path.stem: read_time}, dtype="float64"),
+                    "reindex": pd.Series(self.reindex_times, dtype="float64"),
+                }
+            )
         elif self.path.is_dir() and skip_dir_load:
             self.data = self.file_reader(self.path, **kwargs)
         elif self.path.is_dir() and not skip_dir_load:
             if self.files_to_load is None:
                 self.set_files_to_load(extension=extension)
             self.loaded_files = dict()
+            read_times = {}
             failed_to_load_count = 0
-            for file in self.files_to_load:
-                try:
-                    if summary:
-                        print("trying to load {}".format(file))
-                    self.loaded_files[file.stem] = self.file_reader(str(file), **kwargs)
-                    if summary:
-                        print("    loaded      {}".format(file))
-                except Exception as err:
-                    if self.failed_to_load is None:
-                        self.failed_to_load = []
-                    self.failed_to_load.append(file)
-                    str_kwargs = ", ".join(f"{k}={v}" for k, v in kwargs.items())
-                    print("  **FAILED to load {}".format(file))
-                    print(
-                        "  To review full stack traceback run \n"
-                        "  meas.data_loader.file_reader(meas.data_loader"
-                        ".failed_to_load[{}], {})".format(
-                            failed_to_load_count, str_kwargs
+            local_files = {}
+            tmp_dir = None
+            if prefetch and is_remote(self.path):
+                if prefetch_dir is None:
+                    tmp_dir = tempfile.TemporaryDirectory()
+                local_files = prefetch_files(
+                    self.files_to_load,
+                    tmp_dir.name if tmp_dir is not None else prefetch_dir,
+                    batch_size=None if prefetch is True else prefetch,
+                )
+            read_paths = [
+                (str(local_files[str(file)]), str(file))
+                if str(file) in local_files
+                else (str(file), None)
+                for file in self.files_to_load
+            ]
+            pool, owns_pool = util.make_executor(workers, executor)
+            try:
+                if pool is None:
+                    results = (
+                        functools.partial(
+                            timed_read,
+                            self.file_reader,
+                            path,
+                            kwargs,
+                            cache_dir,
+                            source,
                         )
+                        for path, source in read_paths
                     )
-                    if raise_errors:
-                        raise err
-                    failed_to_load_count += 1
-                    continue
-            if summary:
-                print("=" * 40)
-                print("File loading complete")
-            if len(self.loaded_files) == 0:
-                warnings.warn("No files were loaded. Check that file_reader is working")
-            elif len(self.loaded_files) > 1:
-                if verbose:
+                else:
+                    results = [
+                        pool.submit(
+                            timed_read,
+                            self.file_reader,
+                            path,
+                            kwargs,
+                            cache_dir,
+                            source,
+                        ).result
+                        for path, source in read_paths
+                    ]
+                for file, result in zip(self.files_to_load, results):
+                    try:
+                        if summary:
+                            print("trying to load {}".format(file))
+                        data, read_times[file.stem], from_cache = result()
+                        self.loaded_files[file.stem] = data
+                        if summary:
+                            print(
+                                "    loaded      {} in {:.3f} s{}".format(
+                                    file,
+                                    read_times[file.stem],
+                                    " (cached)" if from_cache else "",
+                                )
+                            )
+                    except Exception as err:
+                        if self.failed_to_load is None:
+                            self.failed_to_load = []
+                        self.failed_to_load.append(file)
+                        str_kwargs = ", ".join(f"{k}={v}" for k, v in kwargs.items())
+                        print("  **FAILED to load {}".format(file))
+                        print(
+                            "  To review full stack traceback run \n"
+                            "  meas.data_loader.file_reader(meas.data_loader"
+                            ".failed_to_load[{}], {})".format(
+                                failed_to_load_count, str_kwargs
+                            )
+                        )
+                        if raise_errors:
+                            raise err
+                        failed_to_load_count += 1
+                        continue
+                if summary:
                     print("=" * 40)
-                    print("Reindexing each file loaded and joining them.")
-                (
-                    self.loaded_files,
-                    self.common_freq,
-                    self.file_frequencies,
-                ) = self.reindex_loaded_files(verbose=verbose)
-                data = self.join_files()
-            elif len(self.loaded_files) == 1:
-                data = list(self.loaded_files.values())[0]
+                    print("File loading complete")
+                self.reindex_times = {}
+                if len(self.loaded_files) == 0:
+                    warnings.warn(
+                        "No files were loaded. Check that file_reader is working"
+                    )
+                elif len(self.loaded_files) > 1:
+                    if verbose:
+                        print("=" * 40)
+                        print("Reindexing each file loaded and joining them.")
+                    (
+                        self.loaded_files,
+                        self.common_freq,
+                        self.file_frequencies,
+                    ) = self.reindex_loaded_files(verbose=verbose, executor=pool)
+                    data = self.join_files()
+                elif len(self.loaded_files) == 1:
+                    data = list(self.loaded_files.values())[0]
+            finally:
+                if owns_pool:
+                    pool.shutdown(cancel_futures=True)
+                if tmp_dir is not None:
+                    tmp_dir.cleanup()
+            self.load_times = pd.DataFrame(
+                {
+                    "read": pd.Series(read_times, dtype="float64"),
+                    "reindex": pd.Series(self.reindex_times, dtype="float64"),
+                }
+            )
             try:
                 data.index.name = "Timestamp"
                 self.data = data
@@ -483,6 +1508,56 @@ class DataLoader:
         else:
             warnings.warn("No directory or file found at {}".format(self.path))
 
+    def load_incremental(self, extension="csv", **kwargs):
+        """
+        Load the files added to the `path` directory since the last load.
+
+        Files already in `files_to_load`, including files that failed to load,
+        are not read again. The new files are loaded the same way as by `load`
+        and added to `files_to_load`, `loaded_files`, and `failed_to_load`. The
+        `usecols` passed to the last `load` are used unless `usecols` is passed.
+
+        Parameters
+        ----------
+        extension : str, default "csv"
+            Extension of the files to load. See `load`.
+        **kwargs
+            Passed to `load`.
+
+        Returns
+        -------
+        DataFrame or None
+            Data from the new files or None if there are no new files or none of
+            them loaded. The `data` attribute is not changed.
+        """
+        if self.files_to_load is None:
+            self.files_to_load = []
+        known_files = {str(file) for file in self.files_to_load}
+        new_files = sorted(
+            file
+            for file in self.path.glob("*." + extension)
+            if str(file) not in known_files
+        )
+        if len(new_files) == 0:
+            return None
+        if getattr(self, "usecols", None) is not None:
+            kwargs.setdefault("usecols", self.usecols)
+        new_loader = DataLoader(
+            path=self.path,
+            file_reader=self.file_reader,
+            files_to_load=new_files,
+        )
+        new_loader.load(extension=extension, **kwargs)
+        self.files_to_load = self.files_to_load + new_files
+        if not hasattr(self, "loaded_files"):
+            self.loaded_files = {}
+        self.loaded_files.update(new_loader.loaded_files)
+        if new_loader.failed_to_load is not None:
+            self.failed_to_load = (self.failed_to_load or []) + (
+                new_loader.failed_to_load
+            )
+        return new_loader.data
+
     def sort_data(self):
         self.data.sort_index(inplace=True)
 
@@ -508,6 +1583,11 @@ def load_data(
     site=None,
     column_groups_template=False,
     verbose=False,
+    mask_filtering=False,
+    csky_cache_dir=None,
+    cache=False,
+    dtype_policy=None,
+    only_grouped_columns=False,
     **kwargs,
 ):
     """
@@ -533,11 +1613,14 @@ def load_data(
         json or yaml file should parse to a dictionary and the excel file should have
         two columns with the first column containing the group ids and the second column
         the column names. The first column may have missing values. See function
-        `load_excel_column_groups` for more details.
+        `load_excel_column_groups` for more details. Set `only_grouped_columns`
+        to load only the columns in the file.
     file_reader : function, default io.file_reader
         Function to use to load an individual file. By default will use the built in
         `file_reader` function to try to load csv files. If passing a function to read
         other filetypes, the kwargs should include the filetype extension e.g. 'parquet'.
+        Functions with a `usecols` parameter are passed the list of column names to
+        load when `only_grouped_columns` is True.
     skip_dir_load : bool, default False
         Set to True to pass a custom file_reader that handles multiple files. This will
         skip the parsing of files in a directory by DataLoader.load and allow the function
@@ -566,6 +1649,30 @@ def load_data(
         manually create column groupings at `path`.
     verbose : bool, default False
         Set to True to print status of file loading.
+    mask_filtering : bool, default False
+        Passed to `CapData`. Set to True to store the filtering state as a mask
+        over `data` rather than a filtered copy of `data`, which keeps memory use
+        roughly constant as filtering steps are added.
+    csky_cache_dir : str or Path, default None
+        Directory to cache the modeled clear sky data in when `site` is passed.
+        Loading the same data for the same site again reads the cached clear sky
+        data instead of rerunning the pvlib models. See `capdata.csky`.
+    cache : bool or str, default False
+        Set to True to cache the parsed files as Parquet files in a ".captest_cache"
+        directory next to the data, or pass a directory to use. Later loads only
+        parse files that changed. See `DataLoader.load`.
+    dtype_policy : None, 'float32', or dict, default None
+        Set to 'float32' to store float64 columns as float32 when no value changes
+        by more than 0.001, or pass a dictionary like
+        ``{'dtype': 'float32', 'tolerance': 0.01}`` to set the tolerance. Columns
+        later assigned to `regression_cols` are converted back to float64. See
+        `CapData.downcast_data`.
+    only_grouped_columns : bool, default False
+        Set to True to pass the column names in a `group_columns` file to the
+        `file_reader` as `usecols`, so only the grouped columns are parsed and
+        columns not in any group are not loaded. Ignored if `group_columns` is not
+        a file, `usecols` is passed, `column_groups_template` is True, or the
+        `file_reader` does not have a `usecols` parameter.
     **kwargs
         Passed to `DataLoader.load`. Any kwargs not used by `DataLoader.load` are
         passed to the `file_reader` function, which by default passes
@@ -573,13 +1680,26 @@ def load_data(
         loaded from a directory without reindexing status shown when verbose is set to
         True.
     """
+    column_groups = None
+    if isinstance(group_columns, str):
+        column_groups = load_column_groups(group_columns)
+        if (
+            column_groups is not None
+            and only_grouped_columns
+            and not column_groups_template
+            and "usecols" not in kwargs
+            and accepts_usecols(file_reader)
+        ):
+            kwargs["usecols"] = sorted(
+                {col for cols in column_groups.values() for col in cols}
+            )
     dl = DataLoader(
         path=path,
         file_reader=file_reader,
     )
-    dl.load(verbose=verbose, skip_dir_load=skip_dir_load, **kwargs)
+    dl.load(verbose=verbose, skip_dir_load=skip_dir_load, cache=cache, **kwargs)
 
-    cd = CapData(name)
+    cd = CapData(name, mask_filtering=mask_filtering)
     if dl.data is not None:
         if sort:
             dl.sort_data()
@@ -598,14 +1718,8 @@ def load_data(
     # group columns
     if callable(group_columns):
         cd.column_groups = cg.ColumnGroups(group_columns(cd.data))
-    elif isinstance(group_columns, str):
-        p = Path(group_columns)
-        if p.suffix == ".json":
-            cd.column_groups = cg.ColumnGroups(util.read_json(group_columns))
-        elif (p.suffix == ".yml") or (p.suffix == ".yaml"):
-            cd.column_groups = cg.ColumnGroups(util.read_yaml(group_columns))
-        elif (p.suffix == ".xlsx") or (p.suffix == ".xls"):
-            cd.column_groups = cg.ColumnGroups(load_excel_column_groups(group_columns))
+    elif column_groups is not None:
+        cd.column_groups = column_groups
     if cd.column_groups is not None:
         cd.create_column_group_attributes()
     if site is not None:
@@ -616,13 +1730,94 @@ def load_data(
                     site = util.read_json(site)
                 if (path_to_site.suffix == ".yaml") or (path_to_site.suffix == ".yml"):
                     site = util.read_yaml(site)
-                cd.site = copy.deepcopy(site)
         if isinstance(site, dict):
-            cd.data = csky(cd.data, loc=site["loc"], sys=site["sys"])
+            cd.site = copy.deepcopy(site)
+            cd.data = csky(
+                cd.data,
+                loc=site["loc"],
+                sys=site["sys"],
+                cache_dir=csky_cache_dir,
+            )
             cd.data_filtered = cd.data.copy()
             cd.column_groups["irr-poa-clear_sky"] = ["poa_mod_csky"]
             cd.column_groups["irr-ghi-clear_sky"] = ["ghi_mod_csky"]
     cd.trans_keys = list(cd.column_groups.keys())
+    tolerance = dtype_policy_tolerance(dtype_policy)
+    if tolerance is not None and cd.data is not None:
+        cd.downcast_data(tolerance=tolerance)
     if column_groups_template:
         cd.data_columns_to_excel()
     return cd
+
+
+def update_data(
+    cd,
+    sort=True,
+    drop_duplicates=True,
+    reindex=True,
+    csky_cache_dir=None,
+    verbose=False,
+    **kwargs,
+):
+    """
+    Load files added to a data directory since `load_data` and append them.
+
+    Only the new files in the directory `cd` was loaded from are read, see
+    `DataLoader.load_incremental`. The new data is appended with
+    `CapData.append_data`, which applies the recorded filtering steps to the new
+    intervals.
+
+    Parameters
+    ----------
+    cd : CapData
+        CapData object returned by `load_data` for a directory of files.
+    sort : bool, default True
+        Sort the new data by the datetime index.
+    drop_duplicates : bool, default True
+        Drop rows of the new data that are duplicates of another row.
+    reindex : bool, default True
+        Reindex the new data to the timestep of the existing data, starting
+        after the last timestamp of the existing data, so missing intervals
+        between the existing and new data are filled.
+    csky_cache_dir : str or Path, default None
+        Directory used to cache the modeled clear sky data when `load_data` was
+        passed site data. See `capdata.csky`.
+    verbose : bool, default False
+        Passed to `DataLoader.load`.
+    **kwargs
+        Passed to `DataLoader.load`, e.g. `cache` and arguments for the
+        `file_reader`.
+
+    Returns
+    -------
+    int
+        Number of intervals added.
+    """
+    new_data = cd.data_loader.load_incremental(verbose=verbose, **kwargs)
+    if new_data is None:
+        return 0
+    if sort:
+        new_data = new_data.sort_index()
+    if drop_duplicates:
+        new_data = new_data.drop_duplicates()
+    if reindex and not cd.data.empty:
+        freq = getattr(cd.data_loader, "freq_str", None)
+        if freq is None:
+            freq = util.get_common_timestep(cd.data, string_output=True)
+        full_ix = pd.date_range(
+            start=cd.data.index[-1],
+            end=new_data.index[-1],
+            freq=freq,
+            name=cd.data.index.name,
+        )[1:]
+        new_data = new_data[~new_data.index.duplicated()].reindex(index=full_ix)
+    if new_data.empty:
+        return 0
+    if hasattr(cd, "site"):
+        new_data = csky(
+            new_data,
+            loc=cd.site["loc"],
+            sys=cd.site["sys"],
+            cache_dir=csky_cache_dir,
+        )
+    return cd.append_data(new_data)
@@ -1,3 +1,4 @@
+import concurrent.futures
 import warnings
 import re
 import json
@@ -21,6 +22,110 @@ def read_yaml(path):
     return data
 
 
+def make_executor(workers=None, executor="thread", initializer=None, initargs=()):
+    """
+    Create or pass through the executor used to run tasks in parallel.
+
+    Parameters
+    ----------
+    workers : int, default None
+        Number of workers. None or 1 means tasks are run one after another.
+    executor : {'thread', 'process'} or concurrent.futures.Executor
+        Kind of pool to create, or an existing executor to use regardless of
+        `workers`.
+    initializer : callable, default None
+        Passed to the process pool, which calls it with `initargs` when each
+        worker process starts. Not used for thread pools.
+    initargs : tuple, default ()
+        Arguments passed to `initializer`.
+
+    Returns
+    -------
+    tuple
+        The executor, or None to run tasks serially, and a bool that is True if
+        the executor was created here and should be shut down by the caller.
+    """
+    if isinstance(executor, concurrent.futures.Executor):
+        return executor, False
+    if workers is None or workers <= 1:
+        return None, False
+    if executor == "thread":
+        return concurrent.futures.ThreadPoolExecutor(max_workers=workers), True
+    if executor == "process":
+        pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, initializer=initializer, initargs=initargs
+        )
+        return pool, True
+    raise ValueError(
+        "executor must be 'thread', 'process', or a concurrent.futures.Executor"
+    )
+
+
+def run_tasks(
+    func,
+    tasks,
+    shared=(),
+    workers=None,
+    executor="process",
+    worker_func=None,
+    initializer=None,
+):
+    """
+    Call `func` with the arguments of each task and `shared`, possibly in a pool.
+
+    Tasks are run serially when `workers` is None or 1 or there is only one
+    task, unless an existing executor is passed. When a process pool is created
+    here and `worker_func` and `initializer` are passed, `shared` is sent to
+    each worker process once, as the arguments of `initializer`, and
+    `worker_func` is called with the arguments of each task instead of `func`.
+
+    Parameters
+    ----------
+    func : callable
+        Called as ``func(*task, *shared)``.
+    tasks : list of tuples
+        Arguments of each call.
+    shared : tuple, default ()
+        Arguments passed to every call after the arguments of the task.
+    workers : int, default None
+        Number of workers.
+    executor : {'process', 'thread'} or concurrent.futures.Executor
+        See `make_executor`.
+    worker_func : callable, default None
+        Called as ``worker_func(*task)`` in worker processes started with
+        `initializer`.
+    initializer : callable, default None
+        Called with `shared` when each worker process starts.
+
+    Returns
+    -------
+    list
+        The result of each task, in the order of `tasks`.
+    """
+    per_worker = worker_func is not None and initializer is not None
+    pool, owns_pool = make_executor(
+        workers if len(tasks) > 1 else None,
+        executor,
+        initializer=initializer if per_worker else None,
+        initargs=shared if per_worker else (),
+    )
+    if pool is None:
+        return [func(*task, *shared) for task in tasks]
+    try:
+        if (
+            per_worker
+            and owns_pool
+            and isinstance(pool, concurrent.futures.ProcessPoolExecutor)
+        ):
+            futures = [pool.submit(worker_func, *task) for task in tasks]
+        else:
+            futures = [pool.submit(func, *task, *shared) for task in tasks]
+        return [future.result() for future in futures]
+    finally:
+        if owns_pool:
+            pool.shutdown()
+
+
 def get_common_timestep(data, units="m", string_output=True):
     """
     Get the most commonly occuring timestep of data as frequency string.
@@ -3,12 +3,14 @@ import os
 import copy
 import collections
 import unittest
+import sys
+import warnings
 import pytest
 import numpy as np
 import pandas as pd
 import statsmodels.formula.api as smf
 import holoviews as hv
-from patsy import dmatrix
+from patsy import dmatrix, PatsyError
 
 import pvlib
 
@@ -62,6 +64,34 @@ class TestUpdateSummary:
         kwarg_dict_str_dates = {"start": "1990-10-10 00:00", "t1": 2}
         assert pvc.tstamp_kwarg_to_strings(kwarg_dict) == kwarg_dict_str_dates
 
+    def test_filter_history_stored_as_masks(self, meas):
+        """Verify kept and removed are recorded as masks without mask filtering."""
+        ix_before = meas.data_filtered.index
+        meas.filter_irr(200, 900, col_name="met1_poa_pyranometer")
+        kept, removed = meas.kept[0], meas.removed[0]
+        assert isinstance(kept, pvc.FilterStep)
+        assert isinstance(removed, pvc.FilterStep)
+        assert kept.source_index is meas.data.index
+        assert kept["index"].equals(meas.data_filtered.index)
+        assert removed["index"].equals(ix_before.difference(meas.data_filtered.index))
+
+    def test_filter_history_falls_back_to_index(self, meas):
+        """Verify intervals that are not in data are recorded as an index."""
+        meas.filter_custom(lambda df: df.shift(30, freq="s"))
+        assert not isinstance(meas.kept[0], pvc.FilterStep)
+        assert meas.kept[0]["index"].equals(meas.data_filtered.index)
+
+    def test_filter_step_mask(self, meas):
+        """Verify masks are aligned with the index for both kinds of record."""
+        meas.filter_irr(200, 900, col_name="met1_poa_pyranometer")
+        step = meas.kept[0]
+        as_dict = {"name": step["name"], "index": step["index"]}
+        mask = pvc.filter_step_mask(step, meas.data.index)
+        assert mask.sum() == meas.data_filtered.shape[0]
+        np.testing.assert_array_equal(
+            pvc.filter_step_mask(as_dict, meas.data.index), mask
+        )
+
 
 class TestTopLevelFuncs(unittest.TestCase):
     def test_perc_wrap(self):
@@ -291,6 +321,16 @@ class TestTopLevelFuncs(unittest.TestCase):
         less_than = all(cnts_after_flt < cnts_before_flt)
         self.assertTrue(less_than, "Points were not removed for each group.")
 
+        expected = pd.concat(
+            [
+                pvc.filter_irr(
+                    grp_df, poa_col, 0.8, 1.2, ref_val=pvsyst.rc.loc[grp_name, "poa"]
+                )
+                for grp_name, grp_df in grps
+            ]
+        )
+        pd.testing.assert_frame_equal(grps_flt.obj, expected)
+
     def test_perc_difference(self):
         result = pvc.perc_difference(9, 10)
         self.assertAlmostEqual(result, 0.105263158)
@@ -440,6 +480,168 @@ class TestTopLevelFuncs(unittest.TestCase):
         self.assertEqual(results_str, captured.out)
 
 
+@pytest.fixture
+def astm_reg_data():
+    """DataFrame of power, poa, t_amb, and w_vel following the ASTM model."""
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame(
+        {
+            "poa": rng.uniform(400, 1000, 300),
+            "t_amb": rng.uniform(10, 35, 300),
+            "w_vel": rng.uniform(0, 6, 300),
+        },
+        index=pd.date_range("2023-06-01", periods=300, freq="15min"),
+    )
+    df["power"] = df["poa"] * (
+        1 - 0.0002 * df["poa"] - 0.004 * df["t_amb"] + 0.002 * df["w_vel"]
+    ) + rng.normal(0, 5, 300)
+    df.iloc[10, 1] = np.nan
+    return df
+
+
+class TestFitModelAstm:
+    """Test the numpy fit of the default regression formula."""
+
+    def test_matches_statsmodels(self, astm_reg_data):
+        """Verify the fast results match statsmodels, including dropped NaNs."""
+        reg = pvc.fit_model(astm_reg_data)
+        expected = smf.ols(pvc.ASTM_FORMULA, data=astm_reg_data).fit()
+        assert isinstance(reg, pvc.AstmOLSResults)
+        for attr in ["params", "bse", "pvalues", "resid", "fittedvalues"]:
+            pd.testing.assert_series_equal(
+                getattr(reg, attr), getattr(expected, attr), rtol=1e-8
+            )
+        assert reg.scale == pytest.approx(expected.scale)
+        assert reg.rsquared == pytest.approx(expected.rsquared)
+        assert reg.nobs == expected.nobs
+
+    def test_predict(self, astm_reg_data):
+        """Verify predict matches statsmodels for DataFrames and dicts."""
+        reg = pvc.fit_model(astm_reg_data)
+        expected = smf.ols(pvc.ASTM_FORMULA, data=astm_reg_data).fit()
+        rc = pd.DataFrame({"poa": [800], "t_amb": [25], "w_vel": [2]})
+        assert reg.predict(rc)[0] == pytest.approx(expected.predict(rc)[0])
+        rc_dict = {"poa": 800, "t_amb": 25, "w_vel": 2}
+        assert reg.predict(rc_dict)[0] == pytest.approx(expected.predict(rc)[0])
+
+    def test_statsmodels_results_on_demand(self, astm_reg_data):
+        """Verify other attributes come from statsmodels results built once."""
+        reg = pvc.fit_model(astm_reg_data)
+        assert reg._full_results is None
+        assert reg.model.exog_names == pvc.ASTM_TERMS
+        full_results = reg._full_results
+        reg.summary()
+        assert reg._full_results is full_results
+        assert copy.deepcopy(reg)._full_results is None
+
+    def test_formula_whitespace(self, astm_reg_data):
+        """Verify the default formula is recognized regardless of spacing."""
+        fml = "power~poa+I(poa*poa)+I(poa*t_amb)+I(poa*w_vel)-1"
+        assert isinstance(pvc.fit_model(astm_reg_data, fml=fml), pvc.AstmOLSResults)
+
+    def test_falls_back_to_statsmodels(self, astm_reg_data):
+        """Verify statsmodels is used when the numpy fit is not possible."""
+        missing_col = astm_reg_data.drop(columns="w_vel")
+        rank_deficient = astm_reg_data.assign(w_vel=0)
+        too_few_rows = astm_reg_data.iloc[:4]
+        for df in [rank_deficient, too_few_rows]:
+            assert not isinstance(pvc.fit_model(df), pvc.AstmOLSResults)
+        with pytest.raises(PatsyError):
+            pvc.fit_model(missing_col)
+        other_fml = "power ~ poa + I(poa * poa) + I(poa * t_amb) - 1"
+        assert not isinstance(
+            pvc.fit_model(astm_reg_data, fml=other_fml), pvc.AstmOLSResults
+        )
+
+
+class TestFitGroupedAstm:
+    """Test fitting the default regression to all groups at once."""
+
+    def test_matches_fit_per_group(self, astm_reg_data):
+        """Verify the coefficients match fitting each group separately."""
+        grps = astm_reg_data.groupby(pd.Grouper(freq="D"))
+        params = pvc.fit_grouped_astm(grps)
+        assert params.shape == (4, 4)
+        for day, grp in grps:
+            np.testing.assert_allclose(
+                params.loc[day].values, pvc.fit_model(grp).params.values, rtol=1e-9
+            )
+
+    def test_too_few_points(self, astm_reg_data):
+        """Verify None is returned when a group has too few points."""
+        df = astm_reg_data.iloc[:100]
+        grps = df.groupby(pd.Grouper(freq="D"))
+        assert grps.size().iloc[-1] == 4
+        assert pvc.fit_grouped_astm(grps) is None
+
+    def test_pred_summary_matches_per_group_fits(self, astm_reg_data, mocker):
+        """Verify pred_summary gives the same results with batched fitting."""
+        grps = astm_reg_data.groupby(pd.Grouper(freq="D"))
+        rcs = pd.DataFrame({"poa": [800.0] * 4, "t_amb": 25.0, "w_vel": 2.0})
+        batched = pvc.pred_summary(grps, rcs.copy(), 0.05)
+        mocker.patch("captest.capdata.fit_grouped_astm", return_value=None)
+        per_group = pvc.pred_summary(grps, rcs.copy(), 0.05)
+        pd.testing.assert_frame_equal(batched, per_group, rtol=1e-9)
+
+
+class TestBatchedPredict:
+    """Test predicting with many models and reporting conditions at once."""
+
+    @pytest.mark.parametrize(
+        "fml", [pvc.ASTM_FORMULA, "power ~ poa + I(poa * t_amb) + w_vel"]
+    )
+    def test_predict_matches_statsmodels(self, astm_reg_data, fml):
+        """Verify batched predictions match predicting with each model."""
+        grps = astm_reg_data.groupby(pd.Grouper(freq="D"))
+        regs = grps.apply(pvc.fit_model, fml=fml)
+        rcs = pd.DataFrame(
+            {"poa": [600.0, 700, 800, 900], "t_amb": 25.0, "w_vel": [1.0, 2, 3, 4]}
+        )
+        expected = [
+            smf.ols(fml, data=grp).fit().predict(rcs.iloc[[i]]).iloc[0]
+            for i, (_, grp) in enumerate(grps)
+        ]
+        np.testing.assert_allclose(pvc.predict(regs, rcs), expected, rtol=1e-9)
+
+    def test_predict_different_terms(self, astm_reg_data):
+        """Verify models with different terms are evaluated one at a time."""
+        regs = [
+            pvc.fit_model(astm_reg_data),
+            pvc.fit_model(astm_reg_data, fml="power ~ poa"),
+        ]
+        rcs = pd.DataFrame({"poa": [800.0, 800], "t_amb": 25.0, "w_vel": 2.0})
+        preds = pvc.predict(regs, rcs)
+        assert preds.iloc[0] == pytest.approx(regs[0].predict(rcs.iloc[[0]])[0])
+        assert preds.iloc[1] == pytest.approx(regs[1].predict(rcs.iloc[[1]]).iloc[0])
+
+    @pytest.mark.parametrize(
+        "fml", [pvc.ASTM_FORMULA, "power ~ poa + I(poa * t_amb) + w_vel"]
+    )
+    def test_expanded_uncert(self, astm_reg_data, fml):
+        """Verify the uncertainty matches using statsmodels get_prediction."""
+        cd = pvc.CapData("uncert")
+        cd.regression_results = pvc.fit_model(astm_reg_data, fml=fml)
+        cd.rc = pd.DataFrame({"poa": [800.0], "t_amb": [25.0], "w_vel": [2.0]})
+        cd.instrument_uncert = {"irr": 15.0, "temp": 0.5}
+        cd.spatial_uncerts = {"irr": 5.0, "temp": 0.2}
+        grp_to_term = {"irr": "poa", "temp": "t_amb"}
+
+        reg = smf.ols(fml, data=astm_reg_data).fit()
+        pred = reg.get_prediction(cd.rc)
+        pred_cap = pred.predicted_mean[0]
+        perc_diffs = []
+        for group, term in grp_to_term.items():
+            rc = cd.rc.copy()
+            rc[term] += (
+                cd.instrument_uncert[group] ** 2 + cd.spatial_uncerts[group] ** 2
+            ) ** 0.5
+            perc_diffs.append((reg.predict(rc).iloc[0] - pred_cap) / pred_cap)
+        by = np.sqrt(np.sum(np.square(perc_diffs)))
+        sy = pred.se_obs[0] / pred_cap
+        expected = np.sqrt(by**2 + sy**2) * 1.96
+        assert cd.expanded_uncert(grp_to_term) == pytest.approx(expected, rel=1e-9)
+
+
 class TestCapDataEmpty:
     """Tests of CapData empty method."""
 
@@ -1004,6 +1206,36 @@ class TestIrrRcBalanced:
         assert isinstance(rc_tool.poa_flt, pd.DataFrame)
         assert np.isnan(rc_tool.irr_rc)
 
+    def test_counts_match_between(self, pvsyst):
+        """Verify the below and above counts match counting with Series.between."""
+        df = pvsyst.data.loc[pvsyst.data["GlobInc"] > 0, :].copy()
+        df["GlobInc"] = df["GlobInc"].round(-1)
+        rc_tool = pvc.ReportingIrradiance(df, "GlobInc", percent_band=20)
+        rc_tool.get_rep_irr()
+        poa = rc_tool.poa_flt.index.to_series()
+        below_count = [poa.between(ref * 0.8, ref).sum() for ref in poa]
+        above_count = [poa.between(ref, ref * 1.2).sum() for ref in poa]
+        assert rc_tool.poa_flt["below_count"].tolist() == below_count
+        assert rc_tool.poa_flt["above_count"].tolist() == above_count
+
+
+class TestCountBetween:
+    """Test the count_between function used to calculate reporting irradiance."""
+
+    def test_inclusive_bounds_with_ties(self):
+        """Verify values equal to either bound are counted."""
+        values = np.array([1.0, 2.0, 2.0, 3.0, 4.0])
+        counts = pvc.count_between(values, np.array([2.0, 0.0]), np.array([3.0, 1.0]))
+        assert counts.tolist() == [3, 1]
+
+    def test_nan_and_inverted_bounds_count_zero(self):
+        """Verify NaN bounds and lower bounds above upper bounds give zero."""
+        values = np.array([-2.0, 1.0, 2.0, np.nan])
+        counts = pvc.count_between(
+            values, np.array([np.nan, -1.6, 1.0]), np.array([2.0, -2.0, np.nan])
+        )
+        assert counts.tolist() == [0, 0, 0]
+
 
 class TestCapDataCopy:
     def test_copy_of_pre_agg_attributes(self, meas):
@@ -1461,6 +1693,77 @@ class Test_csky:
         # assumes typical orientation is used to calculate the poa irradiance
         assert csky_ghi_poa.index.tz == meas.data.index.tz
 
+    def test_csky_cache(self, meas, location_and_system, tmp_path, mocker):
+        """Test clear sky data is read from the cache for repeated calls."""
+        loc = location_and_system["location"]
+        sys = location_and_system["system"]
+        expected = pvc.csky(meas.data, loc=loc, sys=sys, output="all", concat=False)
+        spy = mocker.spy(pvc, "model_csky")
+        first = pvc.csky(
+            meas.data, loc=loc, sys=sys, output="all", concat=False, cache_dir=tmp_path
+        )
+        second = pvc.csky(
+            meas.data, loc=loc, sys=sys, output="all", concat=False, cache_dir=tmp_path
+        )
+        assert spy.call_count == 1
+        assert len(list(tmp_path.glob("csky_*.npz"))) == 1
+        pd.testing.assert_frame_equal(first, expected)
+        pd.testing.assert_frame_equal(second, expected, check_freq=False)
+        assert sys["albedo"] == 0.2
+
+    def test_csky_cache_second_resolution(self, meas, location_and_system, tmp_path):
+        """Test the cache is read correctly for an index that is not in ns."""
+        loc = location_and_system["location"]
+        sys = location_and_system["system"]
+        data = meas.data.iloc[:96, :2]
+        data.index = data.index.as_unit("s")
+        expected = pvc.csky(data, loc=loc, sys=sys, cache_dir=tmp_path)
+        cached = pvc.csky(data, loc=loc, sys=sys, cache_dir=tmp_path)
+        assert cached.shape[0] == 96
+        assert cached.index.equals(data.index)
+        assert cached["poa_mod_csky"].notna().any()
+        pd.testing.assert_frame_equal(cached, expected, check_freq=False)
+        ns_data = data.copy()
+        ns_data.index = ns_data.index.as_unit("ns")
+        times = pvc.get_tz_index(data, loc)
+        assert pvc.csky_cache_key(times, loc, sys, "both") == pvc.csky_cache_key(
+            pvc.get_tz_index(ns_data, loc), loc, sys, "both"
+        )
+
+    def test_csky_cache_key_changes(self, meas, location_and_system):
+        """Test the cache key depends on the system and the timestamps."""
+        loc = location_and_system["location"]
+        sys = location_and_system["system"]
+        times = pvc.get_tz_index(meas.data, loc)
+        key = pvc.csky_cache_key(times, loc, sys, "both")
+        assert key == pvc.csky_cache_key(times, loc, dict(sys), "both")
+        assert key != pvc.csky_cache_key(times[:-1], loc, sys, "both")
+        assert key != pvc.csky_cache_key(times, loc, sys, "all")
+        tilted = dict(sys, surface_tilt=30)
+        assert key != pvc.csky_cache_key(times, loc, tilted, "both")
+
+    def test_csky_corrupt_cache_file(self, meas, location_and_system, tmp_path):
+        """Test an unreadable cache file is replaced with new results."""
+        loc = location_and_system["location"]
+        sys = location_and_system["system"]
+        times = pvc.get_tz_index(meas.data, loc)
+        key = pvc.csky_cache_key(times, loc, sys, "both")
+        (tmp_path / f"csky_{key}.npz").write_bytes(b"not a npz file")
+        csky_df = pvc.csky(
+            meas.data, loc=loc, sys=sys, concat=False, cache_dir=tmp_path
+        )
+        pd.testing.assert_frame_equal(
+            pvc.read_csky_cache(tmp_path / f"csky_{key}.npz"), csky_df, check_freq=False
+        )
+
+    def test_sam_lookups_memoized(self, location_and_system, mocker):
+        """Test the SAM databases are only read once per session."""
+        spy = mocker.spy(pvc, "retrieve_sam")
+        pvc.sam_default_parameters.cache_clear()
+        for _ in range(3):
+            pvc.pvlib_system(dict(location_and_system["system"]))
+        assert spy.call_count == 2
+
 
 """
 Change csky to two functions for creating pvlib location and system objects.
@@ -1891,6 +2194,59 @@ class TestAbsDiffFromAverage:
         assert meets_threshold is True
 
 
+@pytest.fixture
+def sensor_values():
+    """DataFrame of four similar sensors with NaNs, zeros, and outliers."""
+    rng = np.random.default_rng(7)
+    df = pd.DataFrame(
+        rng.normal(800, 15, size=(500, 4)), columns=["s1", "s2", "s3", "s4"]
+    )
+    df.iloc[::17, 1] = np.nan
+    df.iloc[::23, :] = 0
+    df.iloc[5, 2] = -800
+    df.iloc[::31, 3] = 400
+    df.iloc[40, :3] = np.nan
+    return df
+
+
+class TestVectorizedRowFilters:
+    """Test the row filters used by filter_sensors on whole DataFrames."""
+
+    @pytest.mark.parametrize(
+        "row_filter, threshold",
+        [(pvc.check_all_perc_diff_comb, 0.05), (pvc.abs_diff_from_average, 25)],
+    )
+    def test_dataframe_matches_row_by_row(self, sensor_values, row_filter, threshold):
+        """Verify passing a DataFrame gives the same result as applying each row."""
+        by_row = sensor_values.apply(row_filter, args=(threshold,), axis=1)
+        vectorized = row_filter(sensor_values, threshold)
+        assert isinstance(vectorized, np.ndarray)
+        np.testing.assert_array_equal(vectorized, by_row.values)
+
+    def test_sensor_filter_custom_vectorized_row_filter(self, sensor_values):
+        """Verify a decorated custom row filter is called once with all rows."""
+        calls = []
+
+        @pvc.vectorized_row_filter
+        def spread(df, threshold):
+            calls.append(df.shape)
+            return (df.max(axis=1) - df.min(axis=1)).values <= threshold
+
+        ix = pvc.sensor_filter(sensor_values, 100, row_filter=spread)
+        assert calls == [sensor_values.shape]
+        assert ix.equals(sensor_values[spread(sensor_values, 100)].index)
+
+    def test_sensor_filter_custom_row_by_row(self, sensor_values):
+        """Verify undecorated custom row filters are still applied to each row."""
+
+        def spread(row, threshold):
+            return row.max() - row.min() <= threshold
+
+        ix = pvc.sensor_filter(sensor_values, 100, row_filter=spread)
+        spreads = sensor_values.max(axis=1) - sensor_values.min(axis=1)
+        assert ix.equals(sensor_values[spreads <= 100].index)
+
+
 class TestFilterSensorsWithAbsDiffFromAverage:
     "Test filter_sensors method of CapData when row_filter is abs_diff_from_average."
 
@@ -2389,6 +2745,672 @@ class TestFilterMissing:
         assert meas.data_filtered.shape[0] == 1424
 
 
+@pytest.fixture
+def meas_mask(meas):
+    """Copy of the meas fixture using mask filtering."""
+    meas_mask = pvc.CapData("meas", mask_filtering=True)
+    meas_mask.data = meas.data.copy()
+    meas_mask.data_filtered = meas.data.copy()
+    meas_mask.column_groups = copy.deepcopy(meas.column_groups)
+    meas_mask.regression_cols = copy.copy(meas.regression_cols)
+    return meas_mask
+
+
+def run_filters(cd):
+    cd.agg_sensors()
+    cd.filter_irr(200, 900)
+    cd.filter_time(start="10/9/1990", end="10/12/1990")
+    cd.filter_missing()
+    cd.filter_power(1000, percent=0.1)
+    cd.filter_irr(400, 800)
+
+
+class TestMaskFiltering:
+    """Test the CapData mask filtering mode."""
+
+    def test_setting_data_filtered_stores_mask(self, meas_mask):
+        """Verify assigning a subset of data stores a mask and drops the copy."""
+        meas_mask.data_filtered = meas_mask.data.iloc[10:20, :].copy()
+        assert meas_mask._data_filtered is None
+        assert meas_mask.filter_mask.sum() == 10
+        assert meas_mask.data_filtered.equals(meas_mask.data.iloc[10:20, :])
+
+    def test_filters_match_eager_filtering(self, meas, meas_mask):
+        """Verify a chain of filters gives the same data and summary as default."""
+        run_filters(meas)
+        run_filters(meas_mask)
+        assert meas_mask.data_filtered.equals(meas.data_filtered)
+        assert meas_mask.get_summary().equals(meas.get_summary())
+
+    def test_kept_and_removed_match_eager_filtering(self, meas, meas_mask):
+        """Verify the mask based filter history returns the same indices."""
+        run_filters(meas)
+        run_filters(meas_mask)
+        for eager, masked in zip(meas.kept, meas_mask.kept):
+            assert isinstance(masked, pvc.FilterStep)
+            assert masked["name"] == eager["name"]
+            assert masked["index"].equals(eager["index"])
+        for eager, masked in zip(meas.removed, meas_mask.removed):
+            assert masked["index"].equals(eager["index"])
+
+    def test_data_filtered_not_stored_after_filter(self, meas_mask):
+        """Verify filtering does not keep a materialized copy of the data."""
+        meas_mask.filter_irr(200, 900, col_name="met1_poa_pyranometer")
+        assert meas_mask._data_filtered is None
+
+    def test_filters_do_not_build_data_filtered(self, meas, meas_mask, mocker):
+        """Verify the filters update the mask without building the filtered data."""
+        meas_mask.agg_sensors()
+        getter = pvc.CapData.data_filtered.fget
+        spy = mocker.Mock(side_effect=getter)
+        mocker.patch.object(
+            pvc.CapData,
+            "data_filtered",
+            property(spy, pvc.CapData.data_filtered.fset),
+        )
+
+        def filters(cd):
+            cd.filter_sensors()
+            cd.filter_irr(200, 900)
+            cd.filter_missing()
+            cd.filter_power(5_000_000, percent=0.05)
+            cd.filter_days(["10/10/1990"], drop=True)
+            cd.filter_time(start="10/9/1990 12:00", end="10/11/1990 12:00", drop=True)
+
+        filters(meas_mask)
+        assert spy.call_count == 0
+        mocker.stopall()
+        meas.agg_sensors()
+        filters(meas)
+        assert meas.data_filtered.shape[0] > 0
+        assert meas_mask.data_filtered.equals(meas.data_filtered)
+        assert meas_mask.get_summary().equals(meas.get_summary())
+
+    def test_replacing_data_clears_cached_filtered_data(self, meas_mask):
+        """Verify new values in data are used by data_filtered."""
+        meas_mask.filter_irr(200, 900, col_name="met1_poa_pyranometer")
+        assert meas_mask.data_filtered is meas_mask.data_filtered
+        meas_mask.data = meas_mask.data * 2
+        pd.testing.assert_frame_equal(
+            meas_mask.data_filtered, meas_mask.data.loc[meas_mask.filter_mask, :]
+        )
+
+    def test_reset_filter(self, meas_mask):
+        """Verify reset_filter sets the mask to keep all intervals."""
+        meas_mask.filter_irr(200, 900, col_name="met1_poa_pyranometer")
+        meas_mask.reset_filter()
+        assert meas_mask.filter_mask.all()
+        assert meas_mask.data_filtered.shape == meas_mask.data.shape
+
+    def test_copy_keeps_mask(self, meas_mask):
+        """Verify copying a mask filtered CapData copies the mask."""
+        meas_mask.filter_irr(200, 900, col_name="met1_poa_pyranometer")
+        cd_copy = meas_mask.copy()
+        assert cd_copy.mask_filtering
+        assert cd_copy.filter_mask is not meas_mask.filter_mask
+        assert cd_copy.data_filtered.equals(meas_mask.data_filtered)
+
+    def test_agg_sensors_adds_columns_to_data_filtered(self, meas_mask):
+        """Verify aggregated columns appear in the lazily built data_filtered."""
+        meas_mask.agg_sensors()
+        meas_mask.filter_irr(200, 900, col_name="met1_poa_pyranometer")
+        assert "meter_power_sum_agg" not in meas_mask.data_filtered.columns
+        assert "irr_poa_pyran_mean_agg" in meas_mask.data_filtered.columns
+        assert meas_mask.filter_mask is not None
+
+    def test_not_subset_of_data_falls_back_to_frame(self, meas_mask):
+        """Verify assigning data that is not a subset of data stores the frame."""
+        new_frame = meas_mask.data.iloc[0:10, 0:2].copy()
+        meas_mask.data_filtered = new_frame
+        assert meas_mask.filter_mask is None
+        assert meas_mask.data_filtered is new_frame
+
+    def test_pack_unpack_mask(self):
+        """Verify bit-packing a mask round trips."""
+        mask = np.array([True, False, False, True, True, False, True, False, True])
+        assert np.array_equal(pvc.unpack_mask(pvc.pack_mask(mask), len(mask)), mask)
+
+    def test_index_to_mask_out_of_order(self):
+        """Verify a subset in a different order cannot be converted to a mask."""
+        ix = pd.date_range("2023-01-01", periods=5, freq="h")
+        assert pvc.index_to_mask(ix, ix[[3, 1]]) is None
+
+
+def split_meas(cd, n_rows=700):
+    """Copy of `cd` with only the first `n_rows` intervals and the rest of the data."""
+    partial = cd.copy()
+    partial.data = cd.data.iloc[:n_rows, :].copy()
+    partial.data_filtered = partial.data.copy()
+    return partial, cd.data.iloc[n_rows:, :].copy()
+
+
+class TestAppendData:
+    """Test appending new intervals to a filtered CapData object."""
+
+    @pytest.mark.parametrize("mask_filtering", [False, True])
+    def test_matches_filtering_all_data(self, meas, mask_filtering):
+        """Verify appending and filtering the new rows matches filtering all data."""
+        meas.mask_filtering = mask_filtering
+        meas.reset_filter()
+        partial, new_data = split_meas(meas)
+        run_filters(partial)
+        run_filters(meas)
+        assert partial.append_data(new_data) == new_data.shape[0]
+        assert partial.data.equals(meas.data)
+        assert partial.data_filtered.equals(meas.data_filtered)
+        assert partial.get_summary().equals(meas.get_summary())
+        for appended, full in zip(partial.kept, meas.kept):
+            assert appended["index"].equals(full["index"])
+        for appended, full in zip(partial.removed, meas.removed):
+            assert appended["index"].equals(full["index"])
+
+    def test_row_local_filters_not_rerun(self, meas, mocker):
+        """Verify the existing data is not filtered again for row-local filters."""
+        partial, new_data = split_meas(meas)
+        run_filters(partial)
+        spy = mocker.spy(pvc, "filter_irr")
+        partial.append_data(new_data)
+        assert spy.call_count == 2
+        for call in spy.call_args_list:
+            assert call.args[0].index.isin(new_data.index).all()
+
+    def test_not_row_local_reruns_all_filters(self, meas):
+        """Verify filters that depend on other intervals are run on all data."""
+        partial, new_data = split_meas(meas)
+        partial.filter_irr(200, 900, col_name="met1_poa_refcell")
+        partial.filter_outliers()
+        meas.filter_irr(200, 900, col_name="met1_poa_refcell")
+        meas.filter_outliers()
+        partial.append_data(new_data)
+        assert partial.data_filtered.equals(meas.data_filtered)
+        assert partial.get_summary().equals(meas.get_summary())
+        assert [call[0] for call in partial.filter_calls] == [
+            "filter_irr",
+            "filter_outliers",
+        ]
+
+    def test_old_and_duplicate_rows_dropped(self, meas):
+        """Verify rows not after the end of data are not appended."""
+        partial, new_data = split_meas(meas)
+        new_data = pd.concat([meas.data.iloc[650:, :], new_data.iloc[:10, :]])
+        assert partial.append_data(new_data) == 740
+        assert partial.data.index.equals(meas.data.index)
+
+    def test_unrecorded_filtering_warns(self, meas):
+        """Verify data_filtered is left alone when the filter steps are unknown."""
+        partial, new_data = split_meas(meas)
+        partial.filter_irr(200, 900, col_name="met1_poa_refcell")
+        partial.filter_calls = []
+        filtered = partial.data_filtered.copy()
+        with pytest.warns(UserWarning, match="not recorded"):
+            partial.append_data(new_data)
+        assert partial.data.shape[0] == meas.data.shape[0]
+        assert partial.data_filtered.equals(filtered)
+
+
+class TestDowncastData:
+    """Test storing measurement columns as float32."""
+
+    def test_regression_columns_kept_float64(self, meas):
+        """Verify the columns in regression_cols are not converted."""
+        converted = meas.downcast_data()
+        assert "meter_power" not in converted
+        assert meas.data["meter_power"].dtype == "float64"
+        assert meas.data["met1_poa_refcell"].dtype == "float32"
+        assert (meas.data_filtered.dtypes == meas.data.dtypes).all()
+
+    def test_set_regression_cols_upcasts(self, meas):
+        """Verify setting regression_cols converts the columns back to float64."""
+        meas.regression_cols = {}
+        meas.downcast_data(tolerance=1)
+        assert meas.data["meter_power"].dtype == "float32"
+        meas.set_regression_cols(
+            power="meter_power", poa="irr_poa_pyran", t_amb="temp_amb", w_vel="wind"
+        )
+        assert (meas.data[meas.regression_columns()].dtypes == "float64").all()
+
+    def test_regression_matches_float64(self, meas):
+        """Verify the regression and reporting conditions use float64 data."""
+        meas_32 = meas.copy()
+        meas_32.regression_cols = {}
+        meas_32.downcast_data()
+        meas_32.regression_cols = copy.copy(meas.regression_cols)
+        for cd in [meas, meas_32]:
+            cd.agg_sensors()
+            cd.filter_irr(200, 900)
+            cd.rep_cond()
+            cd.fit_regression(filter=False)
+        assert (meas_32.get_reg_cols().dtypes == "float64").all()
+        pd.testing.assert_frame_equal(meas_32.rc, meas.rc, rtol=1e-6)
+        np.testing.assert_allclose(
+            meas_32.regression_results.params,
+            meas.regression_results.params,
+            rtol=1e-5,
+        )
+
+    def test_mask_filtering_data_filtered_rebuilt(self, meas_mask):
+        """Verify the cached data_filtered is rebuilt after converting data."""
+        meas_mask.filter_irr(200, 900, col_name="met1_poa_refcell")
+        assert meas_mask.data_filtered["met1_poa_refcell"].dtype == "float64"
+        meas_mask.downcast_data()
+        assert meas_mask.data_filtered["met1_poa_refcell"].dtype == "float32"
+
+
+def pipeline_steps(irr_low=200):
+    return [
+        (pvc.CapData.agg_sensors, (), {}),
+        (pvc.CapData.filter_irr, (irr_low, 900), {}),
+        (pvc.CapData.filter_missing, (), {}),
+        (pvc.CapData.filter_irr, (400, 800), {}),
+        (pvc.CapData.rep_cond, (), {}),
+        (pvc.CapData.fit_regression, (), {"filter": False, "summary": False}),
+    ]
+
+
+class TestFilterPipeline:
+    """Test re-running the changed steps of a FilterPipeline."""
+
+    @pytest.mark.parametrize("mask_filtering", [False, True])
+    def test_changed_step_matches_full_run(self, meas, mask_filtering):
+        """Verify re-running from a changed step matches running every step."""
+        meas.mask_filtering = mask_filtering
+        meas.reset_filter()
+        full = meas.copy()
+        pipeline = pvc.FilterPipeline(meas, pipeline_steps())
+        pipeline.run()
+        pipeline.steps[1] = (pvc.CapData.filter_irr, (300, 900), {})
+        pipeline.run()
+        pvc.run_test(full, pipeline_steps(irr_low=300))
+        assert pipeline.rerun_from == 1
+        assert meas.data_filtered.equals(full.data_filtered)
+        assert meas.get_summary().equals(full.get_summary())
+        assert meas.rc.equals(full.rc)
+        assert meas.regression_results.params.equals(full.regression_results.params)
+        assert meas.column_groups == full.column_groups
+        assert meas.regression_cols == full.regression_cols
+
+    def test_unchanged_steps_not_run(self, meas):
+        """Verify running the same steps again restores the final state."""
+        pipeline = pvc.FilterPipeline(meas, pipeline_steps()[:4])
+        pipeline.run()
+        summary = meas.get_summary()
+        pipeline.run(pipeline_steps()[:4])
+        assert pipeline.rerun_from == 4
+        assert meas.get_summary().equals(summary)
+
+    def test_removed_step(self, meas):
+        """Verify removing the last steps restores the earlier state."""
+        pipeline = pvc.FilterPipeline(meas, pipeline_steps()[:4])
+        pipeline.run()
+        pipeline.run(pipeline_steps()[:2])
+        assert pipeline.rerun_from == 2
+        assert len(meas.summary) == 1
+        assert len(meas.kept) == 1
+
+    def test_clear(self, meas):
+        """Verify all steps are run again after clearing the records."""
+        pipeline = pvc.FilterPipeline(meas, pipeline_steps()[:4])
+        pipeline.run()
+        pipeline.clear()
+        pipeline.run()
+        assert pipeline.rerun_from == 0
+        assert len(meas.kept) == 3
+
+    def test_equal_arguments(self):
+        """Verify arguments are compared by value."""
+        ix = pd.date_range("2020", periods=3, freq="h")
+        assert pvc.equal_arguments(
+            (pd.Series([1, 2]), {"a": [1]}), (pd.Series([1, 2]), {"a": [1]})
+        )
+        assert pvc.equal_arguments(np.array([1.0, np.nan]), np.array([1.0, np.nan]))
+        assert pvc.equal_arguments(ix, ix.copy())
+        assert not pvc.equal_arguments(ix, ix[:2])
+        assert not pvc.equal_arguments((1,), (1.0,))
+        assert not pvc.equal_arguments({"a": 1}, {"b": 1})
+
+
+def sweep_steps(irr_low=200, irr_high=900):
+    return [
+        (pvc.CapData.agg_sensors, (), {}),
+        (pvc.CapData.filter_irr, (irr_low, irr_high), {}),
+        (pvc.CapData.filter_missing, (), {}),
+    ]
+
+
+class TestSweep:
+    """Test running variants of a capacity test with sweep."""
+
+    def test_serial(self, meas):
+        """Verify each combination is run and compared to the expected result."""
+        expected = meas.copy()
+        pvc.run_test(expected, sweep_steps(400))
+        expected.rep_cond()
+        expected.fit_regression(filter=False, summary=False)
+        results = pvc.sweep(
+            meas, sweep_steps, {"irr_low": [200, 400], "irr_high": [800, 900]}, expected
+        )
+        assert results.shape[0] == 4
+        assert list(results.columns[:6]) == [
+            "irr_low",
+            "irr_high",
+            "points",
+            "actual",
+            "expected",
+            "cap_ratio",
+        ]
+        assert list(results.columns[-2:]) == ["error", "seconds"]
+        assert results["error"].isna().all()
+        same = results[(results.irr_low == 400) & (results.irr_high == 900)]
+        assert same["cap_ratio"].iloc[0] == pytest.approx(1)
+        assert same["points"].iloc[0] == expected.data_filtered.shape[0]
+        assert meas.summary == []
+
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_pool_matches_serial(self, meas, executor):
+        """Verify running the variants in a pool gives the serial results."""
+        grid = [{"irr_low": 200}, {"irr_low": 400, "irr_high": 800}]
+        serial = pvc.sweep(meas, sweep_steps, grid, expected=1000)
+        pooled = pvc.sweep(
+            meas, sweep_steps, grid, expected=1000, workers=2, executor=executor
+        )
+        pd.testing.assert_frame_equal(
+            pooled.drop(columns="seconds"), serial.drop(columns="seconds")
+        )
+
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_output_scoped_to_variants(self, meas, capsys, executor):
+        """Verify variants are quiet and sys.stdout and warnings are restored."""
+        stdout = sys.stdout
+        filters = list(warnings.filters)
+        grid = {"irr_low": [200, 300, 400, 500]}
+        pvc.sweep(meas, sweep_steps, grid, expected=1000)
+        assert capsys.readouterr().out == ""
+        pvc.sweep(meas, sweep_steps, grid, workers=2, executor=executor)
+        assert sys.stdout is stdout
+        assert warnings.filters == filters
+
+    def test_errors(self, meas):
+        """Verify failed variants are recorded or raised."""
+        grid = {"irr_low": [200, 2000]}
+        results = pvc.sweep(meas, sweep_steps, grid)
+        assert results["error"].iloc[0] is None
+        assert isinstance(results["error"].iloc[1], str)
+        assert np.isnan(results["cap_ratio"].iloc[1])
+        with pytest.raises(ValueError):
+            pvc.sweep(meas, sweep_steps, grid, raise_errors=True)
+
+
+@pytest.fixture
+def bootstrap_cds(meas):
+    """Measured and simulated CapData objects ready for bootstrap_cap_ratio."""
+    pvc.run_test(meas, sweep_steps())
+    meas.rep_cond()
+    meas.fit_regression(filter=False, summary=False)
+    meas.instrument_uncert = {"irr": 15.0, "temp": 0.5}
+    meas.spatial_uncerts = {"irr": 5.0, "temp": 0.2}
+    sim = meas.copy()
+    sim.rc = None
+    return sim, meas
+
+
+class TestBootstrapCapRatio:
+    """Test the bootstrap distribution of the capacity ratio."""
+
+    def test_replicates_are_weighted_fits(self, bootstrap_cds):
+        """Verify each replicate is a fit weighted by the days drawn."""
+        sim, meas = bootstrap_cds
+        ratios = pvc.bootstrap_cap_ratio(sim, meas, n_replicates=3, seed=42)
+        assert ratios.name == "cap_ratio"
+        assert ratios.index.name == "replicate"
+
+        df = meas.get_reg_cols()
+        days = np.unique(df.index.normalize(), return_inverse=True)[1]
+        rng = np.random.default_rng(np.random.SeedSequence(42).spawn(1)[0])
+        counts = rng.multinomial(days.max() + 1, np.full(days.max() + 1, 0.2), 3)
+        expected = meas.regression_results.predict(meas.rc).iloc[0]
+        for i in range(3):
+            results = smf.wls(
+                meas.regression_formula, data=df, weights=counts[i][days]
+            ).fit()
+            assert ratios[i] == pytest.approx(
+                results.predict(meas.rc).iloc[0] / expected, rel=1e-9
+            )
+
+    def test_seed_and_workers(self, bootstrap_cds):
+        """Verify the replicates depend on the seed but not the workers."""
+        sim, meas = bootstrap_cds
+        kwargs = {"n_replicates": 50, "seed": 7, "chunksize": 20}
+        serial = pvc.bootstrap_cap_ratio(sim, meas, **kwargs)
+        pd.testing.assert_series_equal(
+            serial, pvc.bootstrap_cap_ratio(sim, meas, **kwargs)
+        )
+        pd.testing.assert_series_equal(
+            serial, pvc.bootstrap_cap_ratio(sim, meas, workers=2, **kwargs)
+        )
+        kwargs["seed"] = 8
+        assert not serial.equals(pvc.bootstrap_cap_ratio(sim, meas, **kwargs))
+
+    def test_perturbed_formula_paths_match(self, bootstrap_cds):
+        """Verify perturbed fits of the ASTM formula match the patsy path."""
+        sim, meas = bootstrap_cds
+        grp_to_term = {"irr": "poa", "temp": "t_amb"}
+        kwargs = {"n_replicates": 20, "grp_to_term": grp_to_term, "seed": 3}
+        astm = pvc.bootstrap_cap_ratio(sim, meas, **kwargs)
+        for cd in [sim, meas]:
+            cd.regression_formula = (
+                "power ~ poa + I(poa * t_amb) + I(poa * poa) + I(poa * w_vel) - 1"
+            )
+        assert not pvc.is_astm_formula(meas.regression_formula)
+        pd.testing.assert_series_equal(
+            astm, pvc.bootstrap_cap_ratio(sim, meas, **kwargs), rtol=1e-8
+        )
+        unperturbed = pvc.bootstrap_cap_ratio(sim, meas, n_replicates=20, seed=3)
+        assert astm.std() > unperturbed.std()
+
+    def test_different_formulas(self, bootstrap_cds):
+        """Verify an error is raised when the formulas differ."""
+        sim, meas = bootstrap_cds
+        sim.regression_formula = "power ~ poa"
+        with pytest.raises(ValueError, match="regression formula"):
+            pvc.bootstrap_cap_ratio(sim, meas, n_replicates=5)
+
+
+class TestOnlineRegression:
+    """Test the regression updated from sufficient statistics."""
+
+    @pytest.mark.parametrize(
+        "fml", [pvc.ASTM_FORMULA, "power ~ poa + I(poa * t_amb) + w_vel"]
+    )
+    def test_update_and_remove_match_fit(self, astm_reg_data, fml):
+        """Verify adding and removing rows matches fitting the remaining rows."""
+        online = pvc.OnlineRegression(fml)
+        online.update(astm_reg_data.iloc[:200])
+        online.update(astm_reg_data.iloc[100:])
+        online.remove(astm_reg_data.iloc[:50])
+        online.remove(astm_reg_data.iloc[:50])
+        remaining = astm_reg_data.iloc[50:]
+        results = smf.ols(fml, data=remaining).fit()
+        assert online.nobs == results.nobs == 250
+        pd.testing.assert_series_equal(online.params, results.params, rtol=1e-8)
+        assert online.scale == pytest.approx(results.scale, rel=1e-8)
+        assert online.check(results)
+        rc = pd.DataFrame({"poa": [800.0], "t_amb": 25.0, "w_vel": 2.0})
+        assert online.predict(rc).iloc[0] == pytest.approx(
+            results.predict(rc).iloc[0], rel=1e-10
+        )
+        assert not online.check(smf.ols(fml, data=astm_reg_data).fit())
+
+    def test_too_few_rows_or_rank_deficient(self, astm_reg_data):
+        """Verify undefined coefficients and residual variance raise errors."""
+        online = pvc.OnlineRegression()
+        online.update(astm_reg_data.iloc[:3])
+        with pytest.raises(ValueError, match="fewer than its 4 coefficients"):
+            _ = online.params
+        online.update(astm_reg_data.iloc[3:4])
+        assert online.params.notna().all()
+        with pytest.raises(ValueError, match="residual variance"):
+            _ = online.scale
+        constant = astm_reg_data.assign(t_amb=25.0)
+        online = pvc.OnlineRegression("power ~ poa + t_amb")
+        online.update(constant)
+        with pytest.raises(ValueError, match="rank deficient"):
+            _ = online.params
+        online = pvc.OnlineRegression()
+        online.update(astm_reg_data.assign(w_vel=0.0))
+        with pytest.raises(ValueError, match="rank deficient"):
+            _ = online.params
+
+    def test_many_update_remove_cycles(self, astm_reg_data):
+        """Verify the sums stay accurate after many rows are added and removed."""
+        data = astm_reg_data.dropna()
+        online = pvc.OnlineRegression(source_index=data.index)
+        rng = np.random.default_rng(0)
+        for _ in range(500):
+            rows = np.sort(rng.choice(len(data), 100, replace=False))
+            online.update(data.iloc[rows], positions=rows)
+            rows = np.sort(rng.choice(len(data), 100, replace=False))
+            online.remove(data.iloc[rows], positions=rows)
+        remaining = data[online.mask]
+        assert online.nobs == remaining.shape[0]
+        assert online.yty_total > 100 * online.yty
+        results = smf.ols(pvc.ASTM_FORMULA, data=remaining).fit()
+        assert online.check(results, rtol=1e-6)
+
+    def test_capdata_reads_only_changed_rows(self, meas, mocker):
+        """Verify filters read only the rows they change for the regression."""
+        meas.mask_filtering = True
+        meas.reset_filter()
+        meas.agg_sensors()
+        meas.start_online_regression()
+        spy = mocker.spy(meas, "get_reg_cols")
+        meas.filter_irr(400, 800)
+        meas.filter_missing()
+        rows = [call.kwargs["rows"] for call in spy.call_args_list]
+        removed = [len(step["index"]) for step in meas.removed]
+        assert [len(r) for r in rows] == [n for n in removed if n > 0]
+        assert meas.check_online_regression()
+
+    def test_capdata_refits_after_many_cycles(self, meas, monkeypatch):
+        """Verify the regression is refit when many rows were added and removed."""
+        monkeypatch.setattr(pvc, "ONLINE_REFIT_RATIO", 5)
+        meas.agg_sensors()
+        online = meas.start_online_regression()
+        for _ in range(10):
+            meas.filter_irr(400, 800)
+            meas.reset_filter()
+        assert meas.online_regression is not online
+        assert meas.online_regression.yty_total <= 5 * meas.online_regression.yty
+        assert meas.check_online_regression()
+
+    @pytest.mark.parametrize("mask_filtering", [False, True])
+    def test_capdata_updates(self, meas, mask_filtering):
+        """Verify the online regression follows filtering and appended data."""
+        meas.mask_filtering = mask_filtering
+        meas.reset_filter()
+        partial, new_data = split_meas(meas)
+        partial.agg_sensors()
+        online = partial.start_online_regression()
+        assert online.nobs == partial.get_reg_cols().dropna().shape[0]
+        partial.filter_irr(200, 900)
+        partial.filter_missing()
+        partial.filter_irr(400, 800)
+        partial.filter_time(start="10/9/1990", end="10/10/1990", inplace=False)
+        assert online.nobs == partial.data_filtered.shape[0]
+        assert partial.check_online_regression()
+        partial.append_data(new_data)
+        assert partial.online_regression is online
+        assert online.nobs == partial.data_filtered.shape[0] > 0
+        assert partial.check_online_regression()
+        partial.fit_regression(filter=True, summary=False)
+        partial.fit_regression(summary=False)
+        assert partial.check_online_regression()
+        rc = pd.DataFrame({"poa": [700.0], "t_amb": 20.0, "w_vel": 2.0})
+        assert online.predict(rc).iloc[0] == pytest.approx(
+            partial.regression_results.predict(rc).iloc[0], rel=1e-8
+        )
+        partial.reset_filter()
+        assert partial.check_online_regression()
+
+    def test_copy_and_formula_change(self, meas):
+        """Verify copies are independent and a new formula starts a new fit."""
+        meas.agg_sensors()
+        online = meas.start_online_regression()
+        meas_copy = meas.copy()
+        meas_copy.filter_irr(200, 900)
+        assert meas_copy.online_regression is not online
+        assert online.nobs > meas_copy.online_regression.nobs
+        meas.regression_formula = "power ~ poa"
+        assert meas.update_online_regression().exog_names == ["Intercept", "poa"]
+        assert meas.check_online_regression()
+
+
+class TestSaveLoad:
+    """Test saving and loading CapData objects."""
+
+    @pytest.mark.parametrize("mask_filtering", [False, True])
+    def test_round_trip(self, meas, tmp_path, mask_filtering):
+        """Verify a filtered and regressed CapData is restored."""
+        meas.mask_filtering = mask_filtering
+        meas.reset_filter()
+        meas.agg_sensors()
+        meas.filter_irr(200, 900)
+        meas.filter_missing()
+        meas.rep_cond()
+        meas.fit_regression(filter=False, summary=False)
+        meas.save(tmp_path / "session")
+        loaded = pvc.CapData.load(tmp_path / "session")
+        assert not (tmp_path / "session" / "data_filtered.parquet").exists()
+        assert loaded.mask_filtering == mask_filtering
+        pd.testing.assert_frame_equal(loaded.data, meas.data)
+        pd.testing.assert_frame_equal(loaded.data_filtered, meas.data_filtered)
+        pd.testing.assert_frame_equal(loaded.get_summary(), meas.get_summary())
+        pd.testing.assert_frame_equal(loaded.rc, meas.rc)
+        for record in ["kept", "removed"]:
+            for step, loaded_step in zip(
+                getattr(meas, record), getattr(loaded, record)
+            ):
+                assert loaded_step["name"] == step["name"]
+                assert loaded_step["index"].equals(step["index"])
+        assert isinstance(loaded.column_groups, cg.ColumnGroups)
+        assert loaded.column_groups == meas.column_groups
+        assert loaded.regression_cols == meas.regression_cols
+        assert [call[0] for call in loaded.filter_calls] == [
+            call[0] for call in meas.filter_calls
+        ]
+        pd.testing.assert_series_equal(
+            loaded.regression_results.params, meas.regression_results.params
+        )
+        assert loaded.aggs_irr_poa_pyran_mean_agg.equals(
+            meas.aggs_irr_poa_pyran_mean_agg
+        )
+
+    def test_index_freq_restored(self, meas, tmp_path):
+        """Verify the frequency of the data index survives the round trip."""
+        meas.data.index.freq = pd.infer_freq(meas.data.index)
+        assert meas.data.index.freq is not None
+        meas.save(tmp_path)
+        loaded = pvc.CapData.load(tmp_path)
+        assert loaded.data.index.freq == meas.data.index.freq
+        pd.testing.assert_frame_equal(loaded.data, meas.data)
+
+    def test_modified_data_filtered_saved_as_frame(self, meas, tmp_path):
+        """Verify data_filtered that is not a subset of data is saved."""
+        meas.data_filtered = meas.data.iloc[:10, :] * 2
+        meas.save(tmp_path)
+        assert (tmp_path / "data_filtered.parquet").exists()
+        loaded = pvc.CapData.load(tmp_path)
+        pd.testing.assert_frame_equal(loaded.data_filtered, meas.data_filtered)
+
+    def test_unpicklable_filter_calls_warns(self, meas, tmp_path):
+        """Verify filter calls that cannot be pickled are dropped with a warning."""
+        meas.filter_custom(lambda df: df.iloc[:100, :])
+        with pytest.warns(UserWarning, match="filter_calls could not be saved"):
+            meas.save(tmp_path)
+        loaded = pvc.CapData.load(tmp_path)
+        assert loaded.filter_calls == []
+        assert loaded.data_filtered.shape[0] == 100
+
+
 class TestStatsmodelsParamModification:
     """
     Tests documenting statsmodels parameter modification behavior.
@@ -2847,6 +3869,21 @@ class TestGetFilteringTable:
             flt0_removed_ix.union(flt1_removed_ix).union(flt2_removed_ix)
         )
 
+    def test_get_filtering_table_removed_by(self, nrel):
+        nrel.filter_irr(200, 900)
+        nrel.filter_irr(400, 800)
+        flt_table = nrel.get_filtering_table()
+        removed_by = nrel.get_filtering_table(removed_by=True)
+        assert list(removed_by.columns) == ["removed_by"]
+        assert isinstance(removed_by["removed_by"].dtype, pd.CategoricalDtype)
+        assert list(removed_by["removed_by"].cat.categories) == [
+            "filter_irr",
+            "filter_irr-1",
+        ]
+        for name in ["filter_irr", "filter_irr-1"]:
+            assert (removed_by["removed_by"] == name).equals(flt_table[name] == 1)
+        assert removed_by["removed_by"].isna().equals(flt_table["all_filters"])
+
 
 @pytest.fixture
 def pts_summary(meas):
@@ -1,5 +1,7 @@
 import os
 import csv
+import warnings
+import concurrent.futures
 import re
 from io import StringIO
 import unittest
@@ -17,6 +19,7 @@ from captest import io
 from captest import (
     load_pvsyst,
     load_data,
+    update_data,
     DataLoader,
 )
 
@@ -284,6 +287,122 @@ class TestFileReader:
         assert isinstance(loaded_data, pd.DataFrame)
         assert isinstance(loaded_data.index, pd.DatetimeIndex)
 
+    def full_reads(self, spy, path):
+        """Count the calls of pandas.read_csv that read the file at `path`."""
+        return sum(1 for call in spy.call_args_list if call.args[0] == path)
+
+    @pytest.mark.parametrize("layout", ["plain", "double_headers", "row_count"])
+    def test_large_file_parsed_once(self, tmp_path, mocker, layout):
+        """Test files larger than the sniffed sample are only parsed once."""
+        csv_path = tmp_path / "large.csv"
+        df = pd.DataFrame(
+            {"met1_poa1": np.arange(0, 5000), "met1_poa2": np.arange(5000, 10000)},
+            index=pd.date_range(start="8/1/22", periods=5000, freq="1min"),
+        )
+        if layout == "double_headers":
+            df.columns = pd.MultiIndex.from_tuples([("met1", "poa"), ("met2", "poa")])
+        if layout == "row_count":
+            df = df.reset_index()
+        df.to_csv(csv_path)
+        assert csv_path.stat().st_size > 2 * io.SNIFF_BYTES
+        spy = mocker.spy(pd, "read_csv")
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            loaded_data = io.file_reader(csv_path)
+        assert self.full_reads(spy, csv_path) == 1
+        assert loaded_data.shape[0] == 5000
+        assert isinstance(loaded_data.index, pd.DatetimeIndex)
+        if layout == "double_headers":
+            assert loaded_data.columns[0] == "met1_poa"
+
+    def test_row_count_column_breaks_after_sample(self, tmp_path):
+        """Test the whole first column is checked before using the second as index."""
+        csv_path = tmp_path / "row_count.csv"
+        df = pd.DataFrame(
+            {"met1_poa1": np.arange(0, 5000)},
+            index=pd.date_range(start="8/1/22", periods=5000, freq="1min"),
+        ).reset_index()
+        df.index = np.r_[np.arange(4000), np.arange(5000, 6000)]
+        df.to_csv(csv_path)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            loaded_data = io.file_reader(csv_path)
+        assert loaded_data.index[-1] == 5999
+
+    @pytest.mark.parametrize("double_headers", [False, True])
+    def test_usecols_parses_named_columns(self, tmp_path, mocker, double_headers):
+        """Test only the named columns of a large file are parsed."""
+        csv_path = tmp_path / "large.csv"
+        df = pd.DataFrame(
+            np.arange(15000).reshape(5000, 3),
+            index=pd.date_range(start="8/1/22", periods=5000, freq="1min"),
+            columns=["met1_poa", "met2_poa", "inv1_alarm"],
+        )
+        if double_headers:
+            df.columns = pd.MultiIndex.from_tuples(
+                [("met1", "poa"), ("met2", "poa"), ("inv1", "alarm")]
+            )
+        df.to_csv(csv_path)
+        spy = mocker.spy(pd, "read_csv")
+        loaded_data = io.file_reader(csv_path, usecols=["met2_poa", "missing"])
+        full_read = [call for call in spy.call_args_list if call.args[0] == csv_path]
+        assert len(full_read) == 1
+        assert full_read[0].kwargs["usecols"] == [0, 2]
+        assert loaded_data.columns.to_list() == ["met2_poa"]
+        assert isinstance(loaded_data.index, pd.DatetimeIndex)
+        pd.testing.assert_frame_equal(
+            loaded_data, io.file_reader(csv_path)[["met2_poa"]]
+        )
+
+    def test_usecols_small_file(self, tmp_path):
+        """Test usecols selects columns of a file read in a single sample."""
+        csv_path = tmp_path / "small.csv"
+        pd.DataFrame(
+            {"met1_poa1": np.arange(0, 20), "met1_poa2": np.arange(20, 40)},
+            index=pd.date_range(start="8/1/22", periods=20, freq="1min"),
+        ).to_csv(csv_path)
+        loaded_data = io.file_reader(csv_path, usecols=["met1_poa2"])
+        assert loaded_data.columns.to_list() == ["met1_poa2"]
+
+    @pytest.mark.parametrize("double_headers", [False, True])
+    def test_chunksize_matches_full_read(self, tmp_path, double_headers):
+        """Test reading in chunks gives the full read converted to float."""
+        csv_path = tmp_path / "large.csv"
+        df = pd.DataFrame(
+            {"met1_poa": np.arange(0, 5000), "status": "ok"},
+            index=pd.date_range(start="8/1/22", periods=5000, freq="1min"),
+        )
+        df.iloc[10, 0] = np.nan
+        if double_headers:
+            df.columns = pd.MultiIndex.from_tuples([("met1", "poa"), ("inv", "status")])
+        df.to_csv(csv_path)
+        loaded_data = io.file_reader(csv_path, chunksize=700)
+        expected = io.to_numeric_columns(io.file_reader(csv_path)).astype("float64")
+        pd.testing.assert_frame_equal(loaded_data, expected, check_freq=False)
+        assert loaded_data.iloc[:, 1].isna().all()
+
+    def test_chunksize_compressed_file_raises(self, tmp_path):
+        """Test a file that cannot be sniffed is not read in chunks."""
+        csv_path = tmp_path / "data.csv.gz"
+        pd.DataFrame(
+            {"met1_poa": np.arange(0, 20)},
+            index=pd.date_range(start="8/1/22", periods=20, freq="1min"),
+        ).to_csv(csv_path)
+        with pytest.raises(ValueError, match="cannot be read in chunks"):
+            io.file_reader(csv_path, chunksize=5)
+
+    def test_encoding_error_after_sample(self, tmp_path):
+        """Test a non utf-8 character after the sampled bytes is handled."""
+        csv_path = tmp_path / "latin1.csv"
+        df = pd.DataFrame(
+            {"met1_poa1": np.arange(0, 5000), "comment": "ok"},
+            index=pd.date_range(start="8/1/22", periods=5000, freq="1min"),
+        )
+        df.iloc[-1, 1] = "café"
+        df.to_csv(csv_path, encoding="latin1")
+        loaded_data = io.file_reader(csv_path)
+        assert loaded_data.iloc[-1, 1] == "café"
+
 
 class TestLoadPVsyst:
     def test_load_pvsyst(self):
@@ -301,6 +420,46 @@ class TestLoadPVsyst:
             "w_vel": "WindVel",
         }
 
+    def test_load_pvsyst_reads_file_once(self, mocker):
+        """Test the headers and data are parsed by a single read per encoding."""
+        spy = mocker.spy(pd, "read_csv")
+        pvsyst = load_pvsyst("./tests/data/pvsyst_example_HourlyRes_2.CSV")
+        # the file is not utf-8, so it is read with utf-8 and then latin1
+        assert [call.kwargs["encoding"] for call in spy.call_args_list] == [
+            "utf-8",
+            "latin1",
+        ]
+        assert pvsyst.data["index"].iloc[13] == "01/01/1990 13 00"
+
+    def test_load_pvsyst_no_index_column(self):
+        """Test the string index column can be skipped."""
+        pvsyst = load_pvsyst(
+            "./tests/data/pvsyst_example_HourlyRes_2.CSV", index_column=False
+        )
+        assert "index" not in pvsyst.data.columns
+        assert "index" not in pvsyst.column_groups
+
+    def test_format_index_column(self):
+        """Test the index column strings match strftime."""
+        ix = pd.date_range(start="12/31/89 22:00", periods=500, freq="7min")
+        np.testing.assert_array_equal(
+            io.format_index_column(ix), ix.strftime("%m/%d/%Y %H %M").to_numpy()
+        )
+
+    def test_load_pvsyst_dtype_policy(self):
+        """Test float32 storage keeps the regression columns as float64."""
+        pvsyst = load_pvsyst(
+            "./tests/data/pvsyst_example_HourlyRes_2.CSV", dtype_policy="float32"
+        )
+        default = load_pvsyst("./tests/data/pvsyst_example_HourlyRes_2.CSV")
+        for col in ["E_Grid", "GlobInc", "T_Amb", "WindVel"]:
+            assert pvsyst.data[col].dtype == default.data[col].dtype
+        assert pvsyst.data["GlobHor"].dtype == "float32"
+        assert (pvsyst.data_filtered.dtypes == pvsyst.data.dtypes).all()
+        pd.testing.assert_frame_equal(
+            pvsyst.data, default.data, check_dtype=False, atol=1e-3, rtol=0
+        )
+
     def test_load_pvsyst_semicolon_sep(self):
         """Test loading pvsyst output with mm/dd/yy; Hour dates."""
         pvsyst = load_pvsyst(
@@ -647,6 +806,45 @@ class TestDataLoader:
         assert all(data.loc["1/2/22"]["a"].isna())
         assert data.index.is_monotonic_increasing
 
+    def test_join_files_different_headers_numeric_conversion(self):
+        """Test text values become NaN and later files replace earlier values."""
+        day1 = pd.DataFrame(
+            {"a": ["1.5", "bad"] + ["2"] * 22, "b": np.arange(24.0)},
+            index=pd.date_range(start="1/1/22", freq="60 min", periods=24),
+        )
+        day2 = pd.DataFrame(
+            {"b": np.arange(100.0, 112.0), "c": np.arange(12)},
+            index=pd.date_range(start="1/1/22 12:00", freq="60 min", periods=12),
+        )
+        dl = io.DataLoader()
+        dl.loaded_files = {"day1": day1, "day2": day2}
+        dl.common_freq = "60min"
+        data = dl.join_files()
+        assert (data.dtypes == "float64").all()
+        assert data["a"].iloc[0] == 1.5
+        assert np.isnan(data["a"].iloc[1])
+        assert data["b"].iloc[11] == 11
+        assert data["b"].iloc[12] == 100
+        assert data["c"].isna().sum() == 12
+
+    def test_join_files_different_headers_off_grid_timestamps(self):
+        """Test timestamps not on the common frequency are kept."""
+        day1 = pd.DataFrame(
+            {"a": np.arange(24.0)},
+            index=pd.date_range(start="1/1/22", freq="60 min", periods=24),
+        )
+        day2 = pd.DataFrame(
+            {"b": np.arange(4.0)},
+            index=pd.date_range(start="1/2/22 00:30", freq="60 min", periods=4),
+        )
+        dl = io.DataLoader()
+        dl.loaded_files = {"day1": day1, "day2": day2}
+        dl.common_freq = "60min"
+        data = dl.join_files()
+        assert data.index.is_monotonic_increasing
+        assert data.loc["1/2/22 00:30", "b"] == 0
+        assert data["a"].notna().sum() == 24
+
     def test_load_single_file(self, tmp_path):
         csv_path = tmp_path / "single_file.csv"
         pd.DataFrame(
@@ -657,10 +855,14 @@ class TestDataLoader:
             index=pd.date_range(start="8/1/22", periods=20, freq="1min"),
         ).to_csv(csv_path)
         dl = DataLoader(csv_path)
+        assert dl.load_times is None
+        assert dl.reindex_times == {}
         dl.load()
         print(dl.data)
         assert isinstance(dl.data, pd.DataFrame)
         assert dl.data.shape == (20, 2)
+        assert dl.load_times.index.tolist() == ["single_file"]
+        assert dl.load_times.loc["single_file", "read"] >= 0
 
     def test_load_all_files_in_directory(self, tmp_path):
         """
@@ -685,6 +887,100 @@ class TestDataLoader:
         assert isinstance(dl.data, pd.DataFrame)
         assert dl.data.shape == (60, 2)
 
+    @pytest.fixture
+    def memory_csvs(self):
+        """Write three daily csv files to an fsspec memory filesystem."""
+        path = UPath("memory://prefetch_test/data")
+        path.mkdir(parents=True, exist_ok=True)
+        for i in range(1, 4):
+            pd.DataFrame(
+                {"met1_poa1": np.arange(0, 20)},
+                index=pd.date_range(start=f"8/{i}/22", periods=20, freq="1min"),
+            ).to_csv(str(path / f"file_{i}.csv"))
+        yield path
+        path.fs.rm("/prefetch_test", recursive=True)
+
+    def test_load_prefetch_memory_filesystem(self, memory_csvs, tmp_path):
+        """Test prefetched files are reused until the remote file changes."""
+        dl = DataLoader(memory_csvs)
+        dl.load(summary=False)
+        dl_prefetch = DataLoader(memory_csvs)
+        dl_prefetch.load(summary=False, prefetch=True, prefetch_dir=tmp_path)
+        pd.testing.assert_frame_equal(dl.data, dl_prefetch.data)
+        local_files = {
+            file.name: file.stat().st_mtime_ns for file in tmp_path.iterdir()
+        }
+        assert len(local_files) == 3
+
+        pd.DataFrame(
+            {"met1_poa1": np.arange(0, 30)},
+            index=pd.date_range(start="8/1/22", periods=30, freq="1min"),
+        ).to_csv(str(memory_csvs / "file_1.csv"))
+        dl_prefetch = DataLoader(memory_csvs)
+        dl_prefetch.load(summary=False, prefetch=True, prefetch_dir=tmp_path)
+        assert dl_prefetch.loaded_files["file_1"].shape[0] == 30
+        reloaded = {file.name: file.stat().st_mtime_ns for file in tmp_path.iterdir()}
+        assert len(reloaded) == 3
+        assert len(set(reloaded.items()) & set(local_files.items())) == 2
+
+    def test_load_prefetch_to_temp_dir_uses_cache(self, memory_csvs, tmp_path, capsys):
+        """Test files prefetched to a new temporary directory hit the cache."""
+        cache_dir = tmp_path / "cache"
+        first = DataLoader(memory_csvs)
+        first.load(prefetch=True, cache=str(cache_dir))
+        assert "(cached)" not in capsys.readouterr().out
+        assert len(list(cache_dir.glob("*.parquet"))) == 3
+
+        second = DataLoader(memory_csvs)
+        second.load(prefetch=True, cache=str(cache_dir))
+        assert capsys.readouterr().out.count("(cached)") == 3
+        pd.testing.assert_frame_equal(first.data, second.data)
+
+        pd.DataFrame(
+            {"met1_poa1": np.arange(0, 30)},
+            index=pd.date_range(start="8/1/22", periods=30, freq="1min"),
+        ).to_csv(str(memory_csvs / "file_1.csv"))
+        third = DataLoader(memory_csvs)
+        third.load(prefetch=True, cache=str(cache_dir))
+        assert capsys.readouterr().out.count("(cached)") == 2
+        assert third.loaded_files["file_1"].shape[0] == 30
+        assert len(list(cache_dir.glob("*.parquet"))) == 3
+
+    def test_load_prefetch_s3(self, monkeypatch, tmp_path):
+        """Test prefetching from a local S3 stand-in served by moto."""
+        moto_server = pytest.importorskip("moto.server")
+        s3fs = pytest.importorskip("s3fs")
+        server = moto_server.ThreadedMotoServer(port=0, verbose=False)
+        server.start()
+        host, port = server.get_host_and_port()
+        monkeypatch.setenv("AWS_ENDPOINT_URL", f"http://{host}:{port}")
+        monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test")
+        monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test")
+        monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+        s3fs.S3FileSystem.clear_instance_cache()
+        try:
+            fs = s3fs.S3FileSystem()
+            fs.mkdir("bucket")
+            for i in range(1, 6):
+                fs.pipe(
+                    f"bucket/data/file_{i}.csv",
+                    pd.DataFrame(
+                        {"met1_poa1": np.arange(0, 20)},
+                        index=pd.date_range(start=f"8/{i}/22", periods=20, freq="1min"),
+                    )
+                    .to_csv()
+                    .encode(),
+                )
+            dl = DataLoader("s3://bucket/data")
+            dl.load(summary=False)
+            dl_prefetch = DataLoader("s3://bucket/data")
+            dl_prefetch.load(summary=False, prefetch=2)
+            pd.testing.assert_frame_equal(dl.data, dl_prefetch.data)
+            assert dl_prefetch.data.shape == (100, 1)
+        finally:
+            s3fs.S3FileSystem.clear_instance_cache()
+            server.stop()
+
     def test_load_all_files_from_s3_bucket(self):
         """
         Should create a test that mocks AWS resources to test DataLoader.load use
@@ -734,6 +1030,125 @@ class TestDataLoader:
         assert "trying to load" in captured.out
         assert "**FAILED to load" in captured.out
 
+    @pytest.fixture
+    def daily_csvs(self, tmp_path):
+        """Write eight daily csv files, the third with an extra column."""
+        for i in range(1, 9):
+            df = pd.DataFrame(
+                {
+                    "met1_poa1": np.arange(0, 20),
+                    "met1_poa2": np.arange(20, 40),
+                },
+                index=pd.date_range(start=f"8/{i}/22", periods=20, freq="1min"),
+            )
+            if i == 3:
+                df["met1_poa3"] = 1
+            df.to_csv(tmp_path / f"file_{i}.csv")
+        return tmp_path
+
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_load_parallel_matches_serial(self, daily_csvs, executor):
+        """Test loading with a pool gives the same result as loading serially."""
+        serial = DataLoader(daily_csvs)
+        serial.load(summary=False)
+        parallel = DataLoader(daily_csvs)
+        parallel.load(summary=False, workers=3, executor=executor)
+        assert list(parallel.loaded_files) == list(serial.loaded_files)
+        pd.testing.assert_frame_equal(parallel.data, serial.data)
+        assert parallel.load_times.index.tolist() == list(serial.loaded_files)
+        assert (parallel.load_times >= 0).all().all()
+
+    def test_load_parallel_failed_to_load_order(self, daily_csvs, capsys):
+        """Test failures are recorded in file order when loading in parallel."""
+
+        def reader(path, **kwargs):
+            if Path(path).stem in ["file_2", "file_6"]:
+                raise ValueError("intentional failure")
+            return io.file_reader(path, **kwargs)
+
+        dl = DataLoader(daily_csvs)
+        dl.file_reader = reader
+        dl.load(workers=4)
+        captured = capsys.readouterr()
+        assert dl.failed_to_load == [
+            daily_csvs / "file_2.csv",
+            daily_csvs / "file_6.csv",
+        ]
+        assert "failed_to_load[1]" in captured.out
+        assert captured.out.index("file_5.csv") < captured.out.index("file_6.csv")
+        assert len(dl.loaded_files) == 6
+
+    def test_load_parallel_raise_errors(self, daily_csvs):
+        """Test raise_errors re-raises the first failure in file order."""
+
+        def reader(path, **kwargs):
+            raise ValueError(f"failed {Path(path).stem}")
+
+        dl = DataLoader(daily_csvs)
+        dl.file_reader = reader
+        with pytest.raises(ValueError, match="failed file_1"):
+            dl.load(raise_errors=True, workers=4)
+
+    def test_load_with_executor_instance(self, daily_csvs):
+        """Test a passed executor is used and left running."""
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+            dl = DataLoader(daily_csvs)
+            dl.load(summary=False, executor=pool)
+            assert pool.submit(lambda: 1).result() == 1
+        assert len(dl.loaded_files) == 8
+
+    def test_load_cache_only_rereads_changed_files(self, daily_csvs):
+        """Test cached files are reused until the file or kwargs change."""
+        calls = []
+
+        def counting_reader(path, **kwargs):
+            calls.append(Path(path).name)
+            return io.file_reader(path, **kwargs)
+
+        def load(**kwargs):
+            dl = DataLoader(daily_csvs)
+            dl.file_reader = counting_reader
+            dl.load(summary=False, cache=True, **kwargs)
+            return dl
+
+        uncached = DataLoader(daily_csvs)
+        uncached.load(summary=False)
+        load()
+        assert len(calls) == 8
+        cache_files = list((daily_csvs / ".captest_cache").glob("*.parquet"))
+        assert len(cache_files) == 8
+        calls.clear()
+        cached = load()
+        assert calls == []
+        pd.testing.assert_frame_equal(cached.data, uncached.data)
+
+        stat = (daily_csvs / "file_4.csv").stat()
+        os.utime(
+            daily_csvs / "file_4.csv",
+            ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000),
+        )
+        load()
+        assert calls == ["file_4.csv"]
+        assert len(list((daily_csvs / ".captest_cache").glob("*.parquet"))) == 8
+        calls.clear()
+        load(skip_blank_lines=True)
+        assert len(calls) == 8
+
+    def test_load_cache_single_file_with_strings(self, tmp_path):
+        """Test a cached file with missing strings loads the same as the csv."""
+        csv_path = tmp_path / "status.csv"
+        pd.DataFrame(
+            {"met1_poa1": np.arange(0, 20), "status": ["ok", None] * 10},
+            index=pd.date_range(start="8/1/22", periods=20, freq="1min"),
+        ).to_csv(csv_path)
+        cache_dir = tmp_path / "cache"
+        expected = io.file_reader(csv_path)
+        for _ in range(2):
+            dl = DataLoader(csv_path)
+            dl.load(cache=str(cache_dir))
+            pd.testing.assert_frame_equal(dl.data, expected)
+        assert len(list(cache_dir.glob("*.parquet"))) == 1
+
     def test_load_specific_files(self, tmp_path):
         """
         Test load method when `path` attribute is a directory and specific files
@@ -869,6 +1284,60 @@ class TestLoadDataFunction:
         assert isinstance(cd.data, pd.DataFrame)
         assert cd.data.shape == (2900, 2)
 
+    def test_dtype_policy_tolerance(self, tmp_path):
+        """Test only columns within the dtype_policy tolerance become float32."""
+        csv_path = tmp_path / "file.csv"
+        pd.DataFrame(
+            {
+                "met1_poa1": np.linspace(0, 1000.1, 20),
+                "meter_energy": np.linspace(1e9, 1e9 + 0.19, 20),
+            },
+            index=pd.date_range(start="8/1/22", periods=20, freq="1min"),
+        ).to_csv(csv_path)
+        cd = load_data(csv_path, dtype_policy="float32")
+        assert cd.data["met1_poa1"].dtype == "float32"
+        assert cd.data["meter_energy"].dtype == "float64"
+        cd = load_data(csv_path, dtype_policy={"dtype": "float32", "tolerance": 100})
+        assert cd.data["meter_energy"].dtype == "float32"
+        with pytest.raises(ValueError):
+            load_data(csv_path, dtype_policy="float16")
+
+    def test_update_data_loads_new_files(self, tmp_path, mocker):
+        """
+        Test update_data reads only new files and matches loading all files.
+        """
+
+        def write_day(path, day):
+            pd.DataFrame(
+                {
+                    "met1_poa1": np.linspace(0, 1000, 20) + day,
+                    "met1_poa2": np.linspace(10, 1010, 20) + day,
+                },
+                index=pd.date_range(start=f"8/{day}/22", periods=20, freq="1min"),
+            ).to_csv(path / f"file_{day}.csv")
+
+        for day in range(1, 4):
+            write_day(tmp_path, day)
+        cd = load_data(tmp_path)
+        cd.filter_irr(200, 800, col_name="met1_poa1")
+        for day in range(4, 6):
+            write_day(tmp_path, day)
+        spy = mocker.spy(cd.data_loader, "file_reader")
+        assert update_data(cd) == 2 * 1440
+        assert [Path(call.args[0]).stem for call in spy.call_args_list] == [
+            "file_4",
+            "file_5",
+        ]
+        assert update_data(cd) == 0
+
+        cd_all = load_data(tmp_path)
+        cd_all.filter_irr(200, 800, col_name="met1_poa1")
+        pd.testing.assert_frame_equal(cd.data, cd_all.data, check_freq=False)
+        pd.testing.assert_frame_equal(
+            cd.data_filtered, cd_all.data_filtered, check_freq=False
+        )
+        assert cd.get_summary().equals(cd_all.get_summary())
+
     def test_adds_csky_when_passesed_site(self, location_and_system):
         site = {
             "sys": location_and_system["system"],
@@ -921,6 +1390,40 @@ class TestLoadDataFunction:
         assert isinstance(cd.data, pd.DataFrame)
         assert isinstance(cd.data.index, pd.DatetimeIndex)
 
+    def test_only_grouped_columns_loaded(self, tmp_path):
+        """Test only the columns in a column groups file are passed to the reader."""
+        csv_path = tmp_path / "data.csv"
+        pd.DataFrame(
+            {
+                "met1_poa": np.arange(0, 20),
+                "inv1_alarm": np.arange(20, 40),
+                "meter_power": np.arange(40, 60),
+            },
+            index=pd.date_range(start="8/1/22", periods=20, freq="1min"),
+        ).to_csv(csv_path)
+        groups_path = tmp_path / "groups.json"
+        groups_path.write_text('{"irr": ["met1_poa"], "power": ["meter_power"]}')
+        cd = load_data(csv_path, group_columns=str(groups_path))
+        assert cd.data_loader.usecols is None
+        assert cd.data.shape[1] == 3
+        cd = load_data(
+            csv_path, group_columns=str(groups_path), only_grouped_columns=True
+        )
+        assert cd.data_loader.usecols == ["met1_poa", "meter_power"]
+        assert cd.data.columns.to_list() == ["met1_poa", "meter_power"]
+
+    def test_mask_filtering(self):
+        """
+        Test that the mask_filtering kwarg is passed to the returned CapData.
+        """
+        cd = load_data(
+            path="./tests/data/example_measured_data.csv",
+            mask_filtering=True,
+        )
+        assert cd.mask_filtering
+        assert cd.filter_mask.all()
+        assert cd.data_filtered.equals(cd.data)
+
     def test_load_site_data_from_json_file(self):
         """
         Test loading site data from a json file.
@@ -1,3 +1,4 @@
+import concurrent.futures
 import pytest
 import numpy as np
 import pandas as pd
@@ -104,3 +105,47 @@ class TestReindexDatetime:
             (df_reindexed, missing_intervals, freq_str) = util.reindex_datetime(df)
         assert df_reindexed.index.is_unique
         assert df_reindexed.shape[0] == 5
+
+
+WORKER_STATE = {}
+
+
+def add(a, b):
+    return a + b
+
+
+def init_add_worker(b):
+    WORKER_STATE["b"] = b
+
+
+def add_in_worker(a):
+    return a + WORKER_STATE["b"]
+
+
+class TestRunTasks:
+    @pytest.mark.parametrize(
+        "workers, executor", [(None, "process"), (2, "thread"), (2, "process")]
+    )
+    def test_results_in_order(self, workers, executor):
+        """Verify each kind of executor returns the results of the tasks in order."""
+        results = util.run_tasks(
+            add,
+            [(i,) for i in range(5)],
+            (10,),
+            workers=workers,
+            executor=executor,
+            worker_func=add_in_worker,
+            initializer=init_add_worker,
+        )
+        assert results == [10, 11, 12, 13, 14]
+
+    def test_existing_executor(self):
+        """Verify an existing executor is used and not shut down."""
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+            results = util.run_tasks(add, [(1,), (2,)], (1,), executor=pool)
+            assert results == [2, 3]
+            assert pool.submit(add, 1, 1).result() == 2
+
+    def test_invalid_executor(self):
+        with pytest.raises(ValueError):
+            util.run_tasks(add, [(1,), (2,)], (1,), workers=2, executor="dask")